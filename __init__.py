@@ -4,18 +4,32 @@ bl_info = {
     "version": (4, 1, 0),
     "blender": (5, 0, 0),
     "location": "View3D > Sidebar > AccessHelper",
-    "description": "Daltonism highlight modes, UI brightness, UI scale, arrow navigation (F + arrows) with ▶ indicator, optional font size presets + reset, help popup.",
+    "description": "Daltonism highlight modes, UI brightness, UI scale, arrow navigation (F + arrows) with ▶ indicator, optional font size presets + reset, Lexend readability font, help popup.",
     "category": "Interface",
 }
 
 import bpy
+import hashlib
 import json
+import os
+import tempfile
+import time
+import numpy as np
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from . import confusion, contrast, cvd, jobs, lut_export
+from .perf import PERF, instrumented
 
 # ------------------------------------------------------------
 # Backups / keymaps
 # ------------------------------------------------------------
-THEME_BACKUP_KEY = "accesshelper_theme_backup_v17"
-STYLE_BACKUP_KEY = "accesshelper_ui_styles_backup_v12"
+THEME_BACKUP_KEY = "accesshelper_theme_backup_v18"
+STYLE_BACKUP_KEY = "accesshelper_ui_styles_backup_v13"
+FONT_BACKUP_KEY = "accesshelper_ui_font_backup_v1"
+# anciens backups (chaînes JSON), migrés à la première lecture
+LEGACY_THEME_BACKUP_KEYS = ("accesshelper_theme_backup_v17",)
+LEGACY_STYLE_BACKUP_KEYS = ("accesshelper_ui_styles_backup_v12",)
 addon_keymaps = []
 
 # ------------------------------------------------------------
@@ -29,6 +43,14 @@ EDITOR_FIELDS = [("space", "text")]
 
 GLOBAL_UI_ATTRS = ["widget_text", "text", "text_hi"]
 
+THEME_COVERAGE_ITEMS = [
+    ("CORE", "Essentiel",     "Widgets, texte des éditeurs et texte global"),
+    ("FULL", "Thème complet", "Toutes les couleurs du thème (éditeurs, nœuds, gizmos…)"),
+]
+
+# Champs recolorés par le mode daltonisme (les autres ne reçoivent que la luminosité)
+HILITE_FIELDS = {"inner_sel", "item", "outline", "text_sel"}
+
 # ------------------------------------------------------------
 # Daltonism modes
 # ------------------------------------------------------------
@@ -43,6 +65,12 @@ MODE_ITEMS = [
     ("ACHRO", "Achromatopsie",   "Mode gris"),
 ]
 
+CVD_METHOD_ITEMS = [
+    ("HILITE",    "Surbrillance",  "Recolore les sélections avec une couleur très visible"),
+    ("DALTONIZE", "Daltonisation", "Corrige toute la palette pour la déficience choisie"),
+    ("SIMULATE",  "Simulation",    "Montre la palette telle que perçue avec la déficience"),
+]
+
 # Couleurs très visibles (pas orange)
 HILITE_COLOR_BY_MODE = {
     "PROT":  (0.20, 0.80, 1.00),  # cyan/bleu
@@ -62,6 +90,13 @@ FONT_PRESETS = [
     ("LARGE", "Large", "+2 pt"),
     ("XL", "Extra Large", "+3 pt"),
 ]
+UI_FONT_ITEMS = [
+    ("BLENDER", "Blender", "Police d’interface d’origine"),
+    ("LEXEND", "Lexend", "Police Lexend fournie avec l’addon (lisibilité)"),
+    ("CUSTOM", "Perso", "Fichier TTF/OTF choisi"),
+]
+LEXEND_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Lexend-Regular.ttf")
+
 UI_STYLE_KEYS = ["widget", "panel_title", "panel_title_sel", "widget_label", "widget_label_sel"]
 
 # ------------------------------------------------------------
@@ -73,6 +108,7 @@ NAV_ITEMS = [
     "BRIGHTNESS",
     "UI_SCALE",
     "FONT_PRESET",
+    "UI_FONT",
     "HELP_POPUP",
 ]
 
@@ -82,6 +118,7 @@ NAV_LABELS = {
     "BRIGHTNESS": "Luminosité UI",
     "UI_SCALE": "UI Scale",
     "FONT_PRESET": "Taille texte",
+    "UI_FONT": "Police",
     "HELP_POPUP": "Centre d’aide",
 }
 
@@ -94,215 +131,838 @@ def clamp01(x: float) -> float:
 def clamp(x: float, lo: float, hi: float) -> float:
     return lo if x < lo else hi if x > hi else x
 
-def lerp(a: float, b: float, t: float) -> float:
-    return a + (b - a) * t
-
-def vec_to_list(v):
-    return [float(v[i]) for i in range(len(v))]
-
 def set_vec(target, values):
+    # une seule écriture RNA par vecteur (slice) au lieu d'une par canal
     n = min(len(target), len(values))
-    for i in range(n):
-        target[i] = float(values[i])
+    target[:n] = [float(x) for x in values[:n]]
 
-def force_ui_redraw():
+# ------------------------------------------------------------
+# Redraw planner (demandes dédupliquées, un seul passage par frame)
+# ------------------------------------------------------------
+REDRAW_PANEL = "PANEL"  # région Sidebar des View3D (notre panneau)
+REDRAW_ALL = "ALL"      # toutes les zones de toutes les fenêtres (thème / styles)
+
+_redraw_pending = set()
+
+def has_ui() -> bool:
+    """Faux sous `blender -b` ou sans fenêtre : redraws, statut et thème deviennent des no-ops"""
+    if bpy.app.background:
+        return False
+    wm = bpy.context.window_manager
+    return wm is not None and len(wm.windows) > 0
+
+def request_redraw(scope: str = REDRAW_ALL):
+    if not has_ui():
+        return
+    _redraw_pending.add(scope)
+    # flush_updates vide aussi les redraws : un seul timer pour tout l'événement
+    if not bpy.app.timers.is_registered(flush_updates):
+        bpy.app.timers.register(flush_updates, first_interval=0.0)
+
+@instrumented("flush_redraws")
+def flush_redraws():
+    if not _redraw_pending:
+        return
+    full = REDRAW_ALL in _redraw_pending
+    _redraw_pending.clear()
+
+    tags = 0
     wm = bpy.context.window_manager
     for w in wm.windows:
         scr = w.screen
         if not scr:
             continue
         for area in scr.areas:
-            area.tag_redraw()
+            if full:
+                area.tag_redraw()
+                tags += 1
+            elif area.type == 'VIEW_3D':
+                for region in area.regions:
+                    if region.type == 'UI':
+                        region.tag_redraw()
+                        tags += 1
+    PERF.count("redraw_tags", tags)
+
+@instrumented("force_ui_redraw")
+def force_ui_redraw():
+    request_redraw(REDRAW_ALL)
 
 def set_status(context, text: str | None):
+    if not has_ui():
+        return
     try:
         context.workspace.status_text_set(text)
+        PERF.count("status_sets")
     except Exception:
         pass
 
-def to_gray(rgb):
-    r, g, b = rgb
-    y = 0.2126 * r + 0.7152 * g + 0.0722 * b
-    return (y, y, y)
+# ------------------------------------------------------------
+# Jobs (travaux longs découpés par frame, voir jobs.py)
+# ------------------------------------------------------------
+JOBS = jobs.JobScheduler()
+_job_watch_active = False
+_job_error = None
+
+def _job_status(text):
+    for win in bpy.context.window_manager.windows:
+        set_status(win, text)
+    request_redraw(REDRAW_PANEL)
+
+JOBS.notify = _job_status
+
+def _job_failed(prefix):
+    def on_error(exc):
+        global _job_error
+        # affiché dans le panneau (_draw_jobs) jusqu'au prochain job
+        _job_error = f"{prefix} : {exc}"
+        request_redraw(REDRAW_PANEL)
+    return on_error
+
+def _job_unhandled(job, exc):
+    # job sans on_error, ou rappel qui a lui-même échoué
+    _job_failed(job.label)(exc)
+
+JOBS.on_error = _job_unhandled
+
+def start_job(name, gen, label, on_done=None, on_error=None):
+    """Lance gen en tâche de fond (ESC annule) ; sans UI, l'exécute tout de suite"""
+    global _job_error
+    _job_error = None
+    if not has_ui():
+        try:
+            result = jobs.run_now(gen)
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(e)
+            return None
+        if on_done is not None:
+            on_done(result)
+        return None
+    job = JOBS.submit(name, gen, label, on_done, on_error)
+    if not _job_watch_active:
+        bpy.ops.accesshelper.job_watch('INVOKE_DEFAULT')
+    return job
 
-def adjust_brightness_rgb(rgb, amount: float):
-    """amount in [-1..+1] : -1->black, +1->white"""
-    r, g, b = rgb
-    if amount > 0.0:
-        t = clamp01(amount)
-        return (lerp(r, 1.0, t), lerp(g, 1.0, t), lerp(b, 1.0, t))
-    if amount < 0.0:
-        t = clamp01(-amount)
-        return (lerp(r, 0.0, t), lerp(g, 0.0, t), lerp(b, 0.0, t))
-    return (r, g, b)
+# ------------------------------------------------------------
+# Shadow buffer
+# ------------------------------------------------------------
+# Écart max (par canal) sous lequel un slot n'est pas réécrit : < 1/2 niveau 8 bits
+SHADOW_TOLERANCE = 0.5 / 255.0
+# le thème stocke ses couleurs en unsigned char : 255 niveaux par canal
+THEME_LEVELS = 255
+# un curseur glissé à 60 Hz ne relit pas le thème à chaque frame
+DRIFT_CHECK_INTERVAL = 0.25
 
 # ------------------------------------------------------------
-# Theme backup / restore
+# Color pipeline (matrice affine 3x4 sur un buffer float32 plat)
 # ------------------------------------------------------------
-def ensure_theme_backup():
-    wm = bpy.context.window_manager
-    if THEME_BACKUP_KEY in wm:
-        return
+LUMA_WEIGHTS = (0.2126, 0.7152, 0.0722)
+
+def affine_identity():
+    m = np.zeros((3, 4), dtype=np.float32)
+    m[:, :3] = np.eye(3, dtype=np.float32)
+    return m
+
+def affine_compose(outer, inner):
+    """Retourne outer ∘ inner (les deux en 3x4)."""
+    m = np.empty((3, 4), dtype=np.float32)
+    m[:, :3] = outer[:, :3] @ inner[:, :3]
+    m[:, 3] = outer[:, :3] @ inner[:, 3] + outer[:, 3]
+    return m
+
+def mode_matrix(mode: str, intensity: float):
+    m = affine_identity()
+    t = clamp01(intensity)
+    if mode == "OFF" or t <= 0.0:
+        return m
+    if mode == "ACHRO":
+        gray = np.tile(np.asarray(LUMA_WEIGHTS, dtype=np.float32), (3, 1))
+        m[:, :3] = (1.0 - t) * m[:, :3] + t * gray
+    else:
+        hilite = np.asarray(HILITE_COLOR_BY_MODE.get(mode, (1.0, 1.0, 1.0)), dtype=np.float32)
+        m[:, :3] *= (1.0 - t)
+        m[:, 3] = t * hilite
+    return m
+
+def brightness_matrix(amount: float):
+    """amount in [-1..+1] : même courbe que adjust_brightness_rgb"""
+    m = affine_identity()
+    t = clamp01(abs(amount))
+    if amount == 0.0 or t <= 0.0:
+        return m
+    m[:, :3] *= (1.0 - t)
+    if amount > 0.0:
+        m[:, 3] = t
+    return m
 
-    prefs = bpy.context.preferences
-    if not prefs.themes:
-        return
-    theme = prefs.themes[0]
-    ui = theme.user_interface
+def build_color_matrices(mode: str, intensity: float, brightness: float):
+    """(2, 3, 4) : [0] champs normaux (luminosité), [1] champs HILITE_FIELDS (mode puis luminosité)"""
+    bright = brightness_matrix(brightness)
+    return np.stack([bright, affine_compose(bright, mode_matrix(mode, intensity))])
 
-    data = {"widgets": {}, "editors": {}, "globals": {}}
+# ------------------------------------------------------------
+# Theme index (introspection RNA, construit une fois par session)
+# ------------------------------------------------------------
+COLOR_SUBTYPES = {"COLOR", "COLOR_GAMMA"}
 
+def _core_theme_paths():
+    paths = set()
     for wcol_name in WIDGETS:
-        if not hasattr(ui, wcol_name):
-            continue
-        wcol = getattr(ui, wcol_name)
-        dump = {}
         for f in WCOL_FIELDS:
-            if hasattr(wcol, f):
-                v = getattr(wcol, f)
-                if hasattr(v, "__iter__"):
-                    dump[f] = vec_to_list(v)
-        if dump:
-            data["widgets"][wcol_name] = dump
-
+            paths.add(f"user_interface.{wcol_name}.{f}")
     for editor_name in EDITORS:
-        if not hasattr(theme, editor_name):
-            continue
-        editor = getattr(theme, editor_name)
-        ed_dump = {}
         for a, b in EDITOR_FIELDS:
-            if hasattr(editor, a):
-                sub = getattr(editor, a)
-                if hasattr(sub, b):
-                    v = getattr(sub, b)
-                    if hasattr(v, "__iter__"):
-                        ed_dump[f"{a}.{b}"] = vec_to_list(v)
-        if ed_dump:
-            data["editors"][editor_name] = ed_dump
-
+            paths.add(f"{editor_name}.{a}.{b}")
     for attr in GLOBAL_UI_ATTRS:
-        if hasattr(ui, attr):
-            v = getattr(ui, attr)
-            if hasattr(v, "__iter__"):
-                data["globals"][attr] = vec_to_list(v)
+        paths.add(f"user_interface.{attr}")
+    return frozenset(paths)
+
+# Couverture historique (WIDGETS / EDITORS / GLOBAL_UI_ATTRS)
+CORE_THEME_PATHS = _core_theme_paths()
+
+# (texte, fond) frères dans une même struct : wcol_*, space, space_list
+CONTRAST_PAIRS = (
+    ("text", "inner"), ("text_sel", "inner_sel"),
+    ("text", "back"), ("text_hi", "back"),
+    ("header_text", "header"), ("header_text_hi", "header"),
+    ("list_text", "list"), ("list_text_hi", "list"),
+)
 
-    wm[THEME_BACKUP_KEY] = json.dumps(data)
+def walk_theme_colors(struct, prefix: str = "", seen=None):
+    """(struct, identifiant, chemin, longueur) pour chaque couleur RNA sous struct"""
+    if seen is None:
+        seen = set()
+    for prop in struct.bl_rna.properties:
+        ident = prop.identifier
+        if ident == "rna_type":
+            continue
+        path = f"{prefix}.{ident}" if prefix else ident
+        if prop.type == 'FLOAT':
+            if prop.subtype in COLOR_SUBTYPES and prop.array_length in (3, 4):
+                yield struct, ident, path, prop.array_length
+        elif prop.type == 'POINTER':
+            sub = getattr(struct, ident, None)
+            if sub is None or not hasattr(sub, "bl_rna"):
+                continue
+            # même mémoire exposée sous plusieurs types (ex. view_3d / view_3d.space)
+            key = (sub.as_pointer(), sub.bl_rna.identifier)
+            if key in seen:
+                continue
+            seen.add(key)
+            yield from walk_theme_colors(sub, path, seen)
+        elif prop.type == 'COLLECTION':
+            for i, item in enumerate(getattr(struct, ident, ())):
+                yield from walk_theme_colors(item, f"{path}[{i}]", seen)
+
+class ThemeIndex:
+    """Accesseurs résolus de toutes les couleurs du thème, avec offsets dans un buffer plat."""
+    __slots__ = ("theme_ptr", "paths", "slot_by_path", "vecs", "lengths", "offsets", "size",
+                 "rgb_index", "hilite", "core", "layout_hash", "_coverage", "_pairs")
+
+    def __init__(self, theme):
+        self.theme_ptr = theme.as_pointer()
+        self.paths, self.vecs = [], []
+        lengths, hilite = [], []
+        for struct, ident, path, n in walk_theme_colors(theme):
+            self.paths.append(path)
+            self.vecs.append(getattr(struct, ident))
+            lengths.append(n)
+            hilite.append(ident in HILITE_FIELDS and struct.bl_rna.identifier == "ThemeWidgetColors")
+        self.slot_by_path = {p: i for i, p in enumerate(self.paths)}
+        self.lengths = np.asarray(lengths, dtype=np.int32)
+        self.offsets = np.zeros(len(lengths), dtype=np.int32)
+        if len(lengths) > 1:
+            self.offsets[1:] = np.cumsum(self.lengths[:-1])
+        self.size = int(self.lengths.sum())
+        self.rgb_index = self.offsets[:, None] + np.arange(3, dtype=np.int32)
+        self.hilite = np.asarray(hilite, dtype=bool)
+        self.core = np.asarray([p in CORE_THEME_PATHS for p in self.paths], dtype=bool)
+        h = hashlib.blake2b(digest_size=8)
+        for path, n in zip(self.paths, lengths):
+            h.update(f"{path}:{n}\n".encode())
+        self.layout_hash = h.hexdigest()
+        self._coverage = {}
+        self._pairs = {}
+
+    def __len__(self):
+        return len(self.vecs)
+
+    def read(self):
+        flat = (x for vec in self.vecs for x in vec[:])
+        return np.fromiter(flat, dtype=np.float32, count=self.size)
+
+    def read_slots(self, slots):
+        """Valeurs des seuls slots donnés, empaquetées dans l'ordre de slots"""
+        vecs = self.vecs
+        flat = (x for i in slots.tolist() for x in vecs[i][:])
+        return np.fromiter(flat, dtype=np.float32, count=int(self.lengths[slots].sum()))
+
+    def _covered(self, name: str):
+        cached = self._coverage.get(name)
+        if cached is None:
+            sel = self.core if name == "CORE" else np.ones(len(self.vecs), dtype=bool)
+            slots = np.flatnonzero(sel)
+            lengths = self.lengths[slots]
+            # position de chaque composante des slots couverts dans le buffer plat
+            starts = np.repeat(self.offsets[slots] - (np.cumsum(lengths) - lengths), lengths)
+            elems = starts + np.arange(int(lengths.sum()), dtype=np.int32)
+            cached = (self.rgb_index[sel], self.hilite[sel], slots, elems)
+            self._coverage[name] = cached
+        return cached
+
+    def coverage(self, name: str):
+        """(index RGB, masque highlight) des slots couverts, mis en cache par couverture"""
+        return self._covered(name)[:2]
+
+    def covered_slots(self, name: str):
+        """(slots couverts, index de leurs composantes dans le buffer plat)"""
+        return self._covered(name)[2:]
+
+    def contrast_pairs(self, coverage: str = "FULL"):
+        """(slots texte, slots fond) des paires CONTRAST_PAIRS dont les deux slots sont couverts"""
+        pairs = self._pairs.get(coverage)
+        if pairs is None:
+            fg, bg = self._all_pairs()
+            covered = np.zeros(len(self.vecs), dtype=bool)
+            covered[self.covered_slots(coverage)[0]] = True
+            keep = covered[fg] & covered[bg]
+            pairs = self._pairs[coverage] = (fg[keep], bg[keep])
+        return pairs
+
+    def _all_pairs(self):
+        full = self._pairs.get(None)
+        if full is None:
+            fg, bg = [], []
+            for i, path in enumerate(self.paths):
+                parent, _, ident = path.rpartition(".")
+                for f, b in CONTRAST_PAIRS:
+                    j = self.slot_by_path.get(f"{parent}.{b}") if ident == f else None
+                    if j is not None:
+                        fg.append(i)
+                        bg.append(j)
+            full = self._pairs[None] = (np.asarray(fg, dtype=np.int32), np.asarray(bg, dtype=np.int32))
+        return full
+
+_theme_index: ThemeIndex | None = None
+
+def invalidate_theme_index():
+    global _theme_index
+    _theme_index = None
+    invalidate_snapshots()
+
+def get_theme_index(theme):
+    global _theme_index
+    if _theme_index is None or _theme_index.theme_ptr != theme.as_pointer():
+        _theme_index = ThemeIndex(theme)
+    return _theme_index
 
-def restore_theme_backup():
-    wm = bpy.context.window_manager
-    if THEME_BACKUP_KEY not in wm:
-        force_ui_redraw()
-        return
+# ------------------------------------------------------------
+# Resident snapshots (parsés une fois ; wm ne sert qu'à persister)
+# ------------------------------------------------------------
+def _backup_paths(data):
+    """{chemin: valeurs} depuis un backup JSON (format plat ou imbriqué v17)"""
+    if "paths" in data:
+        return data["paths"]
+    paths = {}
+    for wcol_name, fields_dump in data.get("widgets", {}).items():
+        for f, values in fields_dump.items():
+            paths[f"user_interface.{wcol_name}.{f}"] = values
+    for editor_name, ed_dump in data.get("editors", {}).items():
+        for sub_path, values in ed_dump.items():
+            paths[f"{editor_name}.{sub_path}"] = values
+    for attr, values in data.get("globals", {}).items():
+        paths[f"user_interface.{attr}"] = values
+    return paths
+
+def _theme_levels(buf):
+    """Niveaux 8 bits que le thème garde de buf (l'écriture RNA borne et arrondit)"""
+    return np.rint(np.clip(buf, 0.0, 1.0) * THEME_LEVELS)
+
+def _quantize(buf):
+    return (_theme_levels(buf) / THEME_LEVELS).astype(np.float32)
+
+def _fingerprint(buf) -> bytes:
+    # sur les niveaux et non les floats : la relecture (niveau * 1/255) varie d'un ulp
+    return hashlib.blake2b(_theme_levels(buf).astype(np.uint8).tobytes(), digest_size=8).digest()
+
+class ThemeSnapshot:
+    """Valeurs de base du thème (buffer float32 indexé par ThemeIndex) + shadow des écritures."""
+    __slots__ = ("index", "values", "_shadow", "_digest", "_fingerprints", "checked_at")
+
+    def __init__(self, index, values):
+        self.index = index
+        self.values = values
+        # dernières valeurs écrites (None = inconnu, tout réécrire)
+        self._shadow = None
+        self._digest = None
+        # empreinte du shadow par couverture : ce que le thème doit contenir
+        self._fingerprints = {}
+        # dernière relecture du thème par couverture (capture ou contrôle de dérive)
+        self.checked_at = {}
+
+    @property
+    def shadow(self):
+        return self._shadow
+
+    @shadow.setter
+    def shadow(self, buf):
+        # ce que le thème contient réellement, pas la valeur demandée
+        self._shadow = None if buf is None else _quantize(buf)
+        self._fingerprints.clear()
+
+    @property
+    def digest(self) -> str:
+        """Hash des valeurs de base (clé du cache d'états) ; à remettre à zéro via touch()"""
+        if self._digest is None:
+            self._digest = hashlib.blake2b(self.values.tobytes(), digest_size=8).hexdigest()
+        return self._digest
+
+    def touch(self):
+        self._digest = None
+
+    @classmethod
+    def from_paths(cls, index, saved_paths):
+        # les chemins absents du backup n'ont jamais été modifiés : valeur courante
+        values = index.read()
+        offsets = index.offsets.tolist()
+        lengths = index.lengths.tolist()
+        for path, saved in saved_paths.items():
+            i = index.slot_by_path.get(path)
+            if i is None:
+                continue
+            n = min(lengths[i], len(saved))
+            values[offsets[i]:offsets[i] + n] = saved[:n]
+        return cls(index, values)
+
+    @classmethod
+    def from_packed(cls, index, packed):
+        values = _idprop_array(packed["values"], np.float32)
+        if packed.get("layout") == index.layout_hash and values.size == index.size:
+            return cls(index, values)
+
+        # autre layout (autre version de Blender) : remap par la table de chemins
+        paths = str(packed.get("paths", "")).split("\n")
+        lengths = _idprop_array(packed["lengths"], np.int32).tolist()
+        flat = values.tolist()
+        saved, off = {}, 0
+        for path, n in zip(paths, lengths):
+            saved[path] = flat[off:off + n]
+            off += n
+        return cls.from_paths(index, saved)
+
+    def absorb_drift(self, coverage: str = "FULL", tol: float = SHADOW_TOLERANCE,
+                     max_age: float = 0.0) -> int:
+        """Reprend dans la base les slots modifiés hors de l'addon (édition, preset) ; retourne leur nombre.
+
+        Seuls les slots couverts sont relus, et leur empreinte comparée à celle
+        du shadow : le cas courant (rien n'a bougé) coûte une lecture et un hash.
+        """
+        shadow = self._shadow
+        now = time.perf_counter()
+        # une relecture complète vaut aussi pour CORE
+        last = max(self.checked_at.get(coverage, float("-inf")), self.checked_at.get("FULL", float("-inf")))
+        if shadow is None or now - last < max_age:
+            return 0
+        self.checked_at[coverage] = now
+        slots, elems = self.index.covered_slots(coverage)
+        if not len(slots):
+            return 0
+        live = self.index.read_slots(slots)
+        PERF.count("theme_drift_checks")
+        expected = self._fingerprints.get(coverage)
+        if expected is None:
+            expected = self._fingerprints[coverage] = _fingerprint(shadow[elems])
+        if _fingerprint(live) == expected:
+            return 0
+
+        # empreinte différente : seulement alors, comparaison slot par slot
+        lengths = self.index.lengths[slots]
+        starts = np.cumsum(lengths) - lengths
+        drifted = np.maximum.reduceat(np.abs(live - shadow[elems]), starts) > tol
+        n = int(np.count_nonzero(drifted))
+        if n:
+            mask = np.repeat(drifted, lengths)
+            sel = elems[mask]
+            self.values[sel] = live[mask]
+            self.touch()
+            PERF.count("theme_drift_slots", n)
+        # sous la tolérance, le thème fait foi : le shadow le rejoint
+        self._shadow[elems] = _quantize(live)
+        self._fingerprints.clear()
+        self._fingerprints[coverage] = _fingerprint(live)
+        return n
+
+    def persist(self, wm):
+        index = self.index
+        wm[THEME_BACKUP_KEY] = {
+            "layout": index.layout_hash,
+            "paths": "\n".join(index.paths),
+            "lengths": index.lengths,
+            "values": self.values,
+        }
+
+    def transform(self, mats, lut=None, coverage: str = "CORE"):
+        """lut (cvd.bake_lut) : appliquée à toute la palette couverte avant les matrices"""
+        out = self.values.copy()
+        rgb_index, hilite = self.index.coverage(coverage)
+        if not len(rgb_index):
+            return out
+        rgb = self.values[rgb_index]
+        if lut is not None:
+            rgb = cvd.apply_lut(lut, rgb)
+        plain = rgb @ mats[0, :, :3].T + mats[0, :, 3]
+        hi = rgb @ mats[1, :, :3].T + mats[1, :, 3]
+        out[rgb_index] = np.where(hilite[:, None], hi, plain)
+        return out
+
+    def changed_slots(self, buf, tol: float = SHADOW_TOLERANCE):
+        if self._shadow is None or not len(self.index):
+            return np.ones(len(self.index), dtype=bool)
+        diff = np.abs(buf - self._shadow)
+        return np.maximum.reduceat(diff, self.index.offsets) > tol
+
+    def write(self, buf, tol: float = SHADOW_TOLERANCE) -> int:
+        """Écrit les slots qui diffèrent du shadow buffer ; retourne le nombre écrit."""
+        index = self.index
+        # écrit et mémorise les niveaux 8 bits : relu, le thème égale le shadow
+        buf = _quantize(buf)
+        changed = self.changed_slots(buf, tol)
+        idx = np.flatnonzero(changed).tolist()
+        offsets = index.offsets.tolist()
+        lengths = index.lengths.tolist()
+        for i in idx:
+            off = offsets[i]
+            set_vec(index.vecs[i], buf[off:off + lengths[i]].tolist())
+
+        if self._shadow is None:
+            self.shadow = buf
+        elif idx:
+            mask = np.repeat(changed, index.lengths)
+            self._shadow[mask] = buf[mask]
+            self._fingerprints.clear()
+
+        PERF.count("rna_writes", len(idx))
+        PERF.count("rna_writes_skipped", len(index) - len(idx))
+        return len(idx)
+
+# ------------------------------------------------------------
+# Theme state cache (LRU des buffers finaux, changement de mode instantané)
+# ------------------------------------------------------------
+THEME_CACHE_MAX_ENTRIES = 16
+THEME_CACHE_MAX_BYTES = 8 * 1024 * 1024
+
+# pas de quantification des curseurs dans la clé (et dans le calcul)
+STATE_QUANT = 200
+
+def quantize_state(x: float) -> float:
+    return round(x * STATE_QUANT) / STATE_QUANT
+
+class ThemeStateCache:
+    """LRU borné en entrées et en octets ; les buffers stockés sont en lecture seule."""
+
+    def __init__(self, max_entries: int = THEME_CACHE_MAX_ENTRIES, max_bytes: int = THEME_CACHE_MAX_BYTES):
+        self._items = OrderedDict()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def configure(self, max_entries: int | None = None, max_bytes: int | None = None):
+        if max_entries is not None:
+            self.max_entries = max(0, int(max_entries))
+        if max_bytes is not None:
+            self.max_bytes = max(0, int(max_bytes))
+        self._evict()
+
+    def get(self, key):
+        buf = self._items.get(key)
+        if buf is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return buf
+
+    def put(self, key, buf):
+        if key in self._items:
+            self.nbytes -= self._items.pop(key).nbytes
+        buf.setflags(write=False)
+        self._items[key] = buf
+        self.nbytes += buf.nbytes
+        self._evict()
+
+    def _evict(self):
+        while self._items and (len(self._items) > self.max_entries or self.nbytes > self.max_bytes):
+            _key, buf = self._items.popitem(last=False)
+            self.nbytes -= buf.nbytes
+            self.evictions += 1
+
+    def clear(self):
+        self._items.clear()
+        self.nbytes = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._items),
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+theme_state_cache = ThemeStateCache()
+
+_theme_snapshot: ThemeSnapshot | None = None
+_style_snapshot: dict | None = None
+
+def invalidate_snapshots():
+    global _theme_snapshot, _style_snapshot, _font_backup
+    _theme_snapshot = None
+    _style_snapshot = None
+    _font_backup = None
+    theme_state_cache.clear()
+
+def _idprop_array(prop, dtype):
+    # une seule copie depuis le buffer de l'IDProperty
+    try:
+        return np.array(memoryview(prop), dtype=dtype).ravel()
+    except TypeError:
+        return np.asarray(prop.to_list(), dtype=dtype)
 
-    raw = wm.get(THEME_BACKUP_KEY)
+def _decode_json_backup(wm, key):
+    raw = wm.get(key)
     try:
-        data = json.loads(raw) if isinstance(raw, str) else raw
+        return json.loads(raw) if isinstance(raw, str) else raw.to_dict()
     except Exception:
-        try: del wm[THEME_BACKUP_KEY]
-        except Exception: pass
-        force_ui_redraw()
-        return
+        return None
 
-    prefs = bpy.context.preferences
-    if not prefs.themes:
-        try: del wm[THEME_BACKUP_KEY]
+def _drop_backup(wm, keys):
+    for key in keys:
+        try: del wm[key]
         except Exception: pass
-        force_ui_redraw()
-        return
 
-    theme = prefs.themes[0]
-    ui = theme.user_interface
+def has_theme_backup(wm) -> bool:
+    return any(k in wm for k in (THEME_BACKUP_KEY, *LEGACY_THEME_BACKUP_KEYS))
 
-    for wcol_name, fields_dump in data.get("widgets", {}).items():
-        if not hasattr(ui, wcol_name):
-            continue
-        wcol = getattr(ui, wcol_name)
-        for f, values in fields_dump.items():
-            if hasattr(wcol, f):
-                v = getattr(wcol, f)
-                if hasattr(v, "__iter__"):
-                    set_vec(v, values)
+def has_style_backup(wm) -> bool:
+    return any(k in wm for k in (STYLE_BACKUP_KEY, *LEGACY_STYLE_BACKUP_KEYS))
 
-    for editor_name, ed_dump in data.get("editors", {}).items():
-        if not hasattr(theme, editor_name):
-            continue
-        editor = getattr(theme, editor_name)
-        for path, values in ed_dump.items():
-            try: a, b = path.split(".")
-            except Exception: continue
-            if hasattr(editor, a):
-                sub = getattr(editor, a)
-                if hasattr(sub, b):
-                    v = getattr(sub, b)
-                    if hasattr(v, "__iter__"):
-                        set_vec(v, values)
+def load_theme_backup(wm, index):
+    packed = wm.get(THEME_BACKUP_KEY)
+    if packed is not None:
+        try:
+            return ThemeSnapshot.from_packed(index, packed)
+        except Exception:
+            _drop_backup(wm, (THEME_BACKUP_KEY,))
 
-    for attr, values in data.get("globals", {}).items():
-        if hasattr(ui, attr):
-            v = getattr(ui, attr)
-            if hasattr(v, "__iter__"):
-                set_vec(v, values)
+    for key in LEGACY_THEME_BACKUP_KEYS:
+        if key not in wm:
+            continue
+        data = _decode_json_backup(wm, key)
+        _drop_backup(wm, (key,))
+        if data is not None:
+            snap = ThemeSnapshot.from_paths(index, _backup_paths(data))
+            snap.persist(wm)
+            return snap
+    return None
+
+def persist_style_backup(wm, points: dict):
+    wm[STYLE_BACKUP_KEY] = {
+        "keys": "\n".join(points),
+        "points": np.asarray(list(points.values()), dtype=np.int32),
+    }
+
+def load_style_backup(wm):
+    packed = wm.get(STYLE_BACKUP_KEY)
+    if packed is not None:
+        try:
+            keys = str(packed.get("keys", "")).split("\n")
+            points = _idprop_array(packed["points"], np.int32).tolist()
+            return dict(zip(keys, points))
+        except Exception:
+            _drop_backup(wm, (STYLE_BACKUP_KEY,))
 
-    try: del wm[THEME_BACKUP_KEY]
-    except Exception: pass
-    force_ui_redraw()
+    for key in LEGACY_STYLE_BACKUP_KEYS:
+        if key not in wm:
+            continue
+        data = _decode_json_backup(wm, key)
+        _drop_backup(wm, (key,))
+        if data is not None:
+            points = {k: int(v) for k, v in data.items()}
+            persist_style_backup(wm, points)
+            return points
+    return None
+
+def _repersist_backups(wm):
+    """Réécrit dans wm les backups des effets encore appliqués aux préférences.
+
+    Thème, tailles et police vivent dans les préférences et survivent au
+    chargement d'un fichier ; leurs backups vivaient dans l'ancien wm.
+    """
+    snap = _theme_snapshot
+    if snap is not None and (snap.shadow is None or not np.array_equal(snap.shadow, _quantize(snap.values))):
+        snap.persist(wm)
+
+    styles = getattr(bpy.context.preferences, "ui_styles", None)
+    if _style_snapshot is not None and styles and capture_style_points(styles[0]) != _style_snapshot:
+        persist_style_backup(wm, _style_snapshot)
+
+    view = getattr(bpy.context.preferences, "view", None)
+    if _font_backup is not None and view is not None and view.font_path_ui != _font_backup:
+        wm[FONT_BACKUP_KEY] = _font_backup
+
+@bpy.app.handlers.persistent
+def _on_load_post(_dummy):
+    global _active_scene_ptr
+    prefs = bpy.context.preferences
+    if _theme_index is not None and (not prefs.themes or _theme_index.theme_ptr != prefs.themes[0].as_pointer()):
+        # autre thème : les snapshots résidents ne s'y appliquent plus
+        invalidate_theme_index()
+    _repersist_backups(bpy.context.window_manager)
+    invalidate_scene_colors()
+    _active_scene_ptr = 0
+    # le fichier chargé apporte son WindowManager (et d'éventuelles surcharges)
+    schedule_update("mode", "font_preset", "ui_font")
 
 # ------------------------------------------------------------
-# UI Styles (size) backup / apply
+# Theme backup / restore
 # ------------------------------------------------------------
-def ensure_style_backup():
+@instrumented("ensure_theme_backup")
+def ensure_theme_backup():
+    global _theme_snapshot
+    prefs = bpy.context.preferences
+    if not prefs.themes:
+        return None
+    theme = prefs.themes[0]
+    index = get_theme_index(theme)
+    wm = bpy.context.window_manager
+
+    snap = _theme_snapshot
+    if snap is not None and snap.index is index:
+        # effets coupés depuis : restore a laissé thème = shadow = base, et les
+        # éditions faites entre-temps sont reprises par absorb_drift dans apply_effects
+        if THEME_BACKUP_KEY not in wm:
+            snap.persist(wm)
+        return snap
+
+    snap = load_theme_backup(wm, index)
+    if snap is not None:
+        _theme_snapshot = snap
+    else:
+        _theme_snapshot = ThemeSnapshot(index, index.read())
+        _theme_snapshot.checked_at["FULL"] = time.perf_counter()
+        # capturé depuis le thème : il contient déjà exactement ces valeurs
+        _theme_snapshot.shadow = _theme_snapshot.values.copy()
+        _theme_snapshot.persist(wm)
+    return _theme_snapshot
+
+@instrumented("restore_theme_backup")
+def restore_theme_backup(coverage: str = "FULL"):
+    """coverage : slots que les effets ont pu écrire, seuls relus pour la dérive"""
+    global _theme_snapshot
     wm = bpy.context.window_manager
-    if STYLE_BACKUP_KEY in wm:
+    if not has_theme_backup(wm):
         return
 
     prefs = bpy.context.preferences
-    styles = getattr(prefs, "ui_styles", None)
-    if not styles or len(styles) == 0:
+    if not prefs.themes:
+        _drop_backup(wm, (THEME_BACKUP_KEY, *LEGACY_THEME_BACKUP_KEYS))
+        force_ui_redraw()
         return
 
-    style = styles[0]
+    index = get_theme_index(prefs.themes[0])
+    if _theme_snapshot is None or _theme_snapshot.index is not index:
+        snap = load_theme_backup(wm, index)
+        if snap is None:
+            force_ui_redraw()
+            return
+        _theme_snapshot = snap
+
+    snap = _theme_snapshot
+    # éditions faites pendant qu'un mode était actif : elles deviennent la base restaurée ;
+    # relu seulement si apply_effects ne vient pas de le faire
+    snap.absorb_drift(coverage, max_age=DRIFT_CHECK_INTERVAL)
+    written = snap.write(snap.values, tol=0.0)
+
+    # le snapshot reste résident ; seule la copie persistée disparaît
+    _drop_backup(wm, (THEME_BACKUP_KEY, *LEGACY_THEME_BACKUP_KEYS))
+    if written:
+        force_ui_redraw()
+
+# ------------------------------------------------------------
+# UI Styles (size) backup / apply
+# ------------------------------------------------------------
+def capture_style_points(style):
     dump = {}
     for k in UI_STYLE_KEYS:
         if hasattr(style, k):
             fs = getattr(style, k)
             if hasattr(fs, "points"):
                 dump[k] = int(fs.points)
+    return dump
+
+def ensure_style_backup():
+    global _style_snapshot
+    prefs = bpy.context.preferences
+    styles = getattr(prefs, "ui_styles", None)
+    if not styles or len(styles) == 0:
+        return None
+    style = styles[0]
+    wm = bpy.context.window_manager
+
+    if _style_snapshot is not None:
+        if STYLE_BACKUP_KEY in wm:
+            return _style_snapshot
+        if capture_style_points(style) == _style_snapshot:
+            persist_style_backup(wm, _style_snapshot)
+            return _style_snapshot
 
-    wm[STYLE_BACKUP_KEY] = json.dumps(dump)
+    dump = load_style_backup(wm)
+    if dump is None:
+        dump = capture_style_points(style)
+        persist_style_backup(wm, dump)
 
+    _style_snapshot = dump
+    return _style_snapshot
+
+@instrumented("restore_style_backup")
 def restore_style_backup():
+    global _style_snapshot
     wm = bpy.context.window_manager
-    if STYLE_BACKUP_KEY not in wm:
-        return
-
-    raw = wm.get(STYLE_BACKUP_KEY)
-    try:
-        dump = json.loads(raw) if isinstance(raw, str) else raw
-    except Exception:
-        try: del wm[STYLE_BACKUP_KEY]
-        except Exception: pass
+    if not has_style_backup(wm):
         return
 
     prefs = bpy.context.preferences
     styles = getattr(prefs, "ui_styles", None)
     if not styles or len(styles) == 0:
-        try: del wm[STYLE_BACKUP_KEY]
-        except Exception: pass
+        _drop_backup(wm, (STYLE_BACKUP_KEY, *LEGACY_STYLE_BACKUP_KEYS))
         return
 
+    if _style_snapshot is None:
+        dump = load_style_backup(wm)
+        if dump is None:
+            return
+        _style_snapshot = dump
+
     style = styles[0]
-    for k, pts in dump.items():
+    for k, pts in _style_snapshot.items():
         if hasattr(style, k):
             fs = getattr(style, k)
             if hasattr(fs, "points"):
                 fs.points = int(pts)
 
-    try: del wm[STYLE_BACKUP_KEY]
-    except Exception: pass
+    _drop_backup(wm, (STYLE_BACKUP_KEY, *LEGACY_STYLE_BACKUP_KEYS))
     force_ui_redraw()
 
+@instrumented("apply_font_preset")
 def apply_font_preset(preset_id: str):
-    ensure_style_backup()
+    base = ensure_style_backup()
 
     prefs = bpy.context.preferences
     styles = getattr(prefs, "ui_styles", None)
@@ -313,15 +973,9 @@ def apply_font_preset(preset_id: str):
         restore_style_backup()
         return
 
-    wm = bpy.context.window_manager
-    try:
-        base = json.loads(wm.get(STYLE_BACKUP_KEY, "{}"))
-    except Exception:
-        base = {}
-
     delta = {"COMFORT": 1, "LARGE": 2, "XL": 3}.get(preset_id, 0)
     style = styles[0]
-    for k, base_pts in base.items():
+    for k, base_pts in (base or {}).items():
         if hasattr(style, k):
             fs = getattr(style, k)
             if hasattr(fs, "points"):
@@ -335,177 +989,746 @@ class ACCESSHELPER_OT_reset_fonts(bpy.types.Operator):
     bl_description = "Remet la taille de police Blender"
 
     def execute(self, context):
-        props = context.scene.access_helper
+        props = get_props(context)
         props.font_preset = "DEFAULT"
         restore_style_backup()
         return {'FINISHED'}
 
+# ------------------------------------------------------------
+# UI font (Lexend fournie ou TTF utilisateur)
+#
+# Changer font_path_ui recharge la police et vide les caches de glyphes :
+# chaque fichier n'est validé qu'une fois par session et le chemin n'est
+# écrit que s'il diffère de celui en place.
+# ------------------------------------------------------------
+FONT_MAGICS = (b"\x00\x01\x00\x00", b"OTTO", b"true", b"ttcf")
+
+_font_checks = {}
+_font_backup = None
+
+def validate_font(path: str):
+    """Chemin absolu si le fichier est une police TrueType/OpenType lisible, sinon None"""
+    if not path:
+        return None
+    path = os.path.normpath(bpy.path.abspath(path))
+    ok = _font_checks.get(path)
+    if ok is None:
+        try:
+            with open(path, "rb") as f:
+                ok = f.read(4) in FONT_MAGICS
+        except OSError:
+            ok = False
+        _font_checks[path] = ok
+    return path if ok else None
+
+def resolve_ui_font(props):
+    if props.ui_font == "LEXEND":
+        return validate_font(LEXEND_PATH)
+    if props.ui_font == "CUSTOM":
+        return validate_font(props.ui_font_path)
+    return None
+
+def ensure_font_backup(view):
+    global _font_backup
+    wm = bpy.context.window_manager
+    if _font_backup is None:
+        saved = wm.get(FONT_BACKUP_KEY)
+        _font_backup = str(saved) if saved is not None else view.font_path_ui
+    if FONT_BACKUP_KEY not in wm:
+        wm[FONT_BACKUP_KEY] = _font_backup
+    return _font_backup
+
+@instrumented("restore_font_backup")
+def restore_font_backup():
+    global _font_backup
+    wm = bpy.context.window_manager
+    view = getattr(bpy.context.preferences, "view", None)
+    if _font_backup is None and FONT_BACKUP_KEY not in wm:
+        return
+    original = _font_backup if _font_backup is not None else str(wm[FONT_BACKUP_KEY])
+    if view is not None and view.font_path_ui != original:
+        view.font_path_ui = original
+        force_ui_redraw()
+    _drop_backup(wm, (FONT_BACKUP_KEY,))
+    _font_backup = None
+
+@instrumented("apply_ui_font")
+def apply_ui_font(props):
+    view = getattr(bpy.context.preferences, "view", None)
+    if view is None or not hasattr(view, "font_path_ui"):
+        return
+    if props.ui_font == "BLENDER":
+        restore_font_backup()
+        return
+
+    original = ensure_font_backup(view)
+    # police introuvable ou invalide : on garde celle d'origine
+    target = resolve_ui_font(props) or original
+    if view.font_path_ui != target:
+        view.font_path_ui = target
+        force_ui_redraw()
+
 # ------------------------------------------------------------
 # UI scale (0..2, applied min 0.25 for safety)
 # ------------------------------------------------------------
+@instrumented("apply_ui_scale")
 def apply_ui_scale(props):
     prefs = bpy.context.preferences
     view = getattr(prefs, "view", None)
     if not view or not hasattr(view, "ui_scale"):
         return
 
-    props.ui_scale = clamp(props.ui_scale, 0.0, 2.0)
-
-    applied = max(0.25, props.ui_scale)
-    view.ui_scale = applied
-
+    # n'écrit que ce qui change : chaque set relance la mise en page de toute l'UI
+    applied = max(0.25, clamp(props.ui_scale, 0.0, 2.0))
     if abs(props.ui_scale - applied) > 1e-6:
         props.ui_scale = applied
 
-    force_ui_redraw()
+    if abs(view.ui_scale - applied) > 1e-6:
+        view.ui_scale = applied
+        force_ui_redraw()
+
+# ------------------------------------------------------------
+# Contraste texte / fond (WCAG)
+#
+# Les ratios de toutes les paires, pour chaque vision, sortent d'une seule
+# opération : assez rapide pour tourner à chaque application. L'alpha des
+# fonds est ignoré (couleur supposée opaque).
+# ------------------------------------------------------------
+CONTRAST_WORST = 5
+
+_contrast_report = None
+
+def contrast_visions(mode, method, intensity):
+    # vision normale + la déficience active ; en SIMULATE le buffer est déjà simulé
+    modes = () if mode == "OFF" or method == "SIMULATE" else (mode,)
+    return contrast.vision_matrices(modes, cvd.quantize_severity(intensity))
+
+@instrumented("contrast_fix")
+def fix_theme_contrast(index, buf, target, mats, coverage="FULL"):
+    """Corrige en place les textes couverts sous target ; retourne le nombre de paires modifiées"""
+    fg_slots, bg_slots = index.contrast_pairs(coverage)
+    if not len(fg_slots):
+        return 0
+    fg_idx = index.rgb_index[fg_slots]
+    fixed, t = contrast.fix_foreground(buf[fg_idx], buf[index.rgb_index[bg_slots]], target, mats)
+    moved = t > 0.0
+    buf[fg_idx[moved]] = fixed[moved]
+    n = int(moved.sum())
+    PERF.count("contrast_fixes", n)
+    return n
+
+@instrumented("contrast_audit")
+def audit_theme_contrast(index, buf, target, coverage="FULL"):
+    global _contrast_report
+    fg_slots, bg_slots = index.contrast_pairs(coverage)
+    if not len(fg_slots):
+        _contrast_report = None
+        return None
+    r = contrast.ratios(buf[index.rgb_index[fg_slots]], buf[index.rgb_index[bg_slots]], contrast.vision_matrices())
+    worst = np.argsort(r[0])[:CONTRAST_WORST]
+    _contrast_report = {
+        "target": target,
+        "pairs": len(fg_slots),
+        "failing": dict(zip(contrast.VISIONS, (r < target).sum(axis=1).tolist())),
+        "worst": [(index.paths[fg_slots[i]], float(r[0, i])) for i in worst],
+    }
+    return _contrast_report
+
+class ACCESSHELPER_OT_contrast_audit(bpy.types.Operator):
+    bl_idname = "accesshelper.contrast_audit"
+    bl_label = "Auditer le contraste"
+    bl_description = "Mesure le contraste texte/fond du thème actuel (vision normale et simulations)"
+
+    def execute(self, context):
+        theme = context.preferences.themes[0]
+        index = get_theme_index(theme)
+        p = get_props(context)
+        report = audit_theme_contrast(index, index.read(), round(float(p.contrast_target), 2), p.theme_coverage)
+        if report is None:
+            self.report({'WARNING'}, "Aucune paire texte/fond trouvée")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"{report['failing']['NORMAL']} / {report['pairs']} paires sous {report['target']:.1f}:1")
+        request_redraw(REDRAW_PANEL)
+        return {'FINISHED'}
 
 # ------------------------------------------------------------
 # Apply effects (daltonism + brightness)
 # ------------------------------------------------------------
+@instrumented("apply_effects")
 def apply_effects(props):
-    ensure_theme_backup()
-    wm = bpy.context.window_manager
-    if THEME_BACKUP_KEY not in wm:
+    snap = ensure_theme_backup()
+    if snap is None:
         return
+    coverage = props.theme_coverage
+    if snap.absorb_drift(coverage, max_age=DRIFT_CHECK_INTERVAL):
+        snap.persist(bpy.context.window_manager)
 
-    try:
-        base = json.loads(wm[THEME_BACKUP_KEY])
-    except Exception:
-        return
+    mode = props.mode
+    method = props.cvd_method
+    intensity = quantize_state(clamp01(props.mode_intensity))
+    brightness = quantize_state(clamp(props.ui_brightness, -1.0, 1.0))
+    target = round(float(props.contrast_target), 2)
+    fix = target if props.contrast_fix else None
+    if mode == "OFF" or intensity <= 0.0:
+        mode, method, intensity = "OFF", "HILITE", 0.0
+
+    key = (mode, method, intensity, brightness, coverage, fix, snap.digest)
+    buf = theme_state_cache.get(key)
+    if buf is None:
+        lut = None
+        if method != "HILITE":
+            # toute la palette passe par la LUT ; les matrices ne portent plus que la luminosité
+            lut = cvd.mode_lut(mode, intensity, method)
+            mats = build_color_matrices("OFF", 0.0, brightness)
+        else:
+            mats = build_color_matrices(mode, intensity, brightness)
+        buf = snap.transform(mats, lut, coverage)
+        if fix is not None:
+            fix_theme_contrast(snap.index, buf, fix, contrast_visions(mode, method, intensity), coverage)
+        theme_state_cache.put(key, buf)
 
-    prefs = bpy.context.preferences
-    if not prefs.themes:
-        return
+    if props.contrast_check:
+        audit_theme_contrast(snap.index, buf, target, coverage)
 
-    theme = prefs.themes[0]
-    ui = theme.user_interface
+    if snap.write(buf):
+        force_ui_redraw()
 
-    mode = props.mode
-    intensity = clamp01(props.mode_intensity)
-    brightness = clamp(props.ui_brightness, -1.0, 1.0)
-    hilite_rgb = HILITE_COLOR_BY_MODE.get(mode, (1.0, 1.0, 1.0))
+# ------------------------------------------------------------
+# Update scheduler (propriétés sales -> sous-systèmes, une passe par frame)
+# ------------------------------------------------------------
+PROP_DEPENDENCIES = {
+    "mode": {"THEME"},
+    "cvd_method": {"THEME"},
+    "theme_coverage": {"THEME"},
+    "mode_intensity": {"THEME"},
+    "ui_brightness": {"THEME"},
+    "ui_scale": {"UI_SCALE"},
+    "font_preset": {"STYLES"},
+    "ui_font": {"FONT"},
+    "ui_font_path": {"FONT"},
+    "contrast_check": {"THEME"},
+    "contrast_fix": {"THEME"},
+    "contrast_target": {"THEME"},
+}
 
-    for wcol_name, fields_dump in base.get("widgets", {}).items():
-        if not hasattr(ui, wcol_name):
-            continue
-        wcol = getattr(ui, wcol_name)
+_dirty_props = set()
+# > 0 : dans batch_updates(), les propriétés sales attendent la sortie
+_suspend_depth = 0
 
-        for field, base_values in fields_dump.items():
-            if not hasattr(wcol, field):
-                continue
-            v = getattr(wcol, field)
-            if not hasattr(v, "__iter__"):
-                continue
+def apply_theme_state(props):
+    if props.mode == "OFF" and abs(props.ui_brightness) < 1e-6:
+        restore_theme_backup(props.theme_coverage)
+    else:
+        apply_effects(props)
 
-            target = base_values[:]
-
-            # daltonism highlight
-            if mode != "OFF" and intensity > 0.0 and field in {"inner_sel", "item", "outline", "text_sel"}:
-                if mode == "ACHRO":
-                    g = to_gray((target[0], target[1], target[2]))
-                    target[0] = lerp(target[0], g[0], intensity)
-                    target[1] = lerp(target[1], g[1], intensity)
-                    target[2] = lerp(target[2], g[2], intensity)
-                else:
-                    target[0] = lerp(target[0], hilite_rgb[0], intensity)
-                    target[1] = lerp(target[1], hilite_rgb[1], intensity)
-                    target[2] = lerp(target[2], hilite_rgb[2], intensity)
-
-            # brightness
-            if brightness != 0.0 and field in {"inner", "inner_sel", "item", "outline", "text", "text_sel"}:
-                r, g, b = adjust_brightness_rgb((target[0], target[1], target[2]), brightness)
-                target[0], target[1], target[2] = r, g, b
-
-            set_vec(v, target)
-
-    # editor text brightness
-    for editor_name, ed_dump in base.get("editors", {}).items():
-        if not hasattr(theme, editor_name):
-            continue
-        editor = getattr(theme, editor_name)
-        for path, base_values in ed_dump.items():
-            try: a, b = path.split(".")
-            except Exception: continue
-            if hasattr(editor, a):
-                sub = getattr(editor, a)
-                if hasattr(sub, b):
-                    v = getattr(sub, b)
-                    if hasattr(v, "__iter__"):
-                        target = base_values[:]
-                        if brightness != 0.0:
-                            r, g, bb = adjust_brightness_rgb((target[0], target[1], target[2]), brightness)
-                            target[0], target[1], target[2] = r, g, bb
-                        set_vec(v, target)
-
-    # global brightness
-    for attr, base_values in base.get("globals", {}).items():
-        if hasattr(ui, attr):
-            v = getattr(ui, attr)
-            if hasattr(v, "__iter__"):
-                target = base_values[:]
-                if brightness != 0.0:
-                    r, g, bb = adjust_brightness_rgb((target[0], target[1], target[2]), brightness)
-                    target[0], target[1], target[2] = r, g, bb
-                set_vec(v, target)
+@instrumented("flush_updates")
+def flush_updates():
+    systems = set()
+    for name in _dirty_props:
+        systems |= PROP_DEPENDENCIES.get(name, set())
+    _dirty_props.clear()
+
+    if systems:
+        props = get_props(bpy.context)
+        # sans fenêtre, préférences et thème ne sont vus par personne
+        if has_ui():
+            if "UI_SCALE" in systems:
+                apply_ui_scale(props)
+            if "STYLES" in systems:
+                apply_font_preset(props.font_preset)
+            if "FONT" in systems:
+                apply_ui_font(props)
+            if "THEME" in systems:
+                apply_theme_state(props)
+        if "THEME" in systems:
+            refresh_compositor_groups(props)
+
+    flush_redraws()
+    return None
+
+def schedule_update(*prop_names):
+    _dirty_props.update(prop_names)
+    if _suspend_depth:
+        # batch_updates() fera la passe à sa sortie
+        return
+    if bpy.app.background:
+        # sous -b aucun timer ne tourne : passe immédiate, sans systèmes UI (has_ui)
+        flush_updates()
+        return
+    if not bpy.app.timers.is_registered(flush_updates):
+        bpy.app.timers.register(flush_updates, first_interval=0.0)
+
+def cancel_scheduled_updates():
+    _dirty_props.clear()
+    _redraw_pending.clear()
+    if bpy.app.timers.is_registered(flush_updates):
+        bpy.app.timers.unregister(flush_updates)
+
+def _updater(prop_name: str):
+    @instrumented("on_any_update")
+    def update(self, context):
+        schedule_update(prop_name)
+    return update
+
+@instrumented("on_any_update")
+def on_any_update(self, context):
+    schedule_update(*PROP_DEPENDENCIES)
 
-    force_ui_redraw()
+# miroir Python de nav_enabled : évite une lecture RNA par événement
+_nav_active = False
+
+def _on_nav_toggle(self, context):
+    global _nav_active
+    _nav_active = bool(self.nav_enabled)
+
+def _on_perf_toggle(self, context):
+    PERF.enabled = bool(self.perf_enabled)
 
 # ------------------------------------------------------------
-# Update callback
+# Couleurs confondues dans la scène
+#
+# Les couleurs sont collectées une fois (dédoublonnées) et gardées
+# jusqu'à ce qu'un datablock concerné change (depsgraph_update_post) ;
+# chaque analyse est mise en cache par (mode, sévérité, seuil ΔE).
 # ------------------------------------------------------------
-def on_any_update(self, context):
-    props = context.scene.access_helper
+ATTRIBUTE_TOP_COLORS = 32
+CONFUSION_MAX_ROWS = 500
+COLOR_KEY_STEPS = 4096
+
+class SceneColors:
+    """Sources de couleur de la scène ; colors = couleurs uniques (RGB linéaire)."""
+    __slots__ = ("scene_ptr", "entries", "colors", "inverse", "counts")
+
+    def __init__(self, scene_ptr, entries, rgb):
+        self.scene_ptr = scene_ptr
+        # (type, nom du datablock, libellé)
+        self.entries = entries
+        rgb = np.asarray(rgb, dtype=np.float64).reshape(-1, 3)
+        keys = np.round(rgb * COLOR_KEY_STEPS).astype(np.int64)
+        _u, first, inverse, self.counts = np.unique(
+            keys, axis=0, return_index=True, return_inverse=True, return_counts=True)
+        self.inverse = inverse.ravel()
+        self.colors = rgb[first]
+
+    def members(self, color_index):
+        return [self.entries[i] for i in np.nonzero(self.inverse == color_index)[0]]
+
+_scene_colors = None
+_confusion_results = {}
+
+def invalidate_scene_colors():
+    global _scene_colors
+    _scene_colors = None
+    _confusion_results.clear()
+
+def _top_attribute_colors(attr):
+    n = len(attr.data)
+    if n == 0:
+        return []
+    buf = np.empty(n * 4, dtype=np.float32)
+    attr.data.foreach_get("color", buf)
+    q = np.clip(np.round(buf.reshape(-1, 4)[:, :3] * 255.0), 0, 255).astype(np.int64)
+    packed, counts = np.unique((q[:, 0] << 16) | (q[:, 1] << 8) | q[:, 2], return_counts=True)
+    top = packed[np.argsort(counts)[::-1][:ATTRIBUTE_TOP_COLORS]]
+    return (np.stack([top >> 16, (top >> 8) & 255, top & 255], axis=1) / 255.0).tolist()
+
+COLLECT_SLICE = 256
+
+def collect_scene_colors_steps(scene):
+    """Job : collecte par tranches, rend la main toutes les COLLECT_SLICE sources
+
+    Seuls des noms traversent les yields : chaque datablock est relu au
+    moment d'être lu, ceux supprimés entre-temps sont sautés.
+    """
+    entries, rgb = [], []
+
+    def add(kind, id_name, label, color):
+        entries.append((kind, id_name, label))
+        rgb.append(tuple(color)[:3])
+
+    scene_name, scene_ptr = scene.name, scene.as_pointer()
+    obj_names = [obj.name for obj in scene.objects]
+    materials, meshes, lights = {}, {}, {}
+    n_obj = max(1, len(obj_names))
+    for i, name in enumerate(obj_names):
+        if i % COLLECT_SLICE == 0:
+            yield 0.4 * i / n_obj
+        obj = bpy.data.objects.get(name)
+        if obj is None:
+            continue
+        add("OBJECT", obj.name, obj.name, obj.color)
+        for slot in obj.material_slots:
+            if slot.material is not None:
+                materials[slot.material.name] = None
+        if obj.type == "MESH" and obj.data is not None:
+            meshes[obj.data.name] = None
+        elif obj.type == "LIGHT" and obj.data is not None:
+            lights[obj.data.name] = None
+
+    n_mat = max(1, len(materials))
+    for i, name in enumerate(materials):
+        if i % COLLECT_SLICE == 0:
+            yield 0.4 + 0.4 * i / n_mat
+        mat = bpy.data.materials.get(name)
+        if mat is None:
+            continue
+        tree = mat.node_tree if getattr(mat, "use_nodes", True) else None
+        if tree is None:
+            add("MATERIAL", mat.name, mat.name, mat.diffuse_color)
+            continue
+        for node in tree.nodes:
+            if node.type == "RGB":
+                add("MATERIAL", mat.name, f"{mat.name} › {node.name}", node.outputs[0].default_value)
+            for inp in node.inputs:
+                if inp.type == "RGBA" and not inp.is_linked:
+                    add("MATERIAL", mat.name, f"{mat.name} › {node.name}.{inp.name}", inp.default_value)
+
+    yield 0.8
+    scene = bpy.data.scenes.get(scene_name)
+    if scene is None:
+        return SceneColors(scene_ptr, entries, rgb)
+
+    # plus de yield jusqu'à la fin : les références lues ici restent valides
+    for name in lights:
+        light = bpy.data.lights.get(name)
+        if light is not None:
+            add("LIGHT", light.name, light.name, light.color)
+
+    tags = bpy.context.preferences.themes[0].collection_color
+    for coll in scene.collection.children_recursive:
+        if coll.color_tag != "NONE":
+            tag = tags[int(coll.color_tag[-2:]) - 1].color
+            add("COLLECTION", coll.name, coll.name, cvd.srgb_to_linear(np.asarray(tag[:3])).tolist())
+
+    for name in meshes:
+        mesh = bpy.data.meshes.get(name)
+        if mesh is None:
+            continue
+        for attr in mesh.color_attributes:
+            for c in _top_attribute_colors(attr):
+                add("ATTRIBUTE", mesh.name, f"{mesh.name} › {attr.name}", c)
+
+    return SceneColors(scene_ptr, entries, rgb)
+
+@instrumented("collect_scene_colors")
+def collect_scene_colors(scene):
+    return jobs.run_now(collect_scene_colors_steps(scene))
+
+def _touches_scene_colors(update):
+    data = update.id
+    if isinstance(data, (bpy.types.Material, bpy.types.Light, bpy.types.Collection,
+                         bpy.types.Mesh, bpy.types.NodeTree, bpy.types.Scene)):
+        return True
+    # déplacer un objet ne change aucune couleur
+    return isinstance(data, bpy.types.Object) and (update.is_updated_shading or update.is_updated_geometry)
+
+def confusion_groups(colors, mode, severity, threshold):
+    """[(indices, ΔE min)] par taille décroissante ; NumPy pur (tourne sur un thread)"""
+    pairs, labels, d_sim = confusion.confusable(colors, mode, severity, threshold)
+    groups = []
+    if len(pairs):
+        members = np.unique(pairs)
+        pair_labels = labels[pairs[:, 0]]
+        for label in np.unique(labels[members]):
+            idx = members[labels[members] == label]
+            groups.append((idx, float(d_sim[pair_labels == label].min())))
+        groups.sort(key=lambda g: (-len(g[0]), g[1]))
+    return groups
+
+def confusion_steps(scene, mode, intensity, threshold):
+    """Job : (couleurs de la scène, groupes confondus)"""
+    global _scene_colors
+    data = _scene_colors
+    if data is None or data.scene_ptr != scene.as_pointer():
+        _confusion_results.clear()
+        data = _scene_colors = yield from collect_scene_colors_steps(scene)
+    key = (mode, cvd.quantize_severity(intensity), round(float(threshold), 4))
+    groups = _confusion_results.get(key)
+    if groups is None:
+        yield 0.85
+        groups = yield jobs.offload(confusion_groups, data.colors, *key)
+        # la scène a pu changer pendant le calcul : ne cacher que pour les données courantes
+        if _scene_colors is data:
+            _confusion_results[key] = groups
+    return data, groups
+
+@instrumented("confusion_report")
+def confusion_report(scene, mode, intensity, threshold):
+    return jobs.run_now(confusion_steps(scene, mode, intensity, threshold))
+
+class ACCESSHELPER_ConfusionItem(bpy.types.PropertyGroup):
+    group: bpy.props.IntProperty()
+    color_index: bpy.props.IntProperty()
+    label: bpy.props.StringProperty()
+    sources: bpy.props.IntProperty()
+    color: bpy.props.FloatVectorProperty(subtype="COLOR", size=3, min=0.0, max=1.0)
+    simulated: bpy.props.FloatVectorProperty(subtype="COLOR", size=3, min=0.0, max=1.0)
+
+class ACCESSHELPER_UL_confusions(bpy.types.UIList):
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index=0):
+        row = layout.row(align=True)
+        row.label(text=f"{item.group + 1}")
+        row.prop(item, "color", text="")
+        row.prop(item, "simulated", text="")
+        extra = f" (+{item.sources - 1})" if item.sources > 1 else ""
+        row.label(text=f"{item.label}{extra}")
+
+class ACCESSHELPER_OT_confusion_audit(bpy.types.Operator):
+    bl_idname = "accesshelper.confusion_audit"
+    bl_label = "Couleurs confondues"
+    bl_description = "Cherche les couleurs de la scène qui deviennent indiscernables avec le mode daltonisme choisi"
 
-    apply_ui_scale(props)
-    apply_font_preset(props.font_preset)
+    def execute(self, context):
+        p = get_props(context)
+        ui = wm_props(context)
+        if p.mode == "OFF":
+            self.report({'WARNING'}, "Choisir d’abord un mode daltonisme")
+            return {'CANCELLED'}
 
-    if props.mode == "OFF" and abs(props.ui_brightness) < 1e-6:
-        restore_theme_backup()
-    else:
-        apply_effects(props)
+        m = cvd.simulation_matrix(p.mode, cvd.quantize_severity(p.mode_intensity))
+
+        def done(result):
+            data, groups = result
+            sim = np.clip(data.colors @ m.T, 0.0, 1.0)
+            ui = wm_props(bpy.context)
+            items = ui.confusions
+            items.clear()
+            for g, (idx, _d) in enumerate(groups):
+                for ci in idx.tolist():
+                    if len(items) >= CONFUSION_MAX_ROWS:
+                        break
+                    _kind, _name, label = data.members(ci)[0]
+                    it = items.add()
+                    it.group = g
+                    it.color_index = ci
+                    it.label = label
+                    it.sources = int(data.counts[ci])
+                    it.color = np.clip(data.colors[ci], 0.0, 1.0).tolist()
+                    it.simulated = sim[ci].tolist()
+            ui.confusion_index = 0
+            request_redraw(REDRAW_PANEL)
+
+        items = ui.confusions
+        items.clear()
+        start_job("confusion", confusion_steps(context.scene, p.mode, p.mode_intensity, ui.confusion_threshold),
+                  "Couleurs confondues", on_done=done, on_error=_job_failed("Analyse impossible"))
+        return {'FINISHED'}
+
+class ACCESSHELPER_OT_confusion_select(bpy.types.Operator):
+    bl_idname = "accesshelper.confusion_select"
+    bl_label = "Sélectionner le groupe"
+    bl_description = "Sélectionne les objets qui portent les couleurs du groupe actif"
+
+    def execute(self, context):
+        ui = wm_props(context)
+        items = ui.confusions
+        data = _scene_colors
+        if data is None or not (0 <= ui.confusion_index < len(items)):
+            self.report({'WARNING'}, "Relancer l’analyse : la scène a changé")
+            return {'CANCELLED'}
+
+        group = items[ui.confusion_index].group
+        sources = set()
+        for it in items:
+            if it.group == group:
+                sources.update((kind, name) for kind, name, _label in data.members(it.color_index))
+
+        selected = []
+        for obj in context.scene.objects:
+            hit = ("OBJECT", obj.name) in sources
+            hit = hit or any(("MATERIAL", s.material.name) in sources for s in obj.material_slots if s.material)
+            hit = hit or (obj.data is not None and (
+                ("LIGHT", obj.data.name) in sources or ("ATTRIBUTE", obj.data.name) in sources))
+            hit = hit or any(("COLLECTION", c.name) in sources for c in obj.users_collection)
+            obj.select_set(hit)
+            if hit:
+                selected.append(obj)
+        if selected:
+            context.view_layer.objects.active = selected[0]
+        self.report({'INFO'}, f"{len(selected)} objet(s) sélectionné(s)")
+        return {'FINISHED'}
 
 # ------------------------------------------------------------
 # Properties
 # ------------------------------------------------------------
-class ACCESSHELPER_Props(bpy.types.PropertyGroup):
+class AccessHelperSettings:
+    """Réglages surchargeables par scène (clés de PROP_DEPENDENCIES), partagés par mixin"""
     mode: bpy.props.EnumProperty(
         name="Mode Daltonisme",
         items=MODE_ITEMS,
         default="OFF",
-        update=on_any_update
+        update=_updater("mode")
+    )
+    cvd_method: bpy.props.EnumProperty(
+        name="Méthode",
+        items=CVD_METHOD_ITEMS,
+        default="HILITE",
+        update=_updater("cvd_method")
+    )
+    theme_coverage: bpy.props.EnumProperty(
+        name="Couverture",
+        items=THEME_COVERAGE_ITEMS,
+        default="CORE",
+        update=_updater("theme_coverage")
     )
     mode_intensity: bpy.props.FloatProperty(
         name="Intensité",
         min=0.0, max=1.0,
         default=0.85,
         subtype="FACTOR",
-        update=on_any_update
+        update=_updater("mode_intensity")
     )
     ui_brightness: bpy.props.FloatProperty(
         name="Luminosité UI",
         min=-1.0, max=1.0,
         default=0.0,
         subtype="FACTOR",
-        update=on_any_update
+        update=_updater("ui_brightness")
     )
     ui_scale: bpy.props.FloatProperty(
         name="UI Scale",
         min=0.0, max=2.0,
         default=1.0,
-        update=on_any_update
+        update=_updater("ui_scale")
     )
 
     font_preset: bpy.props.EnumProperty(
         name="Taille texte",
         items=FONT_PRESETS,
         default="DEFAULT",
-        update=lambda s, c: apply_font_preset(c.scene.access_helper.font_preset)
+        update=_updater("font_preset")
+    )
+    ui_font: bpy.props.EnumProperty(
+        name="Police",
+        items=UI_FONT_ITEMS,
+        default="BLENDER",
+        update=_updater("ui_font")
+    )
+    ui_font_path: bpy.props.StringProperty(
+        name="Fichier police",
+        subtype="FILE_PATH",
+        default="",
+        update=_updater("ui_font_path")
     )
 
-    nav_enabled: bpy.props.BoolProperty(name="Nav", default=False)
+    contrast_check: bpy.props.BoolProperty(
+        name="Vérifier le contraste",
+        description="Mesure le contraste texte/fond à chaque application du thème",
+        default=True,
+        update=_updater("contrast_check")
+    )
+    contrast_fix: bpy.props.BoolProperty(
+        name="Corriger le contraste",
+        description="Éclaircit ou assombrit les textes juste assez pour atteindre le ratio cible",
+        default=False,
+        update=_updater("contrast_fix")
+    )
+    contrast_target: bpy.props.FloatProperty(
+        name="Ratio cible",
+        description="WCAG : 3.0 gros texte, 4.5 AA, 7.0 AAA",
+        min=1.0, max=21.0,
+        soft_min=3.0, soft_max=7.0,
+        default=contrast.AA,
+        update=_updater("contrast_target")
+    )
+
+def _on_scene_override_toggle(self, context):
+    if self.use_scene_override and not self.override_seeded:
+        # première activation : la scène part des réglages courants, l'UI ne saute pas
+        wm = wm_props(context)
+        with batch_updates():
+            for name in PROP_DEPENDENCIES:
+                setattr(self, name, getattr(wm, name))
+        self.override_seeded = True
+    on_any_update(self, context)
+
+class ACCESSHELPER_SceneProps(AccessHelperSettings, bpy.types.PropertyGroup):
+    """Surcharge par scène : seuls les réglages, enregistrés dans le .blend"""
+    use_scene_override: bpy.props.BoolProperty(
+        name="Réglages propres à la scène",
+        description="Cette scène garde ses propres réglages (enregistrés dans le .blend et soumis à l’undo)",
+        default=False,
+        update=_on_scene_override_toggle
+    )
+    override_seeded: bpy.props.BoolProperty(default=False, options={'HIDDEN'})
+
+class ACCESSHELPER_Props(AccessHelperSettings, bpy.types.PropertyGroup):
+    nav_enabled: bpy.props.BoolProperty(name="Nav", default=False, update=_on_nav_toggle)
     nav_index: bpy.props.IntProperty(name="Nav Index", default=0, min=0, max=len(NAV_ITEMS)-1)
     nav_step: bpy.props.FloatProperty(name="Step", default=0.05, min=0.01, max=0.50, subtype="FACTOR")
 
+    image_name: bpy.props.StringProperty(name="Image", default="")
+
+    confusions: bpy.props.CollectionProperty(type=ACCESSHELPER_ConfusionItem)
+    confusion_index: bpy.props.IntProperty(default=0)
+    confusion_threshold: bpy.props.FloatProperty(
+        name="Seuil ΔE",
+        description="Distance OKLab sous laquelle deux couleurs simulées sont jugées confondues",
+        min=0.005, max=0.2,
+        default=confusion.DEFAULT_THRESHOLD,
+        precision=3
+    )
+
+    show_debug: bpy.props.BoolProperty(name="Debug", default=False)
+    perf_enabled: bpy.props.BoolProperty(
+        name="Instrumentation",
+        description="Mesure les temps et écritures RNA des chemins chauds",
+        default=False,
+        update=_on_perf_toggle
+    )
+
+# ------------------------------------------------------------
+# Accès aux réglages
+#
+# L'état vit sur le WindowManager : hors undo, un drag de curseur ne
+# pousse aucun pas d'annulation. Une scène peut le surcharger
+# (use_scene_override) ; seuls ses réglages suivent alors l'undo.
+# ------------------------------------------------------------
+def wm_props(context):
+    return context.window_manager.access_helper
+
+def scene_override(context):
+    scene = getattr(context, "scene", None)
+    sp = getattr(scene, "access_helper", None) if scene is not None else None
+    if sp is not None and sp.use_scene_override:
+        return sp
+    return None
+
+def get_props(context):
+    """Réglages effectifs : surcharge de la scène active, sinon WindowManager"""
+    return scene_override(context) or wm_props(context)
+
+_active_scene_ptr = 0
+
+@bpy.app.handlers.persistent
+def _on_undo_redo(_scene, *_args):
+    # l'undo ne touche ni aux préférences ni au WindowManager : seule une
+    # surcharge de scène peut avoir changé
+    if scene_override(bpy.context) is not None:
+        schedule_update(*PROP_DEPENDENCIES)
+    else:
+        schedule_update("mode")
+
+@bpy.app.handlers.persistent
+def _on_depsgraph_update(scene, depsgraph):
+    # changement de scène active : ses réglages (ou ceux du WM) reprennent la main
+    global _active_scene_ptr
+    ptr = scene.as_pointer()
+    if ptr != _active_scene_ptr:
+        first = _active_scene_ptr == 0
+        _active_scene_ptr = ptr
+        if not first:
+            schedule_update(*PROP_DEPENDENCIES)
+
+    if _scene_colors is not None and any(_touches_scene_colors(u) for u in depsgraph.updates):
+        invalidate_scene_colors()
+
+STATE_HANDLERS = (
+    ("undo_post", _on_undo_redo),
+    ("redo_post", _on_undo_redo),
+    ("depsgraph_update_post", _on_depsgraph_update),
+)
+
 # ------------------------------------------------------------
 # Help popup
 # ------------------------------------------------------------
@@ -548,130 +1771,1246 @@ class ACCESSHELPER_OT_toggle_nav(bpy.types.Operator):
     bl_label = "Toggle Keyboard Nav"
 
     def execute(self, context):
-        props = context.scene.access_helper
+        props = wm_props(context)
         props.nav_enabled = not props.nav_enabled
         if props.nav_enabled:
             bpy.ops.accesshelper.keyboard_nav('INVOKE_DEFAULT')
         else:
             set_status(context, None)
-            force_ui_redraw()
+            request_redraw(REDRAW_PANEL)
         return {'FINISHED'}
 
+# Seuls événements que le modal traite ; tout le reste repart aussitôt
+NAV_EVENT_TYPES = frozenset({
+    'UP_ARROW', 'DOWN_ARROW', 'LEFT_ARROW', 'RIGHT_ARROW', 'RET', 'NUMPAD_ENTER', 'Q', 'ESC',
+})
+NAV_MODE_ORDER = [x[0] for x in MODE_ITEMS]
+NAV_FONT_ORDER = [x[0] for x in FONT_PRESETS]
+NAV_UI_FONT_ORDER = [x[0] for x in UI_FONT_ITEMS]
+
 class ACCESSHELPER_OT_keyboard_nav(bpy.types.Operator):
     bl_idname = "accesshelper.keyboard_nav"
     bl_label = "AccessHelper Keyboard Navigation"
     bl_options = {'REGISTER'}
 
-    _timer = None
+    _status_key = None
 
-    def _status_text(self, context):
-        p = context.scene.access_helper
-        item = NAV_ITEMS[p.nav_index]
-        label = NAV_LABELS.get(item, item)
+    def _status_value(self, p, item):
         if item == "MODE":
-            val = p.mode
-        elif item == "MODE_INTENSITY":
-            val = f"{p.mode_intensity:.2f}"
-        elif item == "BRIGHTNESS":
-            val = f"{p.ui_brightness:+.2f}"
-        elif item == "UI_SCALE":
-            val = f"{p.ui_scale:.2f}"
-        elif item == "FONT_PRESET":
-            val = p.font_preset
-        else:
-            val = ""
-        return f"▶ {label}: {val} | ↑↓ / ←→ | Q"
+            return p.mode
+        if item == "MODE_INTENSITY":
+            return f"{p.mode_intensity:.2f}"
+        if item == "BRIGHTNESS":
+            return f"{p.ui_brightness:+.2f}"
+        if item == "UI_SCALE":
+            return f"{p.ui_scale:.2f}"
+        if item == "FONT_PRESET":
+            return p.font_preset
+        if item == "UI_FONT":
+            return p.ui_font
+        return ""
+
+    def _refresh_status(self, context):
+        # ne reconstruit le texte (et ne redessine le panneau) que si index ou valeur ont changé
+        ui = wm_props(context)
+        item = NAV_ITEMS[ui.nav_index]
+        key = (ui.nav_index, self._status_value(get_props(context), item))
+        if key == self._status_key:
+            return
+        self._status_key = key
+        label = NAV_LABELS.get(item, item)
+        set_status(context, f"▶ {label}: {key[1]} | ↑↓ / ←→ | Q")
+        request_redraw(REDRAW_PANEL)
 
-    def modal(self, context, event):
-        p = context.scene.access_helper
+    def _finish(self, context):
+        self._status_key = None
+        set_status(context, None)
+        request_redraw(REDRAW_PANEL)
+        return {'CANCELLED'}
 
-        if not p.nav_enabled:
-            if self._timer:
-                context.window_manager.event_timer_remove(self._timer)
-            set_status(context, None)
-            return {'CANCELLED'}
+    def modal(self, context, event):
+        if not _nav_active:
+            return self._finish(context)
+        if event.value != 'PRESS' or event.type not in NAV_EVENT_TYPES:
+            return {'PASS_THROUGH'}
+        return self._handle_key(context, event.type)
 
-        if event.type in {'Q', 'ESC'} and event.value == 'PRESS':
-            p.nav_enabled = False
-            if self._timer:
-                context.window_manager.event_timer_remove(self._timer)
-            set_status(context, None)
-            force_ui_redraw()
-            return {'CANCELLED'}
+    @instrumented("nav_modal")
+    def _handle_key(self, context, key):
+        ui = wm_props(context)
 
-        if event.value != 'PRESS':
-            return {'PASS_THROUGH'}
+        if key in {'Q', 'ESC'}:
+            ui.nav_enabled = False
+            return self._finish(context)
 
-        if event.type == 'UP_ARROW':
-            p.nav_index = (p.nav_index - 1) % len(NAV_ITEMS)
-            set_status(context, self._status_text(context))
-            force_ui_redraw()
+        if key == 'UP_ARROW':
+            ui.nav_index = (ui.nav_index - 1) % len(NAV_ITEMS)
+            self._refresh_status(context)
             return {'RUNNING_MODAL'}
 
-        if event.type == 'DOWN_ARROW':
-            p.nav_index = (p.nav_index + 1) % len(NAV_ITEMS)
-            set_status(context, self._status_text(context))
-            force_ui_redraw()
+        if key == 'DOWN_ARROW':
+            ui.nav_index = (ui.nav_index + 1) % len(NAV_ITEMS)
+            self._refresh_status(context)
             return {'RUNNING_MODAL'}
 
-        item = NAV_ITEMS[p.nav_index]
+        item = NAV_ITEMS[ui.nav_index]
+        p = get_props(context)
 
-        if event.type in {'LEFT_ARROW', 'RIGHT_ARROW'}:
-            sgn = -1 if event.type == 'LEFT_ARROW' else 1
+        if key in {'LEFT_ARROW', 'RIGHT_ARROW'}:
+            sgn = -1 if key == 'LEFT_ARROW' else 1
 
             if item == "MODE":
-                order = ["OFF", "PROT", "PROTA", "DEUT", "DEUTA", "TRIT", "TRITA", "ACHRO"]
-                idx = order.index(p.mode) if p.mode in order else 0
-                p.mode = order[(idx + sgn) % len(order)]
-                on_any_update(p, context)
+                idx = NAV_MODE_ORDER.index(p.mode) if p.mode in NAV_MODE_ORDER else 0
+                p.mode = NAV_MODE_ORDER[(idx + sgn) % len(NAV_MODE_ORDER)]
+                schedule_update("mode")
 
             elif item == "MODE_INTENSITY":
                 if p.mode == "OFF":
                     p.mode = "DEUT"
-                p.mode_intensity = clamp01(p.mode_intensity + p.nav_step * sgn)
-                on_any_update(p, context)
+                p.mode_intensity = clamp01(p.mode_intensity + ui.nav_step * sgn)
+                schedule_update("mode", "mode_intensity")
 
             elif item == "BRIGHTNESS":
-                step = max(0.02, min(0.10, p.nav_step))
+                step = max(0.02, min(0.10, ui.nav_step))
                 p.ui_brightness = clamp(p.ui_brightness + step * sgn, -1.0, 1.0)
-                on_any_update(p, context)
+                schedule_update("ui_brightness")
 
             elif item == "UI_SCALE":
                 p.ui_scale = clamp(p.ui_scale + 0.05 * sgn, 0.0, 2.0)
-                apply_ui_scale(p)
+                schedule_update("ui_scale")
 
             elif item == "FONT_PRESET":
-                ids = [x[0] for x in FONT_PRESETS]
-                idx = ids.index(p.font_preset) if p.font_preset in ids else 0
-                p.font_preset = ids[(idx + sgn) % len(ids)]
-                apply_font_preset(p.font_preset)
+                idx = NAV_FONT_ORDER.index(p.font_preset) if p.font_preset in NAV_FONT_ORDER else 0
+                p.font_preset = NAV_FONT_ORDER[(idx + sgn) % len(NAV_FONT_ORDER)]
+                schedule_update("font_preset")
+
+            elif item == "UI_FONT":
+                idx = NAV_UI_FONT_ORDER.index(p.ui_font) if p.ui_font in NAV_UI_FONT_ORDER else 0
+                p.ui_font = NAV_UI_FONT_ORDER[(idx + sgn) % len(NAV_UI_FONT_ORDER)]
+                schedule_update("ui_font")
 
             elif item == "HELP_POPUP":
                 bpy.ops.accesshelper.help_popup('INVOKE_DEFAULT')
 
-            set_status(context, self._status_text(context))
-            force_ui_redraw()
+            self._refresh_status(context)
             return {'RUNNING_MODAL'}
 
-        if event.type in {'RET', 'NUMPAD_ENTER'} and event.value == 'PRESS':
-            if item == "HELP_POPUP":
-                bpy.ops.accesshelper.help_popup('INVOKE_DEFAULT')
-                set_status(context, self._status_text(context))
-                force_ui_redraw()
-                return {'RUNNING_MODAL'}
+        if key in {'RET', 'NUMPAD_ENTER'} and item == "HELP_POPUP":
+            bpy.ops.accesshelper.help_popup('INVOKE_DEFAULT')
+            return {'RUNNING_MODAL'}
 
         return {'PASS_THROUGH'}
 
     def execute(self, context):
-        p = context.scene.access_helper
-        p.nav_enabled = True
-        wm = context.window_manager
-        self._timer = wm.event_timer_add(0.1, window=context.window)
-        wm.modal_handler_add(self)
-        set_status(context, self._status_text(context))
-        force_ui_redraw()
+        # purement événementiel : pas de timer, le modal ne tourne que sur les événements reçus
+        wm_props(context).nav_enabled = True
+        context.window_manager.modal_handler_add(self)
+        self._status_key = None
+        self._refresh_status(context)
+        return {'RUNNING_MODAL'}
+
+# ------------------------------------------------------------
+# Images (aperçu simulé / copie daltonisée)
+#
+# Les pixels passent par foreach_get/foreach_set dans un seul buffer
+# float32, transformé en place par tuiles (cvd.transform_pixels). L'image
+# produite garde la clé (hash des pixels + mode) de sa source : un
+# nouvel aperçu identique ne recalcule rien.
+# ------------------------------------------------------------
+IMAGE_KEY_PROP = "accesshelper_cvd_key"
+# sources dont le contenu est celui d'un fichier sur disque
+FILE_SOURCES = {"FILE", "SEQUENCE", "MOVIE"}
+IMAGE_OUTPUT_ITEMS = [
+    ("SIMULATE", "Aperçu simulé", "Montre l’image telle que perçue avec la déficience"),
+    ("DALTONIZE", "Copie daltonisée", "Copie corrigée pour rester lisible avec la déficience"),
+]
+IMAGE_SUFFIX = {"SIMULATE": "sim", "DALTONIZE": "dalt"}
+
+_image_hashes = {}
+
+def image_memo_key(img):
+    """(clé, signature) du hash mémorisé de img ; signature None : à rehacher.
+
+    Image issue d'un fichier : clé = chemin, la date de modification fait
+    partie de la signature (un rechargement avec un autre contenu rehache).
+    """
+    sig = (tuple(img.size), img.channels, img.is_float, img.source, img.colorspace_settings.name)
+    if img.is_dirty:
+        return img.name_full, None
+    if img.source in FILE_SOURCES and img.packed_file is None:
+        path = bpy.path.abspath(img.filepath_raw)
+        try:
+            return path, sig + (os.path.getmtime(path),)
+        except OSError:
+            return path, None
+    return img.name_full, sig
+
+def read_pixels(img):
+    w, h = img.size
+    px = np.empty(w * h * img.channels, dtype=np.float32)
+    img.pixels.foreach_get(px)
+    return px
+
+def pixel_hash(px):
+    # tout le buffer déjà lu : un échantillon manquerait des canaux et des retouches
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.int64(px.size).tobytes())
+    h.update(px.tobytes())
+    return h.hexdigest()
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def _render_result_copy(img, context):
+    """(copie chargée, chemin de l'EXR temporaire à supprimer après usage)"""
+    # le Render Result n'expose pas ses pixels : passage par un EXR temporaire
+    path = os.path.join(tempfile.gettempdir(), f"accesshelper_{img.name}.exr")
+    settings = context.scene.render.image_settings
+    prev = (settings.file_format, settings.color_depth)
+    try:
+        settings.file_format = "OPEN_EXR"
+        settings.color_depth = "32"
+        img.save_render(path, scene=context.scene)
+    finally:
+        settings.file_format, settings.color_depth = prev
+    try:
+        return bpy.data.images.load(path, check_existing=False), path
+    except RuntimeError:
+        _remove_file(path)
+        raise
+
+def _output_image(name, w, h, is_float, colorspace):
+    out = bpy.data.images.get(name)
+    if out is not None and (out.is_float != is_float or out.channels != 4):
+        bpy.data.images.remove(out)
+        out = None
+    if out is None:
+        out = bpy.data.images.new(name, w, h, alpha=True, float_buffer=is_float)
+    elif tuple(out.size) != (w, h):
+        out.scale(w, h)
+    if not is_float:
+        out.colorspace_settings.name = colorspace
+    return out
+
+def _show_image(img):
+    # appelé aussi depuis un timer (sans écran dans le contexte) : toutes les fenêtres
+    for win in bpy.context.window_manager.windows:
+        for area in win.screen.areas:
+            if area.type == "IMAGE_EDITOR":
+                area.spaces.active.image = img
+                area.tag_redraw()
+                return
+
+def _to_rgba(px, channels):
+    rgba = np.ones((px.size // channels, 4), dtype=np.float32)
+    rgba[:, :channels] = px.reshape(-1, channels)
+    return rgba.ravel()
+
+def cvd_image_steps(src, method, mode, intensity):
+    """Job (jobs.py) : renvoie (image produite, servie depuis le cache)"""
+    # la sortie porte le nom de la source, pas celui de la copie temporaire
+    name = f"{src.name}.{IMAGE_SUFFIX[method]}"
+    tmp = tmp_path = None
+    if src.type == "RENDER_RESULT":
+        tmp, tmp_path = _render_result_copy(src, bpy.context)
+        src = tmp
+    try:
+        if src.channels < 3 or src.size[0] == 0:
+            raise ValueError("image vide ou sans canaux RGB")
+        severity = cvd.quantize_severity(intensity)
+        # la source peut disparaître pendant le calcul : on garde ce qu'il faut
+        w, h = src.size
+        channels, is_float = src.channels, src.is_float
+        colorspace = src.colorspace_settings.name
+
+        # image inchangée depuis le dernier hash : ni relue ni rehachée
+        memo_key, sig = image_memo_key(src)
+        memo = _image_hashes.get(memo_key)
+        px = None
+        if sig is not None and memo is not None and memo[0] == sig:
+            digest = memo[1]
+        else:
+            px = read_pixels(src)
+            digest = yield jobs.offload(pixel_hash, px)
+            if sig is not None:
+                _image_hashes[memo_key] = (sig, digest)
+        key = f"{digest}:{mode}:{severity:g}:{method}"
+
+        out = bpy.data.images.get(name)
+        if out is not None and out.get(IMAGE_KEY_PROP) == key and tuple(out.size) == (w, h):
+            PERF.count("image_cache_hits")
+            return out, True
+
+        if px is None:
+            px = read_pixels(src)
+        yield 0.3
+        # image 8 bits : valeurs encodées (LUT sRGB) ; float : linéaire scène
+        yield jobs.offload(cvd.transform_pixels, px, channels, mode, severity, method, encoded=not is_float)
+        if channels != 4:
+            px = yield jobs.offload(_to_rgba, px, channels)
+        yield 0.8
+
+        out = _output_image(name, w, h, is_float, colorspace)
+        out.pixels.foreach_set(px)
+        out[IMAGE_KEY_PROP] = key
+        out.update()
+        PERF.count("image_pixels", w * h)
+        return out, False
+    finally:
+        if tmp is not None:
+            bpy.data.images.remove(tmp)
+        if tmp_path is not None:
+            _image_hashes.pop(bpy.path.abspath(tmp_path), None)
+            _remove_file(tmp_path)
+
+@instrumented("cvd_image")
+def cvd_image(src, method, mode, intensity):
+    """Version synchrone : (image produite, servie depuis le cache)"""
+    return jobs.run_now(cvd_image_steps(src, method, mode, intensity))
+
+class ACCESSHELPER_OT_cvd_image(bpy.types.Operator):
+    bl_idname = "accesshelper.cvd_image"
+    bl_label = "Daltonisme sur image"
+    bl_description = "Applique le mode daltonisme courant à une image (aperçu simulé ou copie daltonisée)"
+    bl_options = {'REGISTER'}
+
+    image_name: bpy.props.StringProperty(name="Image", default="")
+    output: bpy.props.EnumProperty(name="Sortie", items=IMAGE_OUTPUT_ITEMS, default="SIMULATE")
+
+    def _source(self, context):
+        if self.image_name:
+            return bpy.data.images.get(self.image_name)
+        img = getattr(context, "edit_image", None)
+        if img is None:
+            img = bpy.data.images.get(wm_props(context).image_name)
+        return img
+
+    def execute(self, context):
+        p = get_props(context)
+        src = self._source(context)
+        if src is None:
+            self.report({'ERROR'}, "Aucune image sélectionnée")
+            return {'CANCELLED'}
+        if p.mode == "OFF":
+            self.report({'WARNING'}, "Choisir d’abord un mode daltonisme")
+            return {'CANCELLED'}
+
+        def done(result):
+            _show_image(result[0])
+
+        start_job(f"image:{src.name}", cvd_image_steps(src, self.output, p.mode, p.mode_intensity),
+                  f"Image {src.name}", on_done=done, on_error=_job_failed("Image non traitée"))
+        return {'FINISHED'}
+
+def draw_image_menu(self, context):
+    layout = self.layout
+    layout.separator()
+    layout.operator("accesshelper.cvd_image", text="Aperçu daltonisme").output = "SIMULATE"
+    layout.operator("accesshelper.cvd_image", text="Copie daltonisée").output = "DALTONIZE"
+
+# ------------------------------------------------------------
+# Groupe compositor (simulation au rendu)
+#
+# La matrice 3x3 du mode devient des nœuds natifs : Separate Color, trois
+# Math (MULTIPLY puis 2 x MULTIPLY_ADD) par canal, Combine Color. Tout le
+# coût par pixel reste dans le compositor. Un groupe par (mode, méthode),
+# réutilisé ; seuls les 9 coefficients sont réécrits, et seulement quand
+# la sévérité quantifiée change.
+# ------------------------------------------------------------
+COMPOSITOR_GROUP_PREFIX = "AccessHelper CVD"
+COMPOSITOR_SEVERITY_PROP = "accesshelper_cvd_severity"
+COMPOSITOR_NODE_PROP = "accesshelper_cvd_node"
+# écart de sévérité sous lequel le groupe n'est pas touché
+COMPOSITOR_SEVERITY_EPS = cvd.SEVERITY_STEP * 0.5
+
+def _node_type(*candidates):
+    # 5.0 : Math partagé avec les shaders ; avant : nœud propre au compositor
+    for name in candidates:
+        if hasattr(bpy.types, name):
+            return name
+    return candidates[-1]
+
+def compositor_group_name(mode, method):
+    return f"{COMPOSITOR_GROUP_PREFIX} {mode} {IMAGE_SUFFIX[method]}"
+
+def _coef_node(group, i, j):
+    return group.nodes.get(f"m{i}{j}")
+
+def _write_coefs(group, m):
+    for i in range(3):
+        for j in range(3):
+            node = _coef_node(group, i, j)
+            # MULTIPLY : (canal, coef) ; MULTIPLY_ADD : (canal, coef, somme)
+            node.inputs[1].default_value = float(m[i, j])
+
+def _build_compositor_group(group):
+    group.nodes.clear()
+    group.interface.clear()
+    group.interface.new_socket("Image", in_out="INPUT", socket_type="NodeSocketColor")
+    group.interface.new_socket("Image", in_out="OUTPUT", socket_type="NodeSocketColor")
+    nodes, links = group.nodes, group.links
+
+    gin = nodes.new("NodeGroupInput")
+    gin.location = (-600, 0)
+    gout = nodes.new("NodeGroupOutput")
+    gout.location = (600, 0)
+    sep = nodes.new(_node_type("CompositorNodeSeparateColor"))
+    sep.location = (-400, 0)
+    comb = nodes.new(_node_type("CompositorNodeCombineColor"))
+    comb.location = (400, 0)
+    links.new(gin.outputs[0], sep.inputs[0])
+    links.new(sep.outputs[3], comb.inputs[3])
+    links.new(comb.outputs[0], gout.inputs[0])
+
+    math_type = _node_type("ShaderNodeMath", "CompositorNodeMath")
+    for i in range(3):
+        prev = None
+        for j in range(3):
+            node = nodes.new(math_type)
+            node.name = node.label = f"m{i}{j}"
+            node.operation = "MULTIPLY" if prev is None else "MULTIPLY_ADD"
+            node.location = (-200 + 180 * j, 250 - 250 * i)
+            links.new(sep.outputs[j], node.inputs[0])
+            if prev is not None:
+                links.new(prev.outputs[0], node.inputs[2])
+            prev = node
+        links.new(prev.outputs[0], comb.inputs[i])
+
+def _group_intact(group):
+    return all(_coef_node(group, i, j) is not None for i in range(3) for j in range(3))
+
+def compositor_group(mode, method, intensity):
+    """Groupe du mode (créé au besoin) ; retourne (groupe, coefficients réécrits)"""
+    severity = cvd.quantize_severity(intensity)
+    name = compositor_group_name(mode, method)
+    group = bpy.data.node_groups.get(name)
+    if group is None:
+        group = bpy.data.node_groups.new(name, "CompositorNodeTree")
+    elif group.bl_idname != "CompositorNodeTree":
+        raise ValueError(f"« {name} » existe déjà et n’est pas un groupe compositor")
+    if not _group_intact(group):
+        _build_compositor_group(group)
+        group.pop(COMPOSITOR_SEVERITY_PROP, None)
+
+    stored = group.get(COMPOSITOR_SEVERITY_PROP)
+    if stored is not None and abs(stored - severity) < COMPOSITOR_SEVERITY_EPS:
+        PERF.count("compositor_cache_hits")
+        return group, False
+    _write_coefs(group, cvd.cvd_matrix(mode, severity, method))
+    group[COMPOSITOR_SEVERITY_PROP] = severity
+    return group, True
+
+def refresh_compositor_groups(props):
+    """Suit mode_intensity : seuls les groupes déjà générés pour le mode courant"""
+    if props.mode == "OFF":
+        return
+    for method in IMAGE_SUFFIX:
+        if bpy.data.node_groups.get(compositor_group_name(props.mode, method)) is not None:
+            compositor_group(props.mode, method, props.mode_intensity)
+
+def _scene_compositor_tree(scene):
+    tree = getattr(scene, "compositing_node_group", None)
+    if tree is None:
+        tree = bpy.data.node_groups.new(f"{scene.name} Compositor", "CompositorNodeTree")
+        tree.interface.new_socket("Image", in_out="OUTPUT", socket_type="NodeSocketColor")
+        tree.nodes.new("CompositorNodeRLayers").location = (-300, 0)
+        out = tree.nodes.new("NodeGroupOutput")
+        out.location = (300, 0)
+        tree.links.new(tree.nodes[0].outputs[0], out.inputs[0])
+        scene.compositing_node_group = tree
+    return tree
+
+def insert_compositor_group(scene, group):
+    """Place le groupe devant la sortie du compositor de la scène (une seule fois)"""
+    tree = _scene_compositor_tree(scene)
+    for node in tree.nodes:
+        if node.get(COMPOSITOR_NODE_PROP):
+            node.node_tree = group
+            return node
+    out = next((n for n in tree.nodes if n.bl_idname == "NodeGroupOutput" and n.is_active_output), None)
+    if out is None or not out.inputs or not out.inputs[0].is_linked:
+        raise ValueError("sortie du compositor introuvable ou non connectée")
+    link = out.inputs[0].links[0]
+    src = link.from_socket
+    node = tree.nodes.new("CompositorNodeGroup")
+    node.node_tree = group
+    node[COMPOSITOR_NODE_PROP] = True
+    node.location = (out.location.x - 250, out.location.y)
+    tree.links.remove(link)
+    tree.links.new(src, node.inputs[0])
+    tree.links.new(node.outputs[0], out.inputs[0])
+    return node
+
+class ACCESSHELPER_OT_cvd_compositor(bpy.types.Operator):
+    bl_idname = "accesshelper.cvd_compositor"
+    bl_label = "Daltonisme au rendu"
+    bl_description = "Génère (ou met à jour) un groupe compositor natif pour le mode daltonisme courant"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    output: bpy.props.EnumProperty(name="Sortie", items=IMAGE_OUTPUT_ITEMS, default="SIMULATE")
+    insert: bpy.props.BoolProperty(name="Brancher dans le compositor", default=True)
+
+    def execute(self, context):
+        p = get_props(context)
+        if p.mode == "OFF":
+            self.report({'WARNING'}, "Choisir d’abord un mode daltonisme")
+            return {'CANCELLED'}
+        try:
+            group, written = compositor_group(p.mode, self.output, p.mode_intensity)
+            if self.insert:
+                insert_compositor_group(context.scene, group)
+        except ValueError as e:
+            self.report({'ERROR'}, f"Compositor : {e}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, group.name + ("" if written else " (inchangé)"))
+        return {'FINISHED'}
+
+# ------------------------------------------------------------
+# Export LUT 3D / looks OCIO (voir lut_export.py)
+# ------------------------------------------------------------
+LUT_FORMAT_ITEMS = [
+    ("CUBE", "Cube (.cube)", "LUT 3D Resolve/Adobe, lue par OCIO"),
+    ("SPI3D", "SPI (.spi3d)", "LUT 3D Sony Imageworks, lue par OCIO"),
+]
+LUT_SIZE_ITEMS = [(str(n), f"{n}³", f"Grille de {n} points par axe") for n in lut_export.LUT_SIZES]
+
+_lut_export_report = None
+
+def lut_export_steps(directory, modes, intensity, method, size, fmt):
+    """Job : une LUT par mode (sur un thread), puis le snippet OCIO"""
+    written = 0
+    for i, mode in enumerate(modes):
+        yield i / len(modes)
+        _path, changed = yield jobs.offload(lut_export.export_lut, directory, mode, intensity, method, size, fmt)
+        written += changed
+    return lut_export.write_snippet(directory, modes, method, fmt), written
+
+class ACCESSHELPER_OT_lut_export(bpy.types.Operator):
+    bl_idname = "accesshelper.lut_export"
+    bl_label = "Exporter LUT / looks OCIO"
+    bl_description = ("Exporte les modes daltonisme en LUT 3D et en looks OCIO, "
+                      "pour un aperçu natif dans le viewport et l’éditeur d’images")
+
+    directory: bpy.props.StringProperty(subtype="DIR_PATH")
+    output: bpy.props.EnumProperty(name="Sortie", items=IMAGE_OUTPUT_ITEMS, default="SIMULATE")
+    lut_format: bpy.props.EnumProperty(name="Format", items=LUT_FORMAT_ITEMS, default="CUBE")
+    lut_size: bpy.props.EnumProperty(name="Taille", items=LUT_SIZE_ITEMS, default=str(cvd.LUT_SIZE))
+    all_modes: bpy.props.BoolProperty(name="Tous les modes", default=True)
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        p = get_props(context)
+        modes = list(cvd.DEFICIENCY_BY_MODE) if self.all_modes else [p.mode]
+        if modes == ["OFF"]:
+            self.report({'WARNING'}, "Choisir un mode daltonisme ou cocher « Tous les modes »")
+            return {'CANCELLED'}
+        directory = bpy.path.abspath(self.directory)
+        if not directory:
+            self.report({'ERROR'}, "Aucun dossier choisi")
+            return {'CANCELLED'}
+
+        def done(result):
+            global _lut_export_report
+            snippet, written = result
+            _lut_export_report = f"{written} LUT écrite(s), looks OCIO : {snippet}"
+            request_redraw(REDRAW_PANEL)
+
+        steps = lut_export_steps(directory, modes, p.mode_intensity, self.output,
+                                 int(self.lut_size), self.lut_format)
+        start_job("lut_export", steps, "Export LUT", on_done=done, on_error=_job_failed("Export impossible"))
+        return {'FINISHED'}
+
+# ------------------------------------------------------------
+# Daltonisation de la scène (variantes d'assets)
+#
+# Même principe que le backup du thème : les valeurs d'origine sont
+# sauvées une fois (IDProperty sur chaque datablock, donc dans le .blend)
+# et chaque application repart d'elles ; restaurer les réécrit puis
+# efface la sauvegarde. Les couleurs des matériaux sont dédoublonnées
+# avant la transformation ; les attributs couleur passent par un seul
+# foreach_get/foreach_set, transformés par tuiles sur un thread.
+# ------------------------------------------------------------
+SCENE_BACKUP_KEY = "accesshelper_scene_backup_v1"
+SCENE_CHANGE_EPS = 1.0 / 255.0
+# éléments d'attribut transformés par étape du job
+ATTRIBUTE_CHUNK = 1 << 18
+
+_scene_dalton_report = None
+
+def _material_sockets(mat):
+    """[(chemin, socket)] des couleurs modifiables ; socket None = diffuse_color"""
+    tree = mat.node_tree if getattr(mat, "use_nodes", True) else None
+    if tree is None:
+        return [("diffuse_color", None)]
+    out = []
+    for node in tree.nodes:
+        if node.type == "RGB":
+            out.append((f"{node.name}\to0", node.outputs[0]))
+        for k, inp in enumerate(node.inputs):
+            if inp.type == "RGBA" and not inp.is_linked:
+                out.append((f"{node.name}\ti{k}", inp))
+    return out
+
+def _resolve_socket(mat, path):
+    if path == "diffuse_color":
+        return None
+    name, ref = path.split("\t")
+    node = mat.node_tree.nodes.get(name) if mat.node_tree else None
+    if node is None:
+        raise KeyError(path)
+    sockets = node.outputs if ref[0] == "o" else node.inputs
+    return sockets[int(ref[1:])]
+
+def _write_material_color(mat, sock, rgba):
+    if sock is None:
+        mat.diffuse_color = rgba
+    else:
+        sock.default_value = rgba
+
+def _base_values(idb, paths, current):
+    """Valeurs d'origine par chemin ; retourne (base, connus, sauvegardé ?).
+
+    Sans sauvegarde, les valeurs courantes sont l'origine. Avec, un chemin
+    qu'elle ignore (socket ajouté, nœud renommé) porte peut-être déjà une
+    couleur transformée : connus[i] est faux et on n'y touche pas.
+    """
+    packed = idb.get(SCENE_BACKUP_KEY)
+    if packed is None:
+        return current, np.ones(len(paths), dtype=bool), False
+    rows = current.reshape(len(paths), -1)
+    stored = str(packed.get("paths", "")).split("\n")
+    values = _idprop_array(packed["values"], np.float32)
+    known = np.zeros(len(paths), dtype=bool)
+    base = rows.copy()
+    if values.size == len(stored) * rows.shape[1]:
+        values = values.reshape(len(stored), -1)
+        row_of = {path: j for j, path in enumerate(stored)}
+        for i, path in enumerate(paths):
+            j = row_of.get(path)
+            if j is not None:
+                base[i] = values[j]
+                known[i] = True
+    return base.reshape(current.shape), known, True
+
+def _save_base(idb, paths, values):
+    idb[SCENE_BACKUP_KEY] = {"paths": "\n".join(paths), "values": np.ascontiguousarray(values).ravel()}
+
+def _transform_colors(rgb, m):
+    return np.clip(rgb @ m.T, 0.0, 1.0).astype(np.float32)
+
+def _tag_remap(m):
+    """Tag de collection le plus proche (OKLab) de chaque tag transformé"""
+    tags = bpy.context.preferences.themes[0].collection_color
+    lin = cvd.srgb_to_linear(np.array([t.color[:3] for t in tags], dtype=np.float64))
+    ref = confusion.linear_to_oklab(lin)
+    moved = confusion.linear_to_oklab(np.clip(lin @ m.T, 0.0, 1.0))
+    dist = np.linalg.norm(moved[:, None, :] - ref[None, :, :], axis=2)
+    return {f"COLOR_{i + 1:02d}": f"COLOR_{j + 1:02d}" for i, j in enumerate(dist.argmin(axis=1))}
+
+def _scene_targets(scene, selected_only):
+    objects = [o for o in scene.objects if not selected_only or o.select_get()]
+    materials, meshes, lights = {}, {}, {}
+    for obj in objects:
+        for slot in obj.material_slots:
+            if slot.material is not None:
+                materials[slot.material.name] = slot.material
+        if obj.type == "MESH" and obj.data is not None:
+            meshes[obj.data.name] = obj.data
+        elif obj.type == "LIGHT" and obj.data is not None:
+            lights[obj.data.name] = obj.data
+    collections = [] if selected_only else list(scene.collection.children_recursive)
+    return objects, list(materials.values()), list(meshes.values()), list(lights.values()), collections
+
+def _color_attribute(mesh_name, attr_name, size=None):
+    """(mesh, attribut) relus par nom ; (None, None) si disparus ou d'une autre taille"""
+    mesh = bpy.data.meshes.get(mesh_name)
+    attr = mesh.color_attributes.get(attr_name) if mesh is not None else None
+    if attr is None or (size is not None and len(attr.data) * 4 != size):
+        return None, None
+    return mesh, attr
+
+def scene_daltonize_steps(scene, mode, intensity, method, selected_only=False, dry_run=False):
+    """Job : remappe les couleurs de la scène ; retourne les statistiques
+
+    Entre deux étapes l'utilisateur peut modifier ou supprimer des données :
+    le job ne garde que des noms et relit chaque datablock après un yield.
+    """
+    severity = cvd.quantize_severity(intensity)
+    m = cvd.cvd_matrix(mode, severity, method).astype(np.float32)
+    scene_name = scene.name
+    _objects, materials, meshes, _lights, _collections = _scene_targets(scene, selected_only)
+    mat_names = [mat.name for mat in materials]
+    mesh_names = [mesh.name for mesh in meshes]
+    stats = {"materials": len(materials), "node_colors": 0, "unique_colors": 0, "changed_colors": 0,
+             "attributes": 0, "attribute_elements": 0, "objects": 0, "lights": 0, "collection_tags": 0,
+             "skipped": 0}
+
+    # matériaux : toutes les couleurs d'un bloc, une transformation par couleur unique
+    mat_found, mat_paths, mat_current, mat_base, mat_known, mat_saved = [], [], [], [], [], []
+    for i, name in enumerate(mat_names):
+        if i % COLLECT_SLICE == 0:
+            yield 0.2 * i / max(1, len(mat_names))
+        mat = bpy.data.materials.get(name)
+        if mat is None:
+            continue
+        sockets = _material_sockets(mat)
+        current = np.array([tuple(mat.diffuse_color) if s is None else tuple(s.default_value)
+                            for _p, s in sockets], dtype=np.float32).reshape(-1, 4)
+        base, known, saved = _base_values(mat, [p for p, _s in sockets], current)
+        stats["skipped"] += int(np.count_nonzero(~known))
+        mat_found.append(name)
+        mat_paths.append([p for p, _s in sockets])
+        mat_current.append(current)
+        mat_base.append(base[known])
+        mat_known.append(known)
+        mat_saved.append(saved)
+    if mat_base:
+        allc = np.concatenate(mat_base)
+        uniq, inverse = np.unique(allc, axis=0, return_inverse=True)
+        new = uniq.copy()
+        new[:, :3] = _transform_colors(uniq[:, :3], m)
+        stats["node_colors"] = len(allc)
+        stats["unique_colors"] = len(uniq)
+        stats["changed_colors"] = int(np.count_nonzero(np.abs(new - uniq).max(axis=1) > SCENE_CHANGE_EPS))
+        remapped = new[inverse.ravel()]
+        if not dry_run:
+            start = 0
+            for name, paths, current, base, known, saved in zip(
+                    mat_found, mat_paths, mat_current, mat_base, mat_known, mat_saved):
+                rows = remapped[start:start + len(base)]
+                start += len(base)
+                # relu depuis la collecte : supprimé ou nœuds modifiés entre-temps, on n'y touche pas
+                mat = bpy.data.materials.get(name)
+                sockets = _material_sockets(mat) if mat is not None else []
+                if [p for p, _s in sockets] != paths:
+                    stats["skipped"] += len(paths)
+                    continue
+                if not saved:
+                    _save_base(mat, paths, base)
+                # seules les couleurs qui bougent sont réécrites
+                idx = np.flatnonzero(known)
+                for r in np.flatnonzero(np.abs(rows - current[idx]).max(axis=1) > SCENE_CHANGE_EPS).tolist():
+                    _write_material_color(mat, sockets[idx[r]][1], rows[r].tolist())
+    yield 0.3
+
+    scene = bpy.data.scenes.get(scene_name)
+    if scene is None:
+        return stats
+    # pas de yield jusqu'aux attributs : ces références restent valides
+    objects, _materials, _meshes, lights, collections = _scene_targets(scene, selected_only)
+
+    # objets et lumières : peu nombreux, un tableau par type
+    for kind, items, attr, width in (("objects", objects, "color", 4), ("lights", lights, "color", 3)):
+        for idb in items:
+            current = np.array(tuple(getattr(idb, attr)), dtype=np.float32)
+            base, known, saved = _base_values(idb, [attr], current)
+            if not known[0]:
+                stats["skipped"] += 1
+                continue
+            new = base.copy()
+            new[:3] = _transform_colors(base[None, :3], m)[0]
+            if np.abs(new - current).max() <= SCENE_CHANGE_EPS:
+                continue
+            stats[kind] += 1
+            if not dry_run:
+                if not saved:
+                    _save_base(idb, [attr], base)
+                setattr(idb, attr, new[:width].tolist())
+
+    if collections:
+        remap = _tag_remap(m)
+        for coll in collections:
+            packed = coll.get(SCENE_BACKUP_KEY)
+            base = str(packed["tag"]) if packed is not None else coll.color_tag
+            new = remap.get(base, base)
+            if new == coll.color_tag:
+                continue
+            stats["collection_tags"] += 1
+            if not dry_run:
+                if packed is None:
+                    coll[SCENE_BACKUP_KEY] = {"tag": base}
+                coll.color_tag = new
+    yield 0.4
+
+    # attributs couleur : foreach_get/foreach_set portent sur tout l'attribut,
+    # la sauvegarde et la transformation avancent par tranches entre deux étapes
+    span = 0.6 / max(1, len(mesh_names))
+    for i, mesh_name in enumerate(mesh_names):
+        mesh = bpy.data.meshes.get(mesh_name)
+        if mesh is None:
+            continue
+        written = False
+        for attr_name in [attr.name for attr in mesh.color_attributes]:
+            mesh, attr = _color_attribute(mesh_name, attr_name)
+            if attr is None:
+                stats["skipped"] += 1
+                continue
+            n = len(attr.data)
+            stats["attributes"] += 1
+            stats["attribute_elements"] += n
+            if dry_run or n == 0:
+                continue
+            packed = mesh.get(SCENE_BACKUP_KEY)
+            if packed is not None and attr.name in packed:
+                # copie de la sauvegarde : elle reste l'origine
+                px = _idprop_array(packed[attr.name], np.float32)
+                if px.size != n * 4:
+                    # topologie changée depuis : l'origine ne correspond plus, on n'y touche pas
+                    stats["skipped"] += 1
+                    continue
+            else:
+                px = np.empty(n * 4, dtype=np.float32)
+                attr.data.foreach_get("color", px)
+                if SCENE_BACKUP_KEY not in mesh:
+                    mesh[SCENE_BACKUP_KEY] = {}
+                mesh[SCENE_BACKUP_KEY][attr.name] = px
+            step = ATTRIBUTE_CHUNK * 4
+            for start in range(0, px.size, step):
+                yield 0.4 + span * (i + start / px.size)
+                # "color" est linéaire, octets comme flottants : matrice, pas de LUT
+                yield jobs.offload(cvd.transform_pixels, px[start:start + step], 4,
+                                   mode, severity, method, False, ATTRIBUTE_CHUNK)
+            # relu après les yields : supprimé, renommé ou retopologisé entre-temps, on saute
+            mesh, attr = _color_attribute(mesh_name, attr_name, px.size)
+            if attr is None:
+                stats["skipped"] += 1
+                continue
+            attr.data.foreach_set("color", px)
+            written = True
+        mesh = bpy.data.meshes.get(mesh_name)
+        if written and mesh is not None:
+            mesh.update()
+    return stats
+
+def restore_scene_backup():
+    """Réécrit les couleurs d'origine de toute la scène.
+
+    Retourne (datablocks restaurés, [(nom, erreur)] restaurés en partie).
+    """
+    restored, partial = 0, []
+    for collection in (bpy.data.materials, bpy.data.objects, bpy.data.lights,
+                       bpy.data.meshes, bpy.data.collections):
+        for idb in collection:
+            packed = idb.get(SCENE_BACKUP_KEY)
+            if packed is None:
+                continue
+            try:
+                _restore_id(idb, packed)
+            except (KeyError, IndexError, ValueError) as e:
+                # le datablock a changé de structure depuis : on garde ce qui reste
+                partial.append((idb.name, str(e)))
+            del idb[SCENE_BACKUP_KEY]
+            restored += 1
+    if restored:
+        invalidate_scene_colors()
+    return restored, partial
+
+def _restore_id(idb, packed):
+    if isinstance(idb, bpy.types.Collection):
+        idb.color_tag = str(packed["tag"])
+        return
+    if isinstance(idb, bpy.types.Mesh):
+        for name in packed.keys():
+            attr = idb.color_attributes.get(name)
+            if attr is not None and len(attr.data) * 4 == len(packed[name]):
+                attr.data.foreach_set("color", _idprop_array(packed[name], np.float32))
+        idb.update()
+        return
+    paths = str(packed["paths"]).split("\n")
+    values = _idprop_array(packed["values"], np.float32).reshape(len(paths), -1)
+    if isinstance(idb, bpy.types.Material):
+        for path, rgba in zip(paths, values.tolist()):
+            try:
+                sock = _resolve_socket(idb, path)
+            except (KeyError, IndexError):
+                # nœud supprimé depuis : les autres couleurs sont quand même rendues
+                continue
+            _write_material_color(idb, sock, rgba)
+        return
+    for path, v in zip(paths, values.tolist()):
+        setattr(idb, path, v)
+
+def _format_dalton_report(stats, dry_run):
+    head = "Simulation" if dry_run else "Appliqué"
+    return (f"{head} : {stats['changed_colors']}/{stats['unique_colors']} couleurs uniques "
+            f"({stats['node_colors']} entrées, {stats['materials']} matériaux), "
+            f"{stats['attribute_elements']} éléments dans {stats['attributes']} attributs, "
+            f"{stats['objects']} objets, {stats['lights']} lumières, {stats['collection_tags']} tags"
+            + (f", {stats['skipped']} ignorées (absentes de la sauvegarde)" if stats["skipped"] else ""))
+
+class ACCESSHELPER_OT_scene_daltonize(bpy.types.Operator):
+    bl_idname = "accesshelper.scene_daltonize"
+    bl_label = "Daltoniser la scène"
+    bl_description = ("Remappe les couleurs des matériaux, attributs couleur, objets, lumières "
+                      "et tags de collection avec le mode courant (réversible)")
+
+    output: bpy.props.EnumProperty(name="Sortie", items=IMAGE_OUTPUT_ITEMS, default="DALTONIZE")
+    selected_only: bpy.props.BoolProperty(name="Sélection seulement", default=False)
+    dry_run: bpy.props.BoolProperty(name="Simulation (sans écrire)", default=True)
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        global _scene_dalton_report
+        p = get_props(context)
+        if p.mode == "OFF":
+            self.report({'WARNING'}, "Choisir d’abord un mode daltonisme")
+            return {'CANCELLED'}
+        steps = scene_daltonize_steps(context.scene, p.mode, p.mode_intensity, self.output,
+                                      self.selected_only, self.dry_run)
+        if self.dry_run:
+            # aucune écriture : les statistiques sont immédiates
+            _scene_dalton_report = _format_dalton_report(jobs.run_now(steps), True)
+            self.report({'INFO'}, _scene_dalton_report)
+            request_redraw(REDRAW_PANEL)
+            return {'FINISHED'}
+
+        def done(stats):
+            global _scene_dalton_report
+            _scene_dalton_report = _format_dalton_report(stats, False)
+            invalidate_scene_colors()
+            # les écritures ont lieu dans les pas du job, après le retour d'execute :
+            # l'étape d'annulation se prend ici, pas par bl_options
+            if has_ui():
+                bpy.ed.undo_push(message="Daltoniser la scène")
+            request_redraw(REDRAW_PANEL)
+
+        start_job("scene_daltonize", steps, "Daltonisation", on_done=done,
+                  on_error=_job_failed("Daltonisation interrompue"))
+        return {'FINISHED'}
+
+class ACCESSHELPER_OT_scene_restore(bpy.types.Operator):
+    bl_idname = "accesshelper.scene_restore"
+    bl_label = "Restaurer les couleurs"
+    bl_description = "Rend aux datablocks daltonisés leurs couleurs d’origine"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        global _scene_dalton_report
+        n, partial = restore_scene_backup()
+        _scene_dalton_report = None
+        if partial:
+            names = ", ".join(name for name, _e in partial)
+            self.report({'WARNING'}, f"{n} datablock(s) restauré(s), en partie seulement : {names}")
+        else:
+            self.report({'INFO'}, f"{n} datablock(s) restauré(s)" if n else "Rien à restaurer")
+        request_redraw(REDRAW_PANEL)
+        return {'FINISHED'}
+
+# ------------------------------------------------------------
+# Audit d'un fichier (runner sans UI, voir audit_runner.py)
+# ------------------------------------------------------------
+AUDIT_MAX_GROUPS = 10
+# fond du viewport 3D si le thème ne le donne pas (gris par défaut de Blender)
+AUDIT_DEFAULT_BACKGROUND = (0.24, 0.24, 0.24)
+
+def _annotation_layers():
+    # 4.3+ : annotations séparées des objets grease pencil
+    owners = getattr(bpy.data, "annotations", None)
+    if owners is None:
+        owners = bpy.data.grease_pencils
+    for gp in owners:
+        for layer in getattr(gp, "layers", ()):
+            color = getattr(layer, "color", None)
+            if color is not None:
+                yield f"{gp.name} › {getattr(layer, 'info', None) or layer.name}", tuple(color)[:3]
+
+def _viewport_background():
+    try:
+        return tuple(bpy.context.preferences.themes[0].view_3d.space.gradients.high_gradient)[:3]
+    except (AttributeError, IndexError):
+        return AUDIT_DEFAULT_BACKGROUND
+
+def audit_annotation_contrast(modes, intensity, target):
+    """Calques d'annotation sous target face au fond du viewport, toutes visions confondues"""
+    layers = list(_annotation_layers())
+    if not layers:
+        return {"layers": 0, "failing": []}
+    names = [n for n, _c in layers]
+    fg = np.asarray([c for _n, c in layers], dtype=np.float32)
+    bg = np.broadcast_to(np.asarray(_viewport_background(), dtype=np.float32), fg.shape)
+    mats = contrast.vision_matrices(tuple(modes), cvd.quantize_severity(intensity))
+    worst = contrast.ratios(fg, bg, mats).min(axis=0)
+    failing = [{"layer": names[i], "ratio": round(float(worst[i]), 2)}
+               for i in np.argsort(worst).tolist() if worst[i] < target]
+    return {"layers": len(layers), "failing": failing}
+
+def audit_scene(scene, modes=tuple(cvd.DEFICIENCY_BY_MODE), intensity=1.0,
+                threshold=confusion.DEFAULT_THRESHOLD, target=contrast.AA):
+    """Rapport JSON-sérialisable : couleurs confondues par mode + contraste des annotations"""
+    data = collect_scene_colors(scene)
+    severity = cvd.quantize_severity(intensity)
+    confusions = {}
+    for mode in modes:
+        groups = confusion_groups(data.colors, mode, severity, threshold)
+        confusions[mode] = {
+            "groups": len(groups),
+            "colors": int(sum(len(idx) for idx, _d in groups)),
+            "worst": [
+                {"labels": [data.members(ci)[0][2] for ci in idx.tolist()[:4]], "delta_e": round(d, 4)}
+                for idx, d in groups[:AUDIT_MAX_GROUPS]
+            ],
+        }
+    return {
+        "scene": scene.name,
+        "unique_colors": len(data.colors),
+        "sources": len(data.entries),
+        "confusions": confusions,
+        "annotations": audit_annotation_contrast(modes, intensity, target),
+    }
+
+# ------------------------------------------------------------
+# Suivi des jobs (ESC annule, comme pour la navigation)
+# ------------------------------------------------------------
+class ACCESSHELPER_OT_job_watch(bpy.types.Operator):
+    bl_idname = "accesshelper.job_watch"
+    bl_label = "Suivi des tâches AccessHelper"
+    bl_options = {'INTERNAL'}
+
+    def _finish(self):
+        global _job_watch_active
+        _job_watch_active = False
+        return {'CANCELLED'}
+
+    def modal(self, context, event):
+        if not JOBS.busy:
+            return self._finish()
+        if event.type == 'ESC' and event.value == 'PRESS':
+            JOBS.cancel()
+            # ESC reste aussi à l'outil ou au menu qui l'attendait
+            return self._finish() | {'PASS_THROUGH'}
+        return {'PASS_THROUGH'}
+
+    def invoke(self, context, event):
+        global _job_watch_active
+        _job_watch_active = True
+        context.window_manager.modal_handler_add(self)
         return {'RUNNING_MODAL'}
 
+class ACCESSHELPER_OT_job_cancel(bpy.types.Operator):
+    bl_idname = "accesshelper.job_cancel"
+    bl_label = "Annuler"
+    bl_description = "Annule les tâches AccessHelper en cours"
+
+    def execute(self, context):
+        n = JOBS.cancel()
+        self.report({'INFO'}, f"{n} tâche(s) annulée(s)")
+        return {'FINISHED'}
+
+# ------------------------------------------------------------
+# Profils (API pour les scripts de pipeline)
+#
+#   import <addon>
+#   report = <addon>.apply_profile({"mode": "DEUT", "ui_scale": 1.2})
+#   <addon>.apply_profile_file("//profils/atelier.json")
+#
+# Les callbacks d'update restent suspendus pendant l'affectation : une
+# seule passe par sous-système touché, un seul redraw.
+# ------------------------------------------------------------
+PROFILE_VERSION = 1
+PROFILE_FIELDS = tuple(PROP_DEPENDENCIES)
+
+@contextmanager
+def batch_updates():
+    """Regroupe les affectations de propriétés ; la passe unique a lieu à la sortie"""
+    global _suspend_depth
+    _suspend_depth += 1
+    try:
+        yield
+    finally:
+        _suspend_depth -= 1
+        if _suspend_depth == 0 and _dirty_props:
+            if bpy.app.timers.is_registered(flush_updates):
+                bpy.app.timers.unregister(flush_updates)
+            flush_updates()
+
+def _same_value(a, b) -> bool:
+    if isinstance(a, float) or isinstance(b, float):
+        return abs(float(a) - float(b)) < 1e-6
+    return a == b
+
+def _check_profile_value(rna, name, value):
+    """Lève ValueError si value n'est pas assignable à la propriété name"""
+    prop = rna.properties[name]
+    kind = prop.type
+    if kind == "ENUM":
+        allowed = [item.identifier for item in prop.enum_items]
+        if value not in allowed:
+            raise ValueError(f"{name} : {value!r} hors de {', '.join(allowed)}")
+    elif kind == "BOOLEAN":
+        if not isinstance(value, bool):
+            raise ValueError(f"{name} : booléen attendu, reçu {value!r}")
+    elif kind in {"INT", "FLOAT"}:
+        number = int if kind == "INT" else (int, float)
+        if isinstance(value, bool) or not isinstance(value, number):
+            raise ValueError(f"{name} : nombre attendu, reçu {value!r}")
+        if not prop.hard_min <= value <= prop.hard_max:
+            raise ValueError(f"{name} : {value} hors de [{prop.hard_min:g}, {prop.hard_max:g}]")
+    elif kind == "STRING":
+        if not isinstance(value, str):
+            raise ValueError(f"{name} : texte attendu, reçu {value!r}")
+
+def apply_profile(profile: dict, context=None) -> dict:
+    """Applique les réglages de profile en une passe.
+
+    Retourne {"changed": {nom: [avant, après]}, "systems": [...], "ms": durée}.
+    Clés inconnues et valeurs invalides (type, enum, bornes) lèvent
+    ValueError avant toute écriture.
+    """
+    unknown = sorted(set(profile) - set(PROFILE_FIELDS))
+    if unknown:
+        raise ValueError(f"réglages inconnus : {', '.join(unknown)}")
+    t0 = time.perf_counter()
+    props = get_props(context or bpy.context)
+    for name, value in profile.items():
+        _check_profile_value(props.bl_rna, name, value)
+    changed = {}
+    with batch_updates():
+        try:
+            for name, value in profile.items():
+                before = getattr(props, name)
+                if _same_value(before, value):
+                    continue
+                setattr(props, name, value)
+                changed[name] = [before, getattr(props, name)]
+        except Exception:
+            # rien n'est encore appliqué : on remet les anciennes valeurs avant le flush
+            for name, (before, _after) in changed.items():
+                setattr(props, name, before)
+            raise
+    systems = set()
+    for name in changed:
+        systems |= PROP_DEPENDENCIES[name]
+    return {
+        "changed": changed,
+        "systems": sorted(systems),
+        "ms": (time.perf_counter() - t0) * 1000.0,
+    }
+
+def current_profile(context=None) -> dict:
+    props = get_props(context or bpy.context)
+    return {name: getattr(props, name) for name in PROFILE_FIELDS}
+
+def load_profile(path: str) -> dict:
+    with open(bpy.path.abspath(path), "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError("le profil doit être un objet JSON")
+    # {"version": 1, "settings": {...}} ou directement les réglages
+    if "settings" in data:
+        if data.get("version", PROFILE_VERSION) > PROFILE_VERSION:
+            raise ValueError(f"version de profil non gérée : {data['version']}")
+        data = data["settings"]
+    return data
+
+def save_profile(path: str, context=None):
+    with open(bpy.path.abspath(path), "w", encoding="utf-8") as f:
+        json.dump({"version": PROFILE_VERSION, "settings": current_profile(context)}, f, indent=2)
+
+def apply_profile_file(path: str, context=None) -> dict:
+    return apply_profile(load_profile(path), context)
+
+class ACCESSHELPER_OT_profile_load(bpy.types.Operator):
+    bl_idname = "accesshelper.profile_load"
+    bl_label = "Charger un profil"
+    bl_description = "Applique un profil JSON (mode, intensité, luminosité, échelle, police…) en une passe"
+
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH")
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'})
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        try:
+            report = apply_profile_file(self.filepath, context)
+        except (OSError, ValueError, TypeError) as e:
+            self.report({'ERROR'}, f"Profil non appliqué : {e}")
+            return {'CANCELLED'}
+        names = ", ".join(report["changed"]) or "rien à changer"
+        self.report({'INFO'}, f"Profil appliqué en {report['ms']:.1f} ms : {names}")
+        return {'FINISHED'}
+
+class ACCESSHELPER_OT_profile_save(bpy.types.Operator):
+    bl_idname = "accesshelper.profile_save"
+    bl_label = "Enregistrer le profil"
+    bl_description = "Enregistre les réglages courants dans un profil JSON"
+
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH", default="accesshelper_profile.json")
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'})
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        path = bpy.path.ensure_ext(self.filepath, ".json")
+        try:
+            save_profile(path, context)
+        except OSError as e:
+            self.report({'ERROR'}, f"Enregistrement impossible : {e}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Profil enregistré : {bpy.path.abspath(path)}")
+        return {'FINISHED'}
+
+# ------------------------------------------------------------
+# Instrumentation (stats + export JSON)
+# ------------------------------------------------------------
+def perf_report():
+    report = PERF.snapshot()
+    report["addon_version"] = list(bl_info["version"])
+    report["blender_version"] = getattr(bpy.app, "version_string", "")
+    report["caches"] = {
+        "theme_states": theme_state_cache.stats(),
+        "cvd_luts": cvd.bake_lut.cache_info()._asdict(),
+    }
+    if _contrast_report is not None:
+        report["contrast"] = _contrast_report
+    if _theme_index is not None:
+        report["theme_slots"] = len(_theme_index)
+    return report
+
+class ACCESSHELPER_OT_perf_export(bpy.types.Operator):
+    bl_idname = "accesshelper.perf_export"
+    bl_label = "Export Stats (JSON)"
+    bl_description = "Exporte les statistiques d’instrumentation en JSON"
+
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH", default="accesshelper_stats.json")
+    filter_glob: bpy.props.StringProperty(default="*.json", options={'HIDDEN'})
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        path = bpy.path.ensure_ext(bpy.path.abspath(self.filepath), ".json")
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(perf_report(), f, indent=2)
+        except OSError as e:
+            self.report({'ERROR'}, f"Export impossible : {e}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Stats exportées : {path}")
+        return {'FINISHED'}
+
+class ACCESSHELPER_OT_perf_reset(bpy.types.Operator):
+    bl_idname = "accesshelper.perf_reset"
+    bl_label = "Reset Stats"
+    bl_description = "Remet à zéro les statistiques d’instrumentation"
+
+    def execute(self, context):
+        PERF.reset()
+        request_redraw(REDRAW_PANEL)
+        return {'FINISHED'}
+
 # ------------------------------------------------------------
 # Panel
 # ------------------------------------------------------------
@@ -693,38 +3032,159 @@ class ACCESSHELPER_PT_panel(bpy.types.Panel):
 
     def draw(self, context):
         layout = self.layout
-        p = context.scene.access_helper
+        ui = wm_props(context)
+        p = get_props(context)
 
         header = layout.box()
         row = header.row(align=True)
-        row.prop(p, "nav_enabled", text="Nav")
+        row.prop(ui, "nav_enabled", text="Nav")
         row.operator("accesshelper.toggle_nav", text="F")
         row.operator("accesshelper.help_popup", text="", icon="INFO")
+        header.prop(context.scene.access_helper, "use_scene_override")
 
-        box = self._box(layout, p, "MODE", "Mode Daltonisme")
+        box = self._box(layout, ui, "MODE", "Mode Daltonisme")
         box.prop(p, "mode", text="")
+        box.prop(p, "cvd_method", text="")
+        box.prop(p, "theme_coverage", text="")
 
-        box = self._box(layout, p, "MODE_INTENSITY", "Intensité")
+        box = self._box(layout, ui, "MODE_INTENSITY", "Intensité")
         box.prop(p, "mode_intensity", text="", slider=True)
 
-        box = self._box(layout, p, "BRIGHTNESS", "Luminosité UI")
+        box = self._box(layout, ui, "BRIGHTNESS", "Luminosité UI")
         box.prop(p, "ui_brightness", text="", slider=True)
 
-        box = self._box(layout, p, "UI_SCALE", "UI Scale")
+        box = self._box(layout, ui, "UI_SCALE", "UI Scale")
         box.prop(p, "ui_scale", text="", slider=True)
 
-        box = self._box(layout, p, "FONT_PRESET", "Taille texte")
+        box = self._box(layout, ui, "FONT_PRESET", "Taille texte")
         row = box.row(align=True)
         row.prop(p, "font_preset", text="")
         row.operator("accesshelper.reset_fonts", text="", icon="LOOP_BACK")
 
-        box = self._box(layout, p, "HELP_POPUP", "Centre d’aide")
+        box = self._box(layout, ui, "UI_FONT", "Police")
+        box.prop(p, "ui_font", text="")
+        if p.ui_font == "CUSTOM":
+            box.prop(p, "ui_font_path", text="")
+        if p.ui_font != "BLENDER" and resolve_ui_font(p) is None:
+            box.label(text="Police introuvable ou invalide", icon="ERROR")
+
+        self._draw_contrast(layout, p)
+
+        self._draw_jobs(layout)
+        self._draw_confusions(layout, ui)
+        self._draw_scene_dalton(layout)
+
+        box = layout.box()
+        box.label(text="Images")
+        box.prop_search(ui, "image_name", bpy.data, "images", text="")
+        row = box.row(align=True)
+        row.operator("accesshelper.cvd_image", text="Aperçu").output = "SIMULATE"
+        row.operator("accesshelper.cvd_image", text="Copie daltonisée").output = "DALTONIZE"
+        row = box.row(align=True)
+        row.operator("accesshelper.cvd_compositor", text="Compositor : aperçu", icon="NODE_COMPOSITING").output = "SIMULATE"
+        row.operator("accesshelper.cvd_compositor", text="Compositor : daltonisé").output = "DALTONIZE"
+        box.operator("accesshelper.lut_export", icon="EXPORT")
+        if _lut_export_report is not None:
+            box.label(text=_lut_export_report)
+
+        box = layout.box()
+        box.label(text="Profil")
+        row = box.row(align=True)
+        row.operator("accesshelper.profile_load", text="Charger", icon="IMPORT")
+        row.operator("accesshelper.profile_save", text="Enregistrer", icon="EXPORT")
+
+        box = self._box(layout, ui, "HELP_POPUP", "Centre d’aide")
         box.operator("accesshelper.help_popup", text="Ouvrir")
 
         layout.separator()
         layout.label(text="Raccourcis :", icon="KEYINGSET")
         layout.label(text="F = navigation | Ctrl+Alt+H = aide")
 
+        self._draw_debug(layout, ui)
+
+    def _draw_jobs(self, layout):
+        if not JOBS.busy and _job_error is None:
+            return
+        box = layout.box()
+        for job in JOBS.jobs:
+            row = box.row(align=True)
+            row.progress(factor=job.progress, type="BAR", text=job.label)
+        if JOBS.busy:
+            box.operator("accesshelper.job_cancel", icon="CANCEL")
+        if _job_error is not None:
+            box.label(text=_job_error, icon="ERROR")
+
+    def _draw_confusions(self, layout, ui):
+        box = layout.box()
+        row = box.row(align=True)
+        row.label(text="Couleurs confondues")
+        row.operator("accesshelper.confusion_audit", text="", icon="VIEWZOOM")
+        box.prop(ui, "confusion_threshold", slider=True)
+        if len(ui.confusions):
+            box.template_list("ACCESSHELPER_UL_confusions", "", ui, "confusions", ui, "confusion_index", rows=4)
+            box.operator("accesshelper.confusion_select", icon="RESTRICT_SELECT_OFF")
+
+    def _draw_scene_dalton(self, layout):
+        box = layout.box()
+        box.label(text="Variantes de la scène")
+        row = box.row(align=True)
+        row.operator("accesshelper.scene_daltonize", icon="COLOR")
+        row.operator("accesshelper.scene_restore", text="", icon="LOOP_BACK")
+        if _scene_dalton_report is not None:
+            box.label(text=_scene_dalton_report)
+
+    def _draw_contrast(self, layout, p):
+        box = layout.box()
+        row = box.row(align=True)
+        row.label(text="Contraste")
+        row.operator("accesshelper.contrast_audit", text="", icon="VIEWZOOM")
+        row = box.row(align=True)
+        row.prop(p, "contrast_check", text="Vérifier")
+        row.prop(p, "contrast_fix", text="Corriger")
+        box.prop(p, "contrast_target", slider=True)
+
+        report = _contrast_report
+        if report is None:
+            return
+        col = box.column(align=True)
+        failing = report["failing"]
+        col.label(text=f"{failing['NORMAL']} / {report['pairs']} paires sous {report['target']:.1f}:1",
+                  icon="ERROR" if failing["NORMAL"] else "CHECKMARK")
+        worst_cvd = max((v for v in failing if v != "NORMAL"), key=failing.get, default=None)
+        if worst_cvd is not None and failing[worst_cvd]:
+            col.label(text=f"pire simulation : {worst_cvd} ({failing[worst_cvd]})")
+        path, ratio = report["worst"][0]
+        col.label(text=f"min {ratio:.2f}:1  {path}")
+
+    def _draw_debug(self, layout, p):
+        box = layout.box()
+        row = box.row(align=True)
+        row.prop(p, "show_debug", text="Debug / Perf", emboss=False,
+                 icon="TRIA_DOWN" if p.show_debug else "TRIA_RIGHT")
+        if not p.show_debug:
+            return
+
+        row = box.row(align=True)
+        row.prop(p, "perf_enabled")
+        row.operator("accesshelper.perf_reset", text="", icon="X")
+        row.operator("accesshelper.perf_export", text="", icon="EXPORT")
+
+        snap = PERF.snapshot()
+        if not snap["probes"]:
+            box.label(text="Aucune mesure" if p.perf_enabled else "Instrumentation coupée")
+            return
+
+        col = box.column(align=True)
+        for name, st in snap["probes"].items():
+            col.label(text=f"{name}: {st['calls']}×  p50 {st['p50_ms']:.2f}  p95 {st['p95_ms']:.2f}  max {st['max_ms']:.2f} ms")
+        if snap["counters"]:
+            col.separator()
+            for name, n in sorted(snap["counters"].items()):
+                col.label(text=f"{name}: {n}")
+        cache = theme_state_cache.stats()
+        col.separator()
+        col.label(text=f"cache états: {cache['entries']} ({cache['hits']} hits / {cache['misses']} miss / {cache['evictions']} évictions)")
+
 # ------------------------------------------------------------
 # Keymaps
 # ------------------------------------------------------------
@@ -755,36 +3215,74 @@ def unregister_keymaps():
 # Register / Unregister
 # ------------------------------------------------------------
 classes = (
+    ACCESSHELPER_ConfusionItem,
     ACCESSHELPER_Props,
+    ACCESSHELPER_SceneProps,
     ACCESSHELPER_OT_reset_fonts,
     ACCESSHELPER_OT_help_popup,
     ACCESSHELPER_OT_toggle_nav,
     ACCESSHELPER_OT_keyboard_nav,
+    ACCESSHELPER_OT_contrast_audit,
+    ACCESSHELPER_UL_confusions,
+    ACCESSHELPER_OT_confusion_audit,
+    ACCESSHELPER_OT_confusion_select,
+    ACCESSHELPER_OT_scene_daltonize,
+    ACCESSHELPER_OT_scene_restore,
+    ACCESSHELPER_OT_cvd_image,
+    ACCESSHELPER_OT_cvd_compositor,
+    ACCESSHELPER_OT_lut_export,
+    ACCESSHELPER_OT_job_watch,
+    ACCESSHELPER_OT_job_cancel,
+    ACCESSHELPER_OT_profile_load,
+    ACCESSHELPER_OT_profile_save,
+    ACCESSHELPER_OT_perf_export,
+    ACCESSHELPER_OT_perf_reset,
     ACCESSHELPER_PT_panel,
 )
 
 def register():
     for cls in classes:
         bpy.utils.register_class(cls)
-    bpy.types.Scene.access_helper = bpy.props.PointerProperty(type=ACCESSHELPER_Props)
+    bpy.types.WindowManager.access_helper = bpy.props.PointerProperty(type=ACCESSHELPER_Props)
+    bpy.types.Scene.access_helper = bpy.props.PointerProperty(type=ACCESSHELPER_SceneProps)
     register_keymaps()
+    image_menu = getattr(bpy.types, "IMAGE_MT_image", None)
+    if image_menu is not None:
+        image_menu.append(draw_image_menu)
+    invalidate_theme_index()
+    for name, fn in (("load_post", _on_load_post), *STATE_HANDLERS):
+        handlers = getattr(bpy.app.handlers, name)
+        if fn not in handlers:
+            handlers.append(fn)
 
 def unregister():
     try:
-        scn = bpy.context.scene
-        if hasattr(scn, "access_helper"):
-            props = scn.access_helper
-            props.nav_enabled = False
+        wm = bpy.context.window_manager
+        if hasattr(wm, "access_helper"):
+            wm.access_helper.nav_enabled = False
             set_status(bpy.context, None)
             restore_theme_backup()
             restore_style_backup()
+            restore_font_backup()
     except Exception:
         pass
 
+    cancel_scheduled_updates()
+    JOBS.shutdown()
+    for name, fn in (("load_post", _on_load_post), *STATE_HANDLERS):
+        handlers = getattr(bpy.app.handlers, name)
+        if fn in handlers:
+            handlers.remove(fn)
+    invalidate_theme_index()
+
     unregister_keymaps()
+    image_menu = getattr(bpy.types, "IMAGE_MT_image", None)
+    if image_menu is not None:
+        image_menu.remove(draw_image_menu)
 
-    if hasattr(bpy.types.Scene, "access_helper"):
-        del bpy.types.Scene.access_helper
+    for owner in (bpy.types.WindowManager, bpy.types.Scene):
+        if hasattr(owner, "access_helper"):
+            del owner.access_helper
 
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
@@ -0,0 +1,334 @@
+# ------------------------------------------------------------
+# Audit d'accessibilité d'une bibliothèque de .blend (CLI)
+#
+#   python audit_runner.py bibliotheque/ rapport/ --blender /opt/blender/blender --workers 8
+#
+# Des processus `blender -b` restent ouverts et enchaînent les fichiers
+# (le démarrage n'est payé qu'une fois par worker, ou toutes les
+# --recycle fichiers). Chaque worker a sa file de fichiers ; celui qui a
+# fini vole la moitié arrière de la file la plus longue. Les résultats
+# (couleurs confondues par mode, contraste des annotations) arrivent en
+# JSON sur stdout, sont ajoutés au fil de l'eau à report.jsonl (reprise
+# d'un run interrompu) puis agrégés dans summary.json.
+# ------------------------------------------------------------
+import argparse
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+
+ADDON_DIR = os.path.dirname(os.path.abspath(__file__))
+REPORT = "report.jsonl"
+SUMMARY = "summary.json"
+WORKER_LOG = "workers.log"
+# préfixe des lignes de résultat : Blender écrit aussi sur stdout
+RESULT_TAG = "@@accesshelper "
+DEFAULT_MODES = ("PROT", "DEUT", "TRIT")
+SUMMARY_TOP_FILES = 20
+
+# ------------------------------------------------------------
+# Worker (dans Blender)
+# ------------------------------------------------------------
+def _load_addon():
+    import importlib.util
+
+    name = os.path.basename(ADDON_DIR)
+    spec = importlib.util.spec_from_file_location(
+        name, os.path.join(ADDON_DIR, "__init__.py"), submodule_search_locations=[ADDON_DIR]
+    )
+    addon = importlib.util.module_from_spec(spec)
+    sys.modules[name] = addon
+    spec.loader.exec_module(addon)
+    return addon
+
+def _emit(rec):
+    sys.stdout.write(RESULT_TAG + json.dumps(rec) + "\n")
+    sys.stdout.flush()
+
+def worker_main(args):
+    import bpy
+
+    # importé sans register() : ni handler, ni timer, ni UI
+    ah = _load_addon()
+    # seuils non donnés : ceux de l'addon
+    options = {k: v for k, v in (("threshold", args.threshold), ("target", args.target)) if v is not None}
+    _emit({"ready": True})
+    for line in sys.stdin:
+        path = line.rstrip("\n")
+        if not path:
+            continue
+        t0 = time.perf_counter()
+        try:
+            bpy.ops.wm.open_mainfile(filepath=path, load_ui=False)
+            ah.invalidate_scene_colors()
+            scenes = [ah.audit_scene(scene, args.modes, args.intensity, **options) for scene in bpy.data.scenes]
+            rec = {"file": path, "ok": True, "scenes": scenes}
+        except Exception as e:
+            rec = {"file": path, "ok": False, "error": f"{type(e).__name__}: {e}"}
+        rec["seconds"] = round(time.perf_counter() - t0, 3)
+        _emit(rec)
+
+# ------------------------------------------------------------
+# Pool de workers
+# ------------------------------------------------------------
+class Worker:
+    """Un processus Blender ; ses lignes de résultat vont dans la file d'événements commune"""
+
+    def __init__(self, slot, cmd, events, log):
+        self.slot = slot
+        self.current = None
+        self.started = 0.0
+        self.done = 0
+        self.proc = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=log,
+            text=True, encoding="utf-8", bufsize=1,
+        )
+        threading.Thread(target=self._read, args=(events,), daemon=True).start()
+
+    def _read(self, events):
+        for line in self.proc.stdout:
+            if line.startswith(RESULT_TAG):
+                try:
+                    events.put((self, json.loads(line[len(RESULT_TAG):])))
+                except ValueError:
+                    pass
+        # fin de stdout : le processus est mort ou a été fermé
+        events.put((self, None))
+
+    def send(self, path):
+        self.current = path
+        self.started = time.perf_counter()
+        self.proc.stdin.write(path + "\n")
+        self.proc.stdin.flush()
+
+    def close(self, kill=False):
+        try:
+            if kill:
+                self.proc.kill()
+            else:
+                self.proc.stdin.close()
+        except OSError:
+            pass
+
+class StealingQueues:
+    """Une file par worker ; une file vide vole la moitié arrière de la plus longue"""
+
+    def __init__(self, items, n):
+        size = -(-len(items) // n) if items else 0
+        # morceaux contigus : un worker garde les fichiers d'un même dossier
+        self.queues = [deque(items[i * size:(i + 1) * size]) for i in range(n)]
+        self.steals = 0
+
+    def __len__(self):
+        return sum(len(q) for q in self.queues)
+
+    def next(self, slot):
+        own = self.queues[slot]
+        if not own:
+            victim = max(self.queues, key=len)
+            if not victim:
+                return None
+            k = (len(victim) + 1) // 2
+            stolen = [victim.pop() for _ in range(k)]
+            own.extend(reversed(stolen))
+            self.steals += 1
+        return own.popleft()
+
+# ------------------------------------------------------------
+# Orchestration
+# ------------------------------------------------------------
+def list_blend_files(root):
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        found.extend(os.path.join(dirpath, n) for n in sorted(filenames) if n.lower().endswith(".blend"))
+    return found
+
+def load_report(out_dir):
+    """Fichiers déjà audités avec succès -> résumé de leur enregistrement"""
+    done = {}
+    path = os.path.join(out_dir, REPORT)
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                # dernière ligne tronquée par l'interruption
+                continue
+            if rec.get("ok"):
+                done[rec["file"]] = file_stats(rec)
+    return done
+
+def file_stats(rec):
+    """Ce que summary.json garde d'un fichier (le détail reste dans report.jsonl)"""
+    groups, failing = {}, 0
+    for scene in rec.get("scenes", ()):
+        for mode, res in scene["confusions"].items():
+            groups[mode] = groups.get(mode, 0) + res["groups"]
+        failing += len(scene["annotations"]["failing"])
+    return {"groups": groups, "annotation_failures": failing, "seconds": rec.get("seconds", 0.0)}
+
+def worker_command(args):
+    cmd = [args.blender, "-b", "--factory-startup", "-noaudio", "--python", os.path.abspath(__file__), "--",
+           "--worker", "--intensity", str(args.intensity)]
+    for flag, value in (("--threshold", args.threshold), ("--target", args.target)):
+        if value is not None:
+            cmd += [flag, str(value)]
+    return cmd + ["--modes", *args.modes]
+
+def run(args):
+    files = list_blend_files(args.input)
+    if not files:
+        raise SystemExit(f"aucun .blend dans {args.input}")
+    os.makedirs(args.output, exist_ok=True)
+    done = {} if args.fresh else load_report(args.output)
+    todo = [f for f in files if f not in done]
+    n_workers = max(1, min(args.workers, len(todo))) if todo else 0
+    print(f"{len(files)} fichiers, {len(todo)} à auditer, {n_workers} worker(s), modes {' '.join(args.modes)}")
+
+    report = open(os.path.join(args.output, REPORT), "w" if args.fresh else "a", encoding="utf-8")
+    log = open(os.path.join(args.output, WORKER_LOG), "a", encoding="utf-8")
+    events = queue.Queue()
+    work = StealingQueues(todo, max(1, n_workers))
+    cmd = worker_command(args)
+    results, failures = {}, []
+    t0 = time.perf_counter()
+
+    def record(rec):
+        report.write(json.dumps(rec) + "\n")
+        report.flush()
+        if rec.get("ok"):
+            results[rec["file"]] = file_stats(rec)
+        else:
+            failures.append({"file": rec["file"], "error": rec.get("error", "")})
+        n = len(results) + len(failures)
+        if n % args.report_every == 0 or n == len(todo):
+            print(f"  {n}/{len(todo)}  {n / (time.perf_counter() - t0):.2f} fichiers/s")
+
+    def dispatch(w):
+        path = work.next(w.slot)
+        if path is None:
+            w.close()
+            return False
+        w.send(path)
+        return True
+
+    slots = [Worker(i, cmd, events, log) for i in range(n_workers)]
+    active = {w for w in slots if dispatch(w)}
+    try:
+        while active:
+            try:
+                w, rec = events.get(timeout=1.0)
+            except queue.Empty:
+                rec = w = None
+            now = time.perf_counter()
+            if args.timeout > 0:
+                for stuck in [x for x in active if x.current and now - x.started > args.timeout]:
+                    record({"file": stuck.current, "ok": False, "error": f"timeout ({args.timeout:g} s)"})
+                    stuck.current = None
+                    stuck.close(kill=True)
+            if w is None or slots[w.slot] is not w:
+                # événement d'un worker déjà remplacé
+                continue
+            if rec is not None and rec.get("ready"):
+                continue
+
+            if rec is None:
+                # worker mort (plantage, timeout) ou fermé faute de travail
+                active.discard(w)
+                if w.current:
+                    record({"file": w.current, "ok": False, "error": f"worker arrêté (code {w.proc.wait()})"})
+                    w.current = None
+                if len(work):
+                    w = slots[w.slot] = Worker(w.slot, cmd, events, log)
+                    if dispatch(w):
+                        active.add(w)
+                continue
+
+            w.current = None
+            w.done += 1
+            record(rec)
+            if args.recycle and w.done >= args.recycle and len(work):
+                # borne la mémoire qu'un Blender accumule de fichier en fichier
+                w.close()
+                active.discard(w)
+                w = slots[w.slot] = Worker(w.slot, cmd, events, log)
+                if dispatch(w):
+                    active.add(w)
+            elif not dispatch(w):
+                active.discard(w)
+    finally:
+        for w in slots:
+            w.close(kill=w.proc.poll() is None and w.current is not None)
+        report.close()
+        log.close()
+
+    elapsed = time.perf_counter() - t0
+    per_file = {**done, **results}
+    totals = {}
+    for stats in per_file.values():
+        for mode, n in stats["groups"].items():
+            totals[mode] = totals.get(mode, 0) + n
+    worst = sorted(per_file, key=lambda f: -sum(per_file[f]["groups"].values()))[:SUMMARY_TOP_FILES]
+    summary = {
+        "files": len(files),
+        "audited": len(results),
+        "skipped": len(files) - len(todo),
+        "failed": failures,
+        "modes": list(args.modes),
+        "intensity": args.intensity,
+        "threshold": args.threshold,
+        "target": args.target,
+        "workers": n_workers,
+        "steals": work.steals,
+        "seconds": elapsed,
+        "files_per_second": len(results) / elapsed if elapsed > 0 else 0.0,
+        "confusion_groups": totals,
+        "files_with_confusions": sum(1 for s in per_file.values() if any(s["groups"].values())),
+        "files_with_low_contrast_annotations": sum(1 for s in per_file.values() if s["annotation_failures"]),
+        "worst_files": [{"file": f, **per_file[f]} for f in worst],
+    }
+    with open(os.path.join(args.output, SUMMARY), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    print(f"{len(results)} fichiers en {elapsed:.2f} s : {summary['files_per_second']:.2f} fichiers/s, "
+          f"{work.steals} vol(s)" + (f", {len(failures)} échec(s)" if failures else ""))
+    return 1 if failures else 0
+
+def parse_args(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+        # sous `blender -b --python audit_runner.py -- ...` seuls les arguments après -- sont à nous
+        if "--" in sys.argv:
+            argv = sys.argv[sys.argv.index("--") + 1:]
+    worker = "--worker" in argv
+    ap = argparse.ArgumentParser(description="Audit daltonisme / contraste de fichiers .blend")
+    if not worker:
+        ap.add_argument("input", help="dossier de la bibliothèque (parcouru récursivement)")
+        ap.add_argument("output", help="dossier du rapport")
+        ap.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="exécutable Blender")
+        ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        ap.add_argument("--recycle", type=int, default=200, help="fichiers par worker avant relance (0 = jamais)")
+        ap.add_argument("--timeout", type=float, default=600.0, help="secondes max par fichier (0 = aucune)")
+        ap.add_argument("--fresh", action="store_true", help="ignore le rapport existant et réaudite tout")
+        ap.add_argument("--report-every", type=int, default=25)
+    ap.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    ap.add_argument("--modes", nargs="*", default=list(DEFAULT_MODES))
+    ap.add_argument("--intensity", type=float, default=1.0)
+    ap.add_argument("--threshold", type=float, help="ΔE OKLab sous lequel deux couleurs se confondent (défaut de l'addon)")
+    ap.add_argument("--target", type=float, help="ratio WCAG minimal des annotations (défaut de l'addon : AA)")
+    return ap.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.worker:
+        return worker_main(args)
+    return run(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
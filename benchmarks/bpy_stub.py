@@ -0,0 +1,574 @@
+# ------------------------------------------------------------
+# Stub pur Python de la partie de bpy utilisée par l'addon.
+#
+# Modélise : thème (wcol_*, espaces d'éditeurs, collections), ui_styles,
+# view.ui_scale, fenêtres/zones/régions, IDProperties du WindowManager,
+# bpy.props (avec callbacks update), bpy.app.timers / handlers.
+# Chaque lecture/écriture RNA de couleur, chaque tag_redraw et chaque
+# status_text_set est compté dans STATS.
+# ------------------------------------------------------------
+import sys
+import types as _pytypes
+from collections import Counter
+
+import numpy as np
+
+STATS = Counter()
+
+def reset_stats():
+    STATS.clear()
+
+# ------------------------------------------------------------
+# RNA : structs, tableaux de couleurs, introspection bl_rna
+# ------------------------------------------------------------
+class _RNAProperty:
+    __slots__ = ("identifier", "type", "subtype", "array_length", "enum_items", "hard_min", "hard_max")
+
+    def __init__(self, identifier, type, subtype="NONE", array_length=0,
+                 enum_items=(), hard_min=float("-inf"), hard_max=float("inf")):
+        self.identifier = identifier
+        self.type = type
+        self.subtype = subtype
+        self.array_length = array_length
+        self.enum_items = enum_items
+        self.hard_min = hard_min
+        self.hard_max = hard_max
+
+class _RNAProperties(list):
+    """bpy_prop_collection de propriétés : itération ou accès par identifiant"""
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            for prop in self:
+                if prop.identifier == key:
+                    return prop
+            raise KeyError(key)
+        return super().__getitem__(key)
+
+class _RNAStruct:
+    __slots__ = ("identifier", "properties")
+
+    def __init__(self, identifier, properties):
+        self.identifier = identifier
+        self.properties = properties
+
+class ColorArray:
+    """bpy_prop_array de floats : une lecture ou une écriture = un appel RNA"""
+    __slots__ = ("_values",)
+
+    def __init__(self, values):
+        self._values = [float(v) for v in values]
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        STATS["rna_reads"] += 1
+        return iter(list(self._values))
+
+    def __getitem__(self, key):
+        STATS["rna_reads"] += 1
+        return self._values[key]
+
+    def __setitem__(self, key, value):
+        STATS["rna_writes"] += 1
+        if isinstance(key, slice):
+            idx = range(*key.indices(len(self._values)))
+            value = list(value)
+            if len(value) != len(idx):
+                raise ValueError("bpy_prop_array slice assignment: size mismatch")
+            for i, v in zip(idx, value):
+                self._values[i] = float(v)
+        else:
+            self._values[key] = float(value)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._values})"
+
+class ThemeColorArray(ColorArray):
+    """Couleur de thème : stockée en unsigned char, relue comme niveau * (1/255)"""
+    __slots__ = ()
+
+    def __init__(self, values):
+        super().__init__(self._store(v) for v in values)
+
+    # relecture float32 de Blender : niveau * (1.0f / 255.0f)
+    _READBACK = [float(np.float32(i) * np.float32(1.0 / 255.0)) for i in range(256)]
+
+    @classmethod
+    def _store(cls, v):
+        return cls._READBACK[min(max(int(float(v) * 255.0 + 0.5), 0), 255)]
+
+    def __setitem__(self, key, value):
+        if isinstance(key, slice):
+            value = [self._store(v) for v in value]
+        else:
+            value = self._store(value)
+        super().__setitem__(key, value)
+
+class Struct:
+    """bpy_struct minimal ; bl_rna est déduit des attributs"""
+
+    def __init__(self, _rna_type="Struct", **fields):
+        object.__setattr__(self, "_rna_type", _rna_type)
+        object.__setattr__(self, "_rna", None)
+        for k, v in fields.items():
+            object.__setattr__(self, k, v)
+
+    def __setattr__(self, name, value):
+        current = self.__dict__.get(name)
+        if isinstance(current, ColorArray):
+            current[:] = value
+            return
+        object.__setattr__(self, name, value)
+
+    def as_pointer(self):
+        return id(self)
+
+    @property
+    def bl_rna(self):
+        if self._rna is None:
+            props = [_RNAProperty("rna_type", "POINTER")]
+            for k, v in self.__dict__.items():
+                if k.startswith("_"):
+                    continue
+                if isinstance(v, ColorArray):
+                    props.append(_RNAProperty(k, "FLOAT", "COLOR_GAMMA", len(v)))
+                elif isinstance(v, Struct):
+                    props.append(_RNAProperty(k, "POINTER"))
+                elif isinstance(v, list):
+                    props.append(_RNAProperty(k, "COLLECTION"))
+                elif isinstance(v, float):
+                    props.append(_RNAProperty(k, "FLOAT", "FACTOR"))
+                elif isinstance(v, int):
+                    props.append(_RNAProperty(k, "INT"))
+                elif isinstance(v, str):
+                    props.append(_RNAProperty(k, "STRING"))
+            object.__setattr__(self, "_rna", _RNAStruct(self._rna_type, _RNAProperties(props)))
+        return self._rna
+
+class CountedStruct(Struct):
+    """Struct dont les écritures de scalaires sont comptées sous un nom donné"""
+
+    def __init__(self, _counter, _rna_type="Struct", **fields):
+        object.__setattr__(self, "_counter", _counter)
+        super().__init__(_rna_type, **fields)
+
+    def __setattr__(self, name, value):
+        if not name.startswith("_"):
+            STATS[self._counter] += 1
+        super().__setattr__(name, value)
+
+# ------------------------------------------------------------
+# Thème factice (taille réglable)
+# ------------------------------------------------------------
+WCOL_NAMES = [
+    "wcol_regular", "wcol_tool", "wcol_toolbar_item", "wcol_radio", "wcol_text", "wcol_option",
+    "wcol_toggle", "wcol_num", "wcol_numslider", "wcol_box", "wcol_menu", "wcol_pulldown",
+    "wcol_menu_back", "wcol_pie_menu", "wcol_tooltip", "wcol_menu_item", "wcol_scroll",
+    "wcol_progress", "wcol_list_item", "wcol_state", "wcol_tab", "wcol_curve",
+]
+
+SPACE_NAMES = [
+    "view_3d", "graph_editor", "file_browser", "nla_editor", "dopesheet_editor", "image_editor",
+    "sequence_editor", "properties", "text_editor", "node_editor", "outliner", "info",
+    "preferences", "console", "clip_editor", "topbar", "statusbar", "spreadsheet",
+]
+
+SPACE_GENERIC = [
+    "back", "title", "text", "text_hi", "header", "header_text", "header_text_hi",
+    "button", "button_title", "button_text", "button_text_hi", "tab_active", "tab_inactive",
+]
+
+def _rand_color(rng, n=3):
+    return ThemeColorArray(rng.random(n).tolist())
+
+def _wcol(rng):
+    return Struct(
+        "ThemeWidgetColors",
+        inner=_rand_color(rng, 4), inner_sel=_rand_color(rng, 4), item=_rand_color(rng, 4),
+        outline=_rand_color(rng, 4), text=_rand_color(rng), text_sel=_rand_color(rng),
+        shadetop=0, shadedown=0,
+    )
+
+def make_theme(target_slots: int = 2000, seed: int = 0):
+    """Thème dont le nombre de couleurs approche target_slots (au moins la structure de base)"""
+    rng = np.random.default_rng(seed)
+    ui = Struct(
+        "ThemeUserInterface",
+        widget_text=_rand_color(rng), text=_rand_color(rng), text_hi=_rand_color(rng),
+        **{name: _wcol(rng) for name in WCOL_NAMES},
+    )
+    base = len(WCOL_NAMES) * 6 + 3
+    per_space = len(SPACE_GENERIC)
+    remaining = max(0, target_slots - base - per_space * len(SPACE_NAMES) - 20)
+    extra_per_space = remaining // len(SPACE_NAMES)
+
+    spaces = {}
+    for name in SPACE_NAMES:
+        generic = Struct("ThemeSpaceGeneric", **{f: _rand_color(rng, 4 if f == "back" else 3) for f in SPACE_GENERIC})
+        own = {f"color_{i:03d}": _rand_color(rng, 3 + (i % 2)) for i in range(extra_per_space)}
+        spaces[name] = Struct(f"Theme{name.title().replace('_', '')}", space=generic, **own)
+
+    bone_sets = [
+        Struct("ThemeBoneColorSet", normal=_rand_color(rng), select=_rand_color(rng), active=_rand_color(rng))
+        for _ in range(20 // 3 + 1)
+    ]
+    return Struct("Theme", user_interface=ui, bone_color_sets=bone_sets, **spaces)
+
+def theme_slot_count(theme):
+    count = 0
+    stack = [theme]
+    while stack:
+        s = stack.pop()
+        for v in s.__dict__.values():
+            if isinstance(v, ColorArray):
+                count += 1
+            elif isinstance(v, Struct):
+                stack.append(v)
+            elif isinstance(v, list):
+                stack.extend(x for x in v if isinstance(x, Struct))
+    return count
+
+def make_ui_style():
+    fs = lambda pts: CountedStruct("font_point_writes", "ThemeFontStyle", points=pts)
+    return Struct(
+        "ThemeStyle",
+        widget=fs(11), panel_title=fs(12), panel_title_sel=fs(12),
+        widget_label=fs(11), widget_label_sel=fs(11),
+    )
+
+# ------------------------------------------------------------
+# Fenêtres / zones / régions
+# ------------------------------------------------------------
+class Region:
+    def __init__(self, type):
+        self.type = type
+
+    def tag_redraw(self):
+        STATS["redraw_tags"] += 1
+        STATS["region_redraw_tags"] += 1
+
+class Area:
+    def __init__(self, type):
+        self.type = type
+        self.regions = [Region(t) for t in ("HEADER", "TOOLS", "UI", "WINDOW")]
+
+    def tag_redraw(self):
+        STATS["redraw_tags"] += 1
+        STATS["area_redraw_tags"] += 1
+
+class Screen:
+    def __init__(self, area_types):
+        self.areas = [Area(t) for t in area_types]
+
+class Window:
+    def __init__(self, area_types):
+        self.screen = Screen(area_types)
+
+class Workspace:
+    def status_text_set(self, text):
+        STATS["status_sets"] += 1
+
+# ------------------------------------------------------------
+# IDProperties
+# ------------------------------------------------------------
+class IDGroup(dict):
+    def to_dict(self):
+        return {k: (v.to_dict() if isinstance(v, IDGroup) else v) for k, v in self.items()}
+
+def _idprop_value(value):
+    # Blender copie les données dans l'IDProperty
+    if isinstance(value, dict):
+        return IDGroup({k: _idprop_value(v) for k, v in value.items()})
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    return value
+
+class IDPropertyHolder:
+    def __init__(self):
+        self._idprops = IDGroup()
+
+    def __contains__(self, key):
+        return key in self._idprops
+
+    def __getitem__(self, key):
+        return self._idprops[key]
+
+    def __setitem__(self, key, value):
+        STATS["idprop_writes"] += 1
+        self._idprops[key] = _idprop_value(value)
+
+    def __delitem__(self, key):
+        del self._idprops[key]
+
+    def get(self, key, default=None):
+        return self._idprops.get(key, default)
+
+    def keys(self):
+        return self._idprops.keys()
+
+# ------------------------------------------------------------
+# bpy.props : définitions + descripteurs installés par register_class
+# ------------------------------------------------------------
+class _PropDef:
+    def __init__(self, kind, **kw):
+        self.kind = kind
+        self.kw = kw
+        self.attr = None
+
+    def _default(self):
+        kw = self.kw
+        if "default" in kw:
+            return kw["default"]
+        return {"FLOAT": 0.0, "INT": 0, "BOOL": False, "STRING": "", "ENUM": None}.get(self.kind)
+
+    def rna(self):
+        kw = self.kw
+        kind = {"BOOL": "BOOLEAN"}.get(self.kind, self.kind)
+        items = tuple(_pytypes.SimpleNamespace(identifier=i[0]) for i in kw.get("items") or ())
+        return _RNAProperty(self.attr, kind, kw.get("subtype", "NONE"), enum_items=items,
+                            hard_min=kw.get("min", float("-inf")), hard_max=kw.get("max", float("inf")))
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        store = instance.__dict__.setdefault("_rna_values", {})
+        key = id(self)
+        if key not in store:
+            if self.kind == "POINTER":
+                store[key] = self.kw["type"]()
+            elif self.kind == "COLLECTION":
+                store[key] = []
+            else:
+                default = self._default()
+                if self.kind == "ENUM" and default is None:
+                    items = self.kw.get("items") or [("NONE", "", "")]
+                    default = items[0][0]
+                store[key] = default
+        return store[key]
+
+    def __set__(self, instance, value):
+        kw = self.kw
+        if self.kind in {"FLOAT", "INT"}:
+            lo = kw.get("min")
+            hi = kw.get("max")
+            if lo is not None:
+                value = max(lo, value)
+            if hi is not None:
+                value = min(hi, value)
+            value = float(value) if self.kind == "FLOAT" else int(value)
+        instance.__dict__.setdefault("_rna_values", {})[id(self)] = value
+        STATS["prop_sets"] += 1
+        update = kw.get("update")
+        if update is not None:
+            update(instance, context)
+
+def _factory(kind):
+    def make(**kw):
+        return _PropDef(kind, **kw)
+    make.__name__ = kind.title() + "Property"
+    return make
+
+props = _pytypes.ModuleType("bpy.props")
+props.FloatProperty = _factory("FLOAT")
+props.IntProperty = _factory("INT")
+props.BoolProperty = _factory("BOOL")
+props.StringProperty = _factory("STRING")
+props.EnumProperty = _factory("ENUM")
+props.PointerProperty = _factory("POINTER")
+props.CollectionProperty = _factory("COLLECTION")
+props.FloatVectorProperty = _factory("FLOATVECTOR")
+props.IntVectorProperty = _factory("INTVECTOR")
+
+# ------------------------------------------------------------
+# bpy.types
+# ------------------------------------------------------------
+class _Base:
+    pass
+
+class Operator(_Base):
+    def report(self, level, message):
+        STATS["reports"] += 1
+
+class Panel(_Base):
+    pass
+
+class Menu(_Base):
+    pass
+
+class UIList(_Base):
+    pass
+
+class PropertyGroup(_Base):
+    @property
+    def bl_rna(self):
+        props = _RNAProperties([_RNAProperty("rna_type", "POINTER")])
+        for cls in reversed(type(self).__mro__):
+            for value in vars(cls).values():
+                if isinstance(value, _PropDef) and value.attr:
+                    props.append(value.rna())
+        return _RNAStruct(type(self).__name__, props)
+
+class AddonPreferences(_Base):
+    pass
+
+class Scene(IDPropertyHolder):
+    def __init__(self):
+        super().__init__()
+        self.name = "Scene"
+
+class WindowManager(IDPropertyHolder):
+    def __init__(self, n_windows=1, area_types=None):
+        super().__init__()
+        area_types = area_types or ["VIEW_3D", "PROPERTIES", "OUTLINER", "TIMELINE", "VIEW_3D", "NODE_EDITOR"]
+        self.windows = [Window(area_types) for _ in range(n_windows)]
+        self.keyconfigs = _pytypes.SimpleNamespace(addon=None)
+        self._modal_handlers = []
+        self._timers = []
+
+    def modal_handler_add(self, op):
+        self._modal_handlers.append(op)
+        return True
+
+    def event_timer_add(self, time_step, window=None):
+        t = _pytypes.SimpleNamespace(time_step=time_step)
+        self._timers.append(t)
+        return t
+
+    def event_timer_remove(self, timer):
+        if timer in self._timers:
+            self._timers.remove(timer)
+
+    def invoke_popup(self, op, width=300):
+        return {'RUNNING_MODAL'}
+
+    def invoke_props_dialog(self, op, width=300):
+        return {'RUNNING_MODAL'}
+
+    def fileselect_add(self, op):
+        return None
+
+types_mod = _pytypes.ModuleType("bpy.types")
+for _cls in (Operator, Panel, Menu, UIList, PropertyGroup, AddonPreferences, Scene, WindowManager):
+    setattr(types_mod, _cls.__name__, _cls)
+
+# ------------------------------------------------------------
+# bpy.app
+# ------------------------------------------------------------
+class _Timers:
+    def __init__(self):
+        self._fns = []
+
+    def register(self, fn, first_interval=0.0, persistent=False):
+        if fn not in self._fns:
+            self._fns.append(fn)
+
+    def unregister(self, fn):
+        self._fns.remove(fn)
+
+    def is_registered(self, fn):
+        return fn in self._fns
+
+    def run_pending(self):
+        """Une itération de la boucle d'événements : exécute les timers dus"""
+        fns, self._fns = self._fns, []
+        for fn in fns:
+            STATS["timer_runs"] += 1
+            if fn() is not None and fn not in self._fns:
+                self._fns.append(fn)
+
+def _persistent(fn):
+    return fn
+
+app = _pytypes.ModuleType("bpy.app")
+app.timers = _Timers()
+app.background = False
+app.version = (5, 0, 0)
+app.version_string = "5.0.0 (stub)"
+app.handlers = _pytypes.SimpleNamespace(
+    persistent=_persistent,
+    load_pre=[], load_post=[], undo_post=[], redo_post=[], depsgraph_update_post=[],
+    save_pre=[], save_post=[],
+)
+
+# ------------------------------------------------------------
+# bpy.utils / bpy.ops / bpy.data / bpy.context
+# ------------------------------------------------------------
+def register_class(cls):
+    # comme Blender : les annotations des mixins (classes de base) sont enregistrées aussi
+    for base in reversed(cls.__mro__):
+        for name, value in list(vars(base).get("__annotations__", {}).items()):
+            if isinstance(value, _PropDef):
+                value.attr = name
+                setattr(cls, name, value)
+
+def unregister_class(cls):
+    pass
+
+utils = _pytypes.ModuleType("bpy.utils")
+utils.register_class = register_class
+utils.unregister_class = unregister_class
+
+class _OpsNamespace:
+    def __getattr__(self, name):
+        def op(*args, **kw):
+            STATS[f"ops.{name}"] += 1
+            return {'FINISHED'}
+        return op
+
+class _Ops:
+    def __getattr__(self, name):
+        return _OpsNamespace()
+
+ops = _Ops()
+
+def _ensure_ext(filepath, ext):
+    return filepath if filepath.lower().endswith(ext) else filepath + ext
+
+path = _pytypes.ModuleType("bpy.path")
+path.abspath = lambda p: p[2:] if p.startswith("//") else p
+path.ensure_ext = _ensure_ext
+class _IDCollection(list):
+    """bpy_prop_collection minimal : liste + recherche par nom"""
+
+    def get(self, name, default=None):
+        return next((item for item in self if getattr(item, "name", None) == name), default)
+
+data = _pytypes.SimpleNamespace(**{
+    name: _IDCollection()
+    for name in ("images", "materials", "objects", "meshes", "lights", "collections", "node_groups", "scenes")
+})
+
+context = _pytypes.SimpleNamespace()
+
+def install(target_slots: int = 2000, n_windows: int = 1, seed: int = 0):
+    """Construit un contexte neuf et enregistre le module comme `bpy` dans sys.modules"""
+    theme = make_theme(target_slots, seed)
+    prefs = _pytypes.SimpleNamespace(
+        themes=[theme],
+        ui_styles=[make_ui_style()],
+        view=CountedStruct("ui_scale_writes", "PreferencesView", ui_scale=1.0, font_path_ui=""),
+    )
+    scene = Scene()
+    context.__dict__.clear()
+    context.preferences = prefs
+    context.window_manager = WindowManager(n_windows)
+    context.scene = scene
+    context.workspace = Workspace()
+    context.window = context.window_manager.windows[0]
+    context.area = None
+    context.region = None
+    data.scenes = _IDCollection([scene])
+
+    mod = sys.modules[__name__]
+    sys.modules["bpy"] = mod
+    sys.modules["bpy.props"] = props
+    sys.modules["bpy.types"] = types_mod
+    sys.modules["bpy.app"] = app
+    sys.modules["bpy.utils"] = utils
+    sys.modules["bpy.path"] = path
+    return mod
+
+# exposé comme bpy.types
+types = types_mod
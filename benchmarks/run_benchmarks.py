@@ -0,0 +1,298 @@
+# ------------------------------------------------------------
+# Benchmarks headless de l'addon, sur le stub bpy (bpy_stub.py).
+#
+#   python benchmarks/run_benchmarks.py --slots 4000 --ticks 200
+#   python benchmarks/run_benchmarks.py --json out.json
+#   python benchmarks/run_benchmarks.py --baseline out.json --tolerance 1.25
+#
+# Chaque scénario rejoue des changements de propriétés ou des touches du
+# mode navigation, exécute une itération de boucle d'événements (timers)
+# après chacun, et mesure latence + lectures/écritures RNA + redraws.
+# ------------------------------------------------------------
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+import types
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ADDON_DIR = os.path.dirname(HERE)
+ADDON_NAME = "accesshelper_bench"
+
+sys.path.insert(0, HERE)
+import bpy_stub  # noqa: E402
+
+COUNTERS = ("rna_reads", "rna_writes", "redraw_tags", "status_sets", "ui_scale_writes", "font_point_writes")
+
+def load_addon(slots: int, windows: int):
+    bpy = bpy_stub.install(slots, windows)
+    for name in list(sys.modules):
+        if name == ADDON_NAME or name.startswith(ADDON_NAME + "."):
+            del sys.modules[name]
+    spec = importlib.util.spec_from_file_location(
+        ADDON_NAME, os.path.join(ADDON_DIR, "__init__.py"), submodule_search_locations=[ADDON_DIR]
+    )
+    addon = importlib.util.module_from_spec(spec)
+    sys.modules[ADDON_NAME] = addon
+    spec.loader.exec_module(addon)
+    addon.register()
+    return bpy, addon
+
+def props_of(bpy):
+    return bpy.context.window_manager.access_helper
+
+def event_loop(bpy):
+    bpy.app.timers.run_pending()
+
+def reset_state(bpy, **overrides):
+    p = props_of(bpy)
+    state = {"mode": "OFF", "mode_intensity": 0.85, "ui_brightness": 0.0, "ui_scale": 1.0, "font_preset": "DEFAULT"}
+    state.update(overrides)
+    for k, v in state.items():
+        setattr(p, k, v)
+    event_loop(bpy)
+
+def percentiles(samples):
+    if not samples:
+        return {}
+    xs = sorted(samples)
+
+    def pct(p):
+        k = (len(xs) - 1) * p
+        lo = int(k)
+        hi = min(lo + 1, len(xs) - 1)
+        return xs[lo] + (xs[hi] - xs[lo]) * (k - lo)
+
+    return {
+        "n": len(xs),
+        "mean_ms": sum(xs) / len(xs),
+        "p50_ms": pct(0.50),
+        "p90_ms": pct(0.90),
+        "p99_ms": pct(0.99),
+        "max_ms": xs[-1],
+    }
+
+class Recorder:
+    def __init__(self, name):
+        self.name = name
+        self.samples = []
+        self.before = None
+
+    def __enter__(self):
+        self.before = dict(bpy_stub.STATS)
+        return self
+
+    def tick(self, fn):
+        t0 = time.perf_counter()
+        fn()
+        self.samples.append((time.perf_counter() - t0) * 1000.0)
+
+    def __exit__(self, *exc):
+        after = bpy_stub.STATS
+        n = max(1, len(self.samples))
+        self.per_tick = {k: (after.get(k, 0) - self.before.get(k, 0)) / n for k in COUNTERS}
+        return False
+
+    def result(self):
+        return {"name": self.name, "latency": percentiles(self.samples), "per_tick": self.per_tick}
+
+# ------------------------------------------------------------
+# Scénarios
+# ------------------------------------------------------------
+def drag_values(lo, hi, ticks):
+    # aller-retour, comme un drag de curseur
+    half = max(1, ticks // 2)
+    up = [lo + (hi - lo) * i / half for i in range(half)]
+    return up + up[::-1]
+
+def bench_slider(bpy, prop_name, values, name=None):
+    p = props_of(bpy)
+    with Recorder(name or f"slider:{prop_name}") as rec:
+        for v in values:
+            def step(v=v):
+                setattr(p, prop_name, v)
+                event_loop(bpy)
+            rec.tick(step)
+    return rec.result()
+
+def bench_first_apply(bpy, addon):
+    p = props_of(bpy)
+    addon.invalidate_theme_index()
+    with Recorder("apply:cold") as rec:
+        def step():
+            p.mode = "DEUT"
+            event_loop(bpy)
+        rec.tick(step)
+    return rec.result()
+
+def bench_toggle(bpy, addon, cycles):
+    p = props_of(bpy)
+    with Recorder("toggle:on_off") as rec:
+        for i in range(cycles):
+            def step(i=i):
+                p.mode = "PROT" if i % 2 == 0 else "OFF"
+                event_loop(bpy)
+            rec.tick(step)
+    return rec.result()
+
+def bench_restore(bpy, addon, cycles):
+    p = props_of(bpy)
+    with Recorder("restore_theme_backup") as rec:
+        for _ in range(cycles):
+            p.mode = "TRIT"
+            event_loop(bpy)
+            rec.tick(addon.restore_theme_backup)
+    p.mode = "OFF"
+    event_loop(bpy)
+    return rec.result()
+
+def bench_font_presets(bpy, addon, cycles):
+    ids = [x[0] for x in addon.FONT_PRESETS]
+    with Recorder("apply_font_preset") as rec:
+        for i in range(cycles):
+            def step(i=i):
+                addon.apply_font_preset(ids[i % len(ids)])
+                event_loop(bpy)
+            rec.tick(step)
+    addon.apply_font_preset("DEFAULT")
+    event_loop(bpy)
+    return rec.result()
+
+def nav_script(ticks):
+    keys = []
+    # parcourt chaque entrée, quelques pas à droite puis à gauche
+    for _ in range(max(1, ticks // 40)):
+        for _item in range(5):
+            keys += ["RIGHT_ARROW"] * 4 + ["LEFT_ARROW"] * 3 + ["DOWN_ARROW"]
+        keys += ["UP_ARROW"] * 5
+    return keys
+
+def bench_nav(bpy, addon, ticks, noise: int = 4):
+    ctx = bpy.context
+    op = addon.ACCESSHELPER_OT_keyboard_nav()
+    op.execute(ctx)
+
+    ev = lambda t, v="PRESS": types.SimpleNamespace(type=t, value=v)
+    results = []
+
+    with Recorder("nav:keys") as rec:
+        for key in nav_script(ticks):
+            def step(key=key):
+                op.modal(ctx, ev(key))
+                event_loop(bpy)
+            rec.tick(step)
+    results.append(rec.result())
+
+    # événements qui ne doivent rien coûter : relâchements, mouvements souris
+    with Recorder("nav:idle_events") as rec:
+        for _ in range(ticks * noise):
+            def step():
+                op.modal(ctx, ev("MOUSEMOVE", "NOTHING"))
+                op.modal(ctx, ev("RIGHT_ARROW", "RELEASE"))
+            rec.tick(step)
+    results.append(rec.result())
+
+    op.modal(ctx, ev("ESC"))
+    event_loop(bpy)
+    return results
+
+def run(args):
+    bpy, addon = load_addon(args.slots, args.windows)
+    p = props_of(bpy)
+    p.perf_enabled = args.perf
+    p.theme_coverage = args.coverage
+    p.cvd_method = args.method
+    event_loop(bpy)
+
+    n_slots = bpy_stub.theme_slot_count(bpy.context.preferences.themes[0])
+    results = [bench_first_apply(bpy, addon)]
+    reset_state(bpy, mode="DEUT")
+    results.append(bench_slider(bpy, "mode_intensity", drag_values(0.0, 1.0, args.ticks)))
+    reset_state(bpy, mode="DEUT")
+    results.append(bench_slider(bpy, "ui_brightness", drag_values(-0.5, 0.5, args.ticks)))
+    reset_state(bpy)
+    results.append(bench_slider(bpy, "ui_scale", drag_values(0.8, 1.4, args.ticks)))
+    reset_state(bpy)
+    results.append(bench_toggle(bpy, addon, args.ticks // 4))
+    reset_state(bpy)
+    results.append(bench_restore(bpy, addon, args.ticks // 4))
+    reset_state(bpy)
+    results.append(bench_font_presets(bpy, addon, args.ticks // 4))
+    reset_state(bpy)
+    results.extend(bench_nav(bpy, addon, args.ticks))
+
+    perf = addon.perf_report() if args.perf else None
+    addon.unregister()
+    return {
+        "instrumentation": perf,
+        "config": {
+            "slots": n_slots,
+            "windows": args.windows,
+            "ticks": args.ticks,
+            "coverage": args.coverage,
+            "method": args.method,
+        },
+        "results": results,
+    }
+
+def print_report(report):
+    cfg = report["config"]
+    print(f"theme slots={cfg['slots']} windows={cfg['windows']} coverage={cfg['coverage']} method={cfg['method']}")
+    head = (f"{'scenario':<24}{'n':>6}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}"
+            f"  {'reads':>8}{'writes':>8}{'redraws':>8}{'status':>8}")
+    print(head)
+    print("-" * len(head))
+    for r in report["results"]:
+        lat = r["latency"]
+        pt = r["per_tick"]
+        print(
+            f"{r['name']:<24}{lat.get('n', 0):>6}"
+            f"{lat.get('p50_ms', 0):>9.3f}{lat.get('p90_ms', 0):>9.3f}{lat.get('p99_ms', 0):>9.3f}{lat.get('max_ms', 0):>9.3f}"
+            f"  {pt['rna_reads']:>8.1f}{pt['rna_writes']:>8.1f}{pt['redraw_tags']:>8.1f}{pt['status_sets']:>8.1f}"
+        )
+    print("(latences en ms ; lectures/écritures RNA, tags de redraw et status_text_set par tick)")
+
+def compare(report, baseline_path, tolerance):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {r["name"]: r for r in json.load(f)["results"]}
+    regressions = []
+    for r in report["results"]:
+        ref = baseline.get(r["name"])
+        if not ref:
+            continue
+        cur, old = r["latency"].get("p50_ms", 0.0), ref["latency"].get("p50_ms", 0.0)
+        if old > 0.0 and cur > old * tolerance:
+            regressions.append(f"{r['name']}: p50 {old:.3f} -> {cur:.3f} ms")
+    return regressions
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="AccessHelper headless benchmarks (stub bpy)")
+    ap.add_argument("--slots", type=int, default=2000, help="nombre approximatif de couleurs du thème")
+    ap.add_argument("--windows", type=int, default=2)
+    ap.add_argument("--ticks", type=int, default=200)
+    ap.add_argument("--coverage", default="FULL", choices=["CORE", "FULL"])
+    ap.add_argument("--method", default="HILITE", choices=["HILITE", "DALTONIZE", "SIMULATE"])
+    ap.add_argument("--perf", action="store_true", help="active l'instrumentation de l'addon pendant le run")
+    ap.add_argument("--json", help="écrit le rapport JSON dans ce fichier")
+    ap.add_argument("--baseline", help="rapport JSON de référence : échoue si p50 régresse")
+    ap.add_argument("--tolerance", type=float, default=1.25)
+    args = ap.parse_args(argv)
+
+    report = run(args)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        regressions = compare(report, args.baseline, args.tolerance)
+        for line in regressions:
+            print("REGRESSION", line)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+# ------------------------------------------------------------
+# Couleurs confondues (sans bpy)
+#
+# Les couleurs (RGB linéaire) passent par la simulation CVD puis en OKLab
+# (Ottosson 2020), où la distance euclidienne approche le ΔE perçu. Une
+# grille uniforme de pas = seuil ΔE limite la recherche aux 27 cellules
+# voisines : le coût suit le nombre de paires proches, pas n².
+# ------------------------------------------------------------
+import numpy as np
+
+from . import cvd
+
+# ΔE OKLab : ~0.02 = juste perceptible
+DEFAULT_THRESHOLD = 0.03
+# paires candidates évaluées par lot (mémoire bornée sur les amas denses)
+PAIR_CHUNK = 1 << 22
+
+_LMS = np.array([
+    [0.4122214708, 0.5363325363, 0.0514459929],
+    [0.2119034982, 0.6806995451, 0.1073969566],
+    [0.0883024619, 0.2817188376, 0.6299787005],
+], dtype=np.float64)
+_LAB = np.array([
+    [0.2104542553, 0.7936177850, -0.0040720468],
+    [1.9779984951, -2.4285922050, 0.4505937099],
+    [0.0259040371, 0.7827717662, -0.8086757660],
+], dtype=np.float64)
+
+# demi-voisinage : chaque paire de cellules n'est visitée qu'une fois
+_OFFSETS = [(0, 0, 0)] + [
+    (x, y, z)
+    for x in (-1, 0, 1) for y in (-1, 0, 1) for z in (-1, 0, 1)
+    if (x, y, z) > (0, 0, 0)
+]
+
+def linear_to_oklab(lin):
+    lms = np.clip(np.asarray(lin, dtype=np.float64), 0.0, None) @ _LMS.T
+    return np.cbrt(lms) @ _LAB.T
+
+def _cell_pairs(starts, counts, a, b):
+    """Indices (dans l'ordre trié) de toutes les paires de points des cellules a[k] x b[k]"""
+    ca, cb = counts[a], counts[b]
+    sizes = ca * cb
+    total = int(sizes.sum())
+    if total == 0:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    owner = np.repeat(np.arange(len(a)), sizes)
+    local = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    width = cb[owner]
+    return starts[a][owner] + local // width, starts[b][owner] + local % width
+
+def neighbor_pairs(points, radius: float, chunk: int = PAIR_CHUNK):
+    """Paires (i, j), i < j, à distance <= radius ; (k, 2) int64"""
+    points = np.asarray(points, dtype=np.float64)
+    n = len(points)
+    if n < 2 or radius <= 0.0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    cells = np.floor(points / radius).astype(np.int64)
+    cells -= cells.min(axis=0) - 1
+    dims = cells.max(axis=0) + 2
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    order = np.argsort(keys, kind="stable")
+    ukeys, starts, counts = np.unique(keys[order], return_index=True, return_counts=True)
+    ucells = cells[order][starts]
+
+    r2 = radius * radius
+    found = []
+    for off in _OFFSETS:
+        nc = ucells + np.asarray(off)
+        nkeys = (nc[:, 0] * dims[1] + nc[:, 1]) * dims[2] + nc[:, 2]
+        pos = np.minimum(np.searchsorted(ukeys, nkeys), len(ukeys) - 1)
+        hit = ukeys[pos] == nkeys
+        a = np.nonzero(hit)[0]
+        b = pos[hit]
+
+        # lots de paires de cellules dont le produit des effectifs tient dans chunk
+        sizes = counts[a] * counts[b]
+        bounds = np.searchsorted(np.cumsum(sizes), np.arange(chunk, int(sizes.sum()) + chunk, chunk))
+        lo = 0
+        for hi in np.unique(np.append(bounds, len(a))):
+            hi = max(int(hi), lo + 1)
+            ia, ib = _cell_pairs(starts, counts, a[lo:hi], b[lo:hi])
+            lo = hi
+            if off == (0, 0, 0):
+                keep = ia < ib
+                ia, ib = ia[keep], ib[keep]
+            d = points[order[ia]] - points[order[ib]]
+            close = np.einsum("ij,ij->i", d, d) <= r2
+            i, j = order[ia[close]], order[ib[close]]
+            found.append(np.stack([np.minimum(i, j), np.maximum(i, j)], axis=1))
+            if lo >= len(a):
+                break
+    return np.concatenate(found) if found else np.empty((0, 2), dtype=np.int64)
+
+def group_labels(n: int, pairs):
+    """Composantes connexes : label = plus petit indice du groupe"""
+    labels = np.arange(n)
+    if len(pairs) == 0:
+        return labels
+    i, j = pairs[:, 0], pairs[:, 1]
+    while True:
+        m = np.minimum(labels[i], labels[j])
+        before = labels.copy()
+        np.minimum.at(labels, i, m)
+        np.minimum.at(labels, j, m)
+        # saut de pointeurs : raccourcit les chaînes à chaque tour
+        labels = labels[labels]
+        if np.array_equal(labels, before):
+            return labels
+
+def confusable(lin, mode: str, severity: float, threshold: float = DEFAULT_THRESHOLD):
+    """Couleurs distinctes en vision normale mais à moins de threshold une fois simulées.
+
+    lin : (n, 3) RGB linéaire, couleurs déjà dédoublonnées.
+    Retourne (paires (k, 2), labels (n,), ΔE simulé par paire).
+    """
+    lin = np.asarray(lin, dtype=np.float64)
+    ref = linear_to_oklab(lin)
+    sim = linear_to_oklab(lin @ cvd.simulation_matrix(mode, severity).T)
+    pairs = neighbor_pairs(sim, threshold)
+    if len(pairs):
+        d_ref = np.linalg.norm(ref[pairs[:, 0]] - ref[pairs[:, 1]], axis=1)
+        pairs = pairs[d_ref > threshold]
+    d_sim = np.linalg.norm(sim[pairs[:, 0]] - sim[pairs[:, 1]], axis=1) if len(pairs) else np.empty(0)
+    return pairs, group_labels(len(lin), pairs), d_sim
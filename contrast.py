@@ -0,0 +1,103 @@
+# ------------------------------------------------------------
+# Contraste WCAG 2.x (sans bpy)
+#
+# ratio = (L_claire + 0.05) / (L_sombre + 0.05), L = luminance relative
+# des couleurs sRGB. Toutes les paires texte/fond sont évaluées d'un
+# bloc, pour la vision normale et chaque déficience simulée.
+# ------------------------------------------------------------
+from functools import lru_cache
+
+import numpy as np
+
+from . import cvd
+
+AA_LARGE = 3.0
+AA = 4.5
+AAA = 7.0
+
+VISIONS = ("NORMAL", *cvd.DEFICIENCY_BY_MODE)
+
+_LUMA = cvd.LUMA_WEIGHTS.astype(np.float32)
+# le clip des simulations casse un peu la linéarité : une passe de plus rattrape le reste
+FIX_PASSES = 3
+# vise un peu au-dessus : les arrondis float32/sRGB ne retombent pas juste sous la cible
+FIX_MARGIN = 1.01
+
+_POLES = np.array([[0.0, 0.0, 0.0], [1.0, 1.0, 1.0]], dtype=np.float32)
+
+@lru_cache(maxsize=16)
+def vision_matrices(modes: tuple = VISIONS[1:], severity: float = 1.0):
+    """(1 + len(modes), 3, 3) : identité puis une simulation par mode, en lecture seule"""
+    mats = [np.eye(3)] + [cvd.simulation_matrix(m, severity) for m in modes]
+    out = np.stack(mats).astype(np.float32)
+    out.setflags(write=False)
+    return out
+
+def luminance(rgb, mats):
+    """rgb (..., 3) sRGB -> luminance relative (V, ...) pour chaque matrice de vision"""
+    lin = cvd.srgb_to_linear(np.clip(rgb, 0.0, 1.0))
+    seen = np.clip(np.einsum("vij,...j->v...i", mats, lin), 0.0, 1.0)
+    return seen @ _LUMA
+
+def ratios(fg, bg, mats):
+    """Ratios WCAG (V, n) des paires fg[k] / bg[k]"""
+    l_fg = luminance(fg, mats)
+    l_bg = luminance(bg, mats)
+    return (np.maximum(l_fg, l_bg) + 0.05) / (np.minimum(l_fg, l_bg) + 0.05)
+
+def _fix_pass(fg, bg, target, mats):
+    t_best = np.zeros(len(fg), dtype=np.float32)
+    if len(fg) == 0:
+        return fg.copy(), t_best
+    l_fg = luminance(fg, mats)
+    l_bg = luminance(bg, mats)
+    failing = ((np.maximum(l_fg, l_bg) + 0.05) / (np.minimum(l_fg, l_bg) + 0.05)).min(axis=0) < target
+    if not failing.any():
+        return fg.copy(), t_best
+
+    l0, lb = l_fg[:, failing], l_bg[:, failing]
+    l_white = luminance(_POLES[1], mats)[:, None]
+    # luminances à atteindre dans chaque vision : au-dessus (blanc) ou en dessous (noir) du fond
+    aim = target * FIX_MARGIN
+    need_hi = aim * (lb + 0.05) - 0.05
+    need_lo = (lb + 0.05) / aim - 0.05
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_white = np.clip((need_hi - l0) / (l_white - l0), 0.0, 1.0).max(axis=0)
+        t_black = np.clip((l0 - need_lo) / l0, 0.0, 1.0).max(axis=0)
+    ok_white = (need_hi <= l_white).all(axis=0)
+    ok_black = (need_lo >= 0.0).all(axis=0)
+
+    # contraste obtenu au pôle pur quand la cible est hors d'atteinte
+    full_white = ((l_white + 0.05) / (lb + 0.05)).min(axis=0)
+    full_black = ((lb + 0.05) / 0.05).min(axis=0)
+    score_white = np.where(ok_white, t_white, 2.0 - full_white / 21.0)
+    score_black = np.where(ok_black, t_black, 2.0 - full_black / 21.0)
+    to_white = score_white <= score_black
+    t = np.where(to_white, np.where(ok_white, t_white, 1.0), np.where(ok_black, t_black, 1.0))
+
+    lin = cvd.srgb_to_linear(np.clip(fg[failing], 0.0, 1.0))
+    pole = np.where(to_white[:, None], 1.0, 0.0).astype(np.float32)
+    mixed = lin + (pole - lin) * t[:, None]
+    fixed = fg.copy()
+    fixed[failing] = cvd.linear_to_srgb(mixed)
+    t_best[failing] = t
+    return fixed, t_best
+
+def fix_foreground(fg, bg, target: float, mats):
+    """Mélange chaque fg vers le noir ou le blanc (en linéaire) juste assez pour atteindre target.
+
+    Le mélange garde la chromaticité, et la luminance de chaque vision varie
+    linéairement avec sa part t : le t minimal se résout directement, sans
+    bisection. Le pôle retenu est celui qui demande le plus petit t ; si aucun
+    n'atteint target, le plus contrasté est appliqué en entier. Retourne
+    (fg corrigé sRGB, t cumulé par paire, 0 = inchangé).
+    """
+    fixed = np.asarray(fg, dtype=np.float32)
+    bg = np.asarray(bg, dtype=np.float32)
+    keep = np.ones(len(fixed), dtype=np.float32)
+    for _ in range(FIX_PASSES):
+        fixed, t = _fix_pass(fixed, bg, target, mats)
+        if not t.any():
+            break
+        keep *= 1.0 - t
+    return fixed, 1.0 - keep
@@ -0,0 +1,205 @@
+# ------------------------------------------------------------
+# Color vision deficiency math (sans bpy)
+#
+# Simulation : Machado, Oliveira & Fernandes 2009, matrices tabulées
+# par pas de sévérité de 0.1, interpolées linéairement entre deux pas.
+# Daltonisation : redistribution de l'erreur (Fidaner et al.).
+# Toutes les matrices s'appliquent en RGB linéaire (primaires Rec.709).
+# ------------------------------------------------------------
+from functools import lru_cache
+
+import numpy as np
+
+_MACHADO = {
+    "protan": [
+        [[1.000000, 0.000000, -0.000000], [0.000000, 1.000000, 0.000000], [-0.000000, -0.000000, 1.000000]],
+        [[0.856167, 0.182038, -0.038205], [0.029342, 0.955115, 0.015544], [-0.002880, -0.001563, 1.004443]],
+        [[0.734766, 0.334872, -0.069637], [0.051840, 0.919198, 0.028963], [-0.004928, -0.004209, 1.009137]],
+        [[0.630323, 0.465641, -0.095964], [0.069181, 0.890046, 0.040773], [-0.006308, -0.007724, 1.014032]],
+        [[0.539009, 0.579343, -0.118352], [0.082546, 0.866121, 0.051332], [-0.007136, -0.011959, 1.019095]],
+        [[0.458064, 0.679578, -0.137642], [0.092785, 0.846313, 0.060902], [-0.007494, -0.016807, 1.024301]],
+        [[0.385450, 0.769005, -0.154455], [0.100526, 0.829802, 0.069673], [-0.007442, -0.022190, 1.029632]],
+        [[0.319627, 0.849633, -0.169261], [0.106241, 0.815969, 0.077790], [-0.007025, -0.028051, 1.035076]],
+        [[0.259411, 0.923008, -0.182420], [0.110296, 0.804340, 0.085364], [-0.006276, -0.034346, 1.040622]],
+        [[0.203876, 0.990338, -0.194214], [0.112975, 0.794542, 0.092483], [-0.005222, -0.041043, 1.046265]],
+        [[0.152286, 1.052583, -0.204868], [0.114503, 0.786281, 0.099216], [-0.003882, -0.048116, 1.051998]],
+    ],
+    "deutan": [
+        [[1.000000, 0.000000, -0.000000], [0.000000, 1.000000, 0.000000], [-0.000000, -0.000000, 1.000000]],
+        [[0.866435, 0.177704, -0.044139], [0.049567, 0.939063, 0.011370], [-0.003453, 0.007233, 0.996220]],
+        [[0.760729, 0.319078, -0.079807], [0.090568, 0.889315, 0.020117], [-0.006027, 0.013325, 0.992702]],
+        [[0.675425, 0.433850, -0.109275], [0.125303, 0.847755, 0.026942], [-0.007950, 0.018572, 0.989378]],
+        [[0.605511, 0.528560, -0.134071], [0.155318, 0.812366, 0.032316], [-0.009376, 0.023176, 0.986200]],
+        [[0.547494, 0.607765, -0.155259], [0.181692, 0.781742, 0.036566], [-0.010410, 0.027275, 0.983136]],
+        [[0.498864, 0.674741, -0.173604], [0.205199, 0.754872, 0.039929], [-0.011131, 0.030969, 0.980162]],
+        [[0.457771, 0.731899, -0.189670], [0.226409, 0.731012, 0.042579], [-0.011595, 0.034333, 0.977261]],
+        [[0.422823, 0.781057, -0.203881], [0.245752, 0.709602, 0.044646], [-0.011843, 0.037423, 0.974421]],
+        [[0.392952, 0.823610, -0.216562], [0.263559, 0.690210, 0.046232], [-0.011910, 0.040281, 0.971630]],
+        [[0.367322, 0.860646, -0.227968], [0.280085, 0.672501, 0.047413], [-0.011820, 0.042940, 0.968881]],
+    ],
+    "tritan": [
+        [[1.000000, 0.000000, -0.000000], [0.000000, 1.000000, 0.000000], [-0.000000, -0.000000, 1.000000]],
+        [[0.926670, 0.092514, -0.019184], [0.021191, 0.964503, 0.014306], [0.008437, 0.054813, 0.936750]],
+        [[0.895720, 0.133330, -0.029050], [0.029997, 0.945400, 0.024603], [0.013027, 0.104707, 0.882266]],
+        [[0.905871, 0.127791, -0.033662], [0.026856, 0.941251, 0.031893], [0.013410, 0.148296, 0.838294]],
+        [[0.948035, 0.089490, -0.037526], [0.014364, 0.946792, 0.038844], [0.010853, 0.193991, 0.795156]],
+        [[1.017277, 0.027029, -0.044306], [-0.006113, 0.958479, 0.047634], [0.006379, 0.248708, 0.744913]],
+        [[1.104996, -0.046633, -0.058363], [-0.032137, 0.971635, 0.060503], [0.001336, 0.317922, 0.680742]],
+        [[1.193214, -0.109812, -0.083402], [-0.058496, 0.979410, 0.079086], [-0.002346, 0.403492, 0.598854]],
+        [[1.257728, -0.139648, -0.118081], [-0.078003, 0.975409, 0.102594], [-0.003316, 0.501214, 0.502102]],
+        [[1.278864, -0.125333, -0.153531], [-0.084748, 0.957674, 0.127074], [-0.000989, 0.601151, 0.399838]],
+        [[1.255528, -0.076749, -0.178779], [-0.078411, 0.930809, 0.147602], [0.004733, 0.691367, 0.303900]],
+    ],
+}
+_MACHADO = {k: np.asarray(v, dtype=np.float64) for k, v in _MACHADO.items()}
+
+# Redistribution de l'erreur vers les canaux encore perçus
+_DALTON_SHIFT = {
+    "protan": np.array([[0.0, 0.0, 0.0], [0.7, 1.0, 0.0], [0.7, 0.0, 1.0]]),
+    "deutan": np.array([[0.0, 0.0, 0.0], [0.7, 1.0, 0.0], [0.7, 0.0, 1.0]]),
+    "tritan": np.array([[1.0, 0.0, 0.7], [0.0, 1.0, 0.7], [0.0, 0.0, 0.0]]),
+}
+
+LUMA_WEIGHTS = np.array([0.2126, 0.7152, 0.0722])
+
+# Une anomalie à intensité 1.0 reste une trichromatie : sévérité Machado plafonnée
+ANOMALY_SEVERITY = 0.6
+
+# mode (MODE_ITEMS) -> (déficience, échelle de sévérité)
+DEFICIENCY_BY_MODE = {
+    "PROT":  ("protan", 1.0),
+    "PROTA": ("protan", ANOMALY_SEVERITY),
+    "DEUT":  ("deutan", 1.0),
+    "DEUTA": ("deutan", ANOMALY_SEVERITY),
+    "TRIT":  ("tritan", 1.0),
+    "TRITA": ("tritan", ANOMALY_SEVERITY),
+    "ACHRO": ("achro", 1.0),
+}
+
+METHODS = ("SIMULATE", "DALTONIZE")
+
+SEVERITY_STEP = 0.05
+LUT_SIZE = 33
+
+def quantize_severity(severity: float, step: float = SEVERITY_STEP) -> float:
+    s = min(1.0, max(0.0, float(severity)))
+    return round(round(s / step) * step, 6)
+
+def machado_matrix(deficiency: str, severity: float):
+    table = _MACHADO[deficiency]
+    x = min(1.0, max(0.0, severity)) * 10.0
+    i = min(int(x), 9)
+    f = x - i
+    return (1.0 - f) * table[i] + f * table[i + 1]
+
+def simulation_matrix(mode: str, severity: float):
+    if mode not in DEFICIENCY_BY_MODE:
+        return np.eye(3)
+    deficiency, scale = DEFICIENCY_BY_MODE[mode]
+    s = min(1.0, max(0.0, severity)) * scale
+    if deficiency == "achro":
+        gray = np.tile(LUMA_WEIGHTS, (3, 1))
+        return (1.0 - s) * np.eye(3) + s * gray
+    return machado_matrix(deficiency, s)
+
+def daltonization_matrix(mode: str, severity: float):
+    if mode not in DEFICIENCY_BY_MODE:
+        return np.eye(3)
+    deficiency, _scale = DEFICIENCY_BY_MODE[mode]
+    if deficiency not in _DALTON_SHIFT:
+        # achromatopsie : plus de teinte vers laquelle déplacer l'erreur
+        return np.eye(3)
+    sim = simulation_matrix(mode, severity)
+    return np.eye(3) + _DALTON_SHIFT[deficiency] @ (np.eye(3) - sim)
+
+def cvd_matrix(mode: str, severity: float, method: str = "SIMULATE"):
+    if method == "DALTONIZE":
+        return daltonization_matrix(mode, severity)
+    return simulation_matrix(mode, severity)
+
+# ------------------------------------------------------------
+# Transfer functions (sRGB)
+# ------------------------------------------------------------
+def srgb_to_linear(x):
+    x = np.asarray(x, dtype=np.float32)
+    return np.where(x <= 0.04045, x / 12.92, ((np.maximum(x, 0.0) + 0.055) / 1.055) ** 2.4).astype(np.float32)
+
+def linear_to_srgb(x):
+    x = np.asarray(x, dtype=np.float32)
+    return np.where(x <= 0.0031308, x * 12.92, 1.055 * np.maximum(x, 0.0) ** (1.0 / 2.4) - 0.055).astype(np.float32)
+
+def apply_matrix(rgb, m, out=None):
+    """rgb (..., 3) linéaire ; écrit dans out si fourni (peut être rgb lui-même)"""
+    m = np.asarray(m, dtype=np.float32)
+    res = rgb @ m.T
+    if out is None:
+        return res
+    out[...] = res
+    return out
+
+# ------------------------------------------------------------
+# 3D LUTs (entrée et sortie encodées sRGB, grille size^3)
+# ------------------------------------------------------------
+def lut_grid(size: int):
+    axis = np.linspace(0.0, 1.0, size, dtype=np.float32)
+    r, g, b = np.meshgrid(axis, axis, axis, indexing="ij")
+    return np.stack([r, g, b], axis=-1)
+
+@lru_cache(maxsize=64)
+def bake_lut(mode: str, severity: float, method: str = "SIMULATE", size: int = LUT_SIZE):
+    """LUT (size, size, size, 3) indexée [r, g, b], en lecture seule.
+
+    severity doit déjà être quantifiée (quantize_severity) pour que le cache serve.
+    """
+    m = cvd_matrix(mode, severity, method)
+    lin = srgb_to_linear(lut_grid(size))
+    out = linear_to_srgb(np.clip(apply_matrix(lin, m), 0.0, 1.0))
+    out.setflags(write=False)
+    return out
+
+def mode_lut(mode: str, intensity: float, method: str = "SIMULATE", size: int = LUT_SIZE):
+    return bake_lut(mode, quantize_severity(intensity), method, size)
+
+def apply_lut(lut, rgb):
+    """Interpolation trilinéaire de rgb (n, 3) sRGB dans [0..1]"""
+    n = lut.shape[0]
+    x = np.clip(np.asarray(rgb, dtype=np.float32), 0.0, 1.0) * (n - 1)
+    i0 = np.minimum(x.astype(np.int32), n - 2)
+    f = x - i0
+    i1 = i0 + 1
+    r0, g0, b0 = i0[:, 0], i0[:, 1], i0[:, 2]
+    r1, g1, b1 = i1[:, 0], i1[:, 1], i1[:, 2]
+    fr, fg, fb = f[:, 0:1], f[:, 1:2], f[:, 2:3]
+
+    c00 = lut[r0, g0, b0] * (1.0 - fr) + lut[r1, g0, b0] * fr
+    c10 = lut[r0, g1, b0] * (1.0 - fr) + lut[r1, g1, b0] * fr
+    c01 = lut[r0, g0, b1] * (1.0 - fr) + lut[r1, g0, b1] * fr
+    c11 = lut[r0, g1, b1] * (1.0 - fr) + lut[r1, g1, b1] * fr
+    c0 = c00 * (1.0 - fg) + c10 * fg
+    c1 = c01 * (1.0 - fg) + c11 * fg
+    return c0 * (1.0 - fb) + c1 * fb
+
+# ------------------------------------------------------------
+# Images : buffers plats (n * channels) float32, traités en place
+# par tuiles pour que la mémoire de travail reste bornée
+# ------------------------------------------------------------
+TILE_PIXELS = 1 << 18
+
+def transform_pixels(px, channels: int, mode: str, severity: float, method: str = "SIMULATE",
+                     encoded: bool = True, tile: int = TILE_PIXELS):
+    """Transforme RGB en place ; encoded=True : valeurs sRGB (LUT), sinon linéaires (matrice, HDR conservé)"""
+    if channels < 3:
+        raise ValueError("au moins 3 canaux requis")
+    view = px.reshape(-1, channels)
+    severity = quantize_severity(severity)
+    if encoded:
+        lut = bake_lut(mode, severity, method)
+    else:
+        mt = np.ascontiguousarray(cvd_matrix(mode, severity, method).T, dtype=np.float32)
+    for start in range(0, len(view), tile):
+        rgb = view[start:start + tile, :3]
+        if encoded:
+            rgb[...] = apply_lut(lut, rgb)
+        else:
+            rgb[...] = rgb @ mt
+    return px
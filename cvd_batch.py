@@ -0,0 +1,308 @@
+# ------------------------------------------------------------
+# Traitement CVD de séquences d'images rendues (CLI)
+#
+#   python cvd_batch.py renders/ out/ --modes PROT DEUT TRIT
+#   blender -b --python cvd_batch.py -- renders/ out/ --workers 8
+#
+# Chaque frame est lue une fois, puis simulée pour chaque mode demandé
+# (out/<MODE>/<frame>). Les workers ne reçoivent que des chemins : aucun
+# pixel ne transite entre processus. manifest.jsonl note chaque frame
+# terminée, ce qui permet de reprendre un run interrompu ; summary.json
+# donne le débit (frames/s) et les stats par frame.
+# ------------------------------------------------------------
+import argparse
+import fnmatch
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+try:
+    from . import cvd
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import cvd
+
+MODES = tuple(cvd.DEFICIENCY_BY_MODE)
+DEFAULT_PATTERNS = ("*.exr", "*.png", "*.tif", "*.tiff", "*.jpg")
+FLOAT_EXTS = {".exr", ".hdr"}
+MANIFEST = "manifest.jsonl"
+SUMMARY = "summary.json"
+CHANGE_THRESHOLD = 1.0 / 255.0
+# buffers vivants par worker : source + copie de travail + conversion d'écriture
+BUFFERS_PER_WORKER = 3
+
+# ------------------------------------------------------------
+# IO (OpenImageIO si présent, sinon imageio)
+# ------------------------------------------------------------
+try:
+    import OpenImageIO as oiio
+except ImportError:
+    oiio = None
+
+try:
+    import imageio.v3 as iio
+except ImportError:
+    iio = None
+
+def backend_name():
+    return "oiio" if oiio is not None else "imageio" if iio is not None else None
+
+def probe(path):
+    """(hauteur, largeur, canaux) sans décoder les pixels"""
+    if oiio is not None:
+        inp = oiio.ImageInput.open(path)
+        if inp is None:
+            raise OSError(oiio.geterror())
+        spec = inp.spec()
+        inp.close()
+        return spec.height, spec.width, spec.nchannels
+    props = iio.improps(path)
+    shape = props.shape
+    return shape[0], shape[1], shape[2] if len(shape) > 2 else 1
+
+def read_image(path):
+    """(pixels float32 (h, w, c), dtype d'origine) ; entiers normalisés 0..1"""
+    if oiio is not None:
+        inp = oiio.ImageInput.open(path)
+        if inp is None:
+            raise OSError(oiio.geterror())
+        spec = inp.spec()
+        px = inp.read_image(0, 0, 0, spec.nchannels, oiio.FLOAT)
+        inp.close()
+        return np.asarray(px, dtype=np.float32).reshape(spec.height, spec.width, spec.nchannels), spec.format
+    arr = iio.imread(path)
+    if arr.ndim == 2:
+        arr = arr[:, :, None]
+    dtype = arr.dtype
+    if np.issubdtype(dtype, np.integer):
+        px = arr.astype(np.float32)
+        px *= 1.0 / np.iinfo(dtype).max
+    else:
+        px = arr.astype(np.float32, copy=False)
+    return px, dtype
+
+def write_image(path, px, fmt):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if oiio is not None:
+        h, w, c = px.shape
+        out = oiio.ImageOutput.create(path)
+        if out is None:
+            raise OSError(oiio.geterror())
+        out.open(path, oiio.ImageSpec(w, h, c, fmt))
+        out.write_image(px)
+        out.close()
+        return
+    if np.issubdtype(fmt, np.integer):
+        top = np.iinfo(fmt).max
+        # conversion en place dans le buffer de travail, puis un seul cast
+        np.clip(px, 0.0, 1.0, out=px)
+        px *= top
+        px += 0.5
+        px = px.astype(fmt)
+    iio.imwrite(path, px[:, :, 0] if px.shape[2] == 1 else px)
+
+# ------------------------------------------------------------
+# Worker
+# ------------------------------------------------------------
+def simulate(src, work, mode, intensity, method, encoded, tile):
+    """Copie src dans work, la transforme par tuiles ; renvoie les stats de la frame"""
+    c = src.shape[-1]
+    s_view = src.reshape(-1, c)
+    w_view = work.reshape(-1, c)
+    n = len(s_view)
+    delta_sum = 0.0
+    changed = 0
+    for start in range(0, n, tile):
+        stop = min(n, start + tile)
+        w_tile = w_view[start:stop]
+        w_tile[...] = s_view[start:stop]
+        cvd.transform_pixels(w_tile.reshape(-1), c, mode, intensity, method, encoded=encoded, tile=tile)
+        diff = np.abs(w_tile[:, :3] - s_view[start:stop, :3])
+        delta_sum += float(diff.sum(dtype=np.float64))
+        changed += int(np.count_nonzero(diff.max(axis=1) > CHANGE_THRESHOLD))
+    return {
+        "mean_delta": delta_sum / max(1, n * 3),
+        "changed_ratio": changed / max(1, n),
+    }
+
+def process_frame(path, modes, out_dir, intensity, method, tile):
+    t0 = time.perf_counter()
+    name = os.path.basename(path)
+    src, fmt = read_image(path)
+    if src.shape[-1] < 3:
+        raise ValueError(f"{name}: au moins 3 canaux requis")
+    encoded = os.path.splitext(name)[1].lower() not in FLOAT_EXTS
+    work = np.empty_like(src)
+    stats = {}
+    for mode in modes:
+        stats[mode] = simulate(src, work, mode, intensity, method, encoded, tile)
+        write_image(os.path.join(out_dir, mode, name), work, fmt)
+    h, w, c = src.shape
+    return {
+        "frame": name,
+        "size": [w, h, c],
+        "modes": stats,
+        "seconds": time.perf_counter() - t0,
+    }
+
+# ------------------------------------------------------------
+# Orchestration
+# ------------------------------------------------------------
+def list_frames(in_dir, patterns):
+    names = sorted(
+        n for n in os.listdir(in_dir)
+        if any(fnmatch.fnmatch(n.lower(), p) for p in patterns)
+    )
+    return [os.path.join(in_dir, n) for n in names]
+
+def load_manifest(out_dir):
+    done = {}
+    path = os.path.join(out_dir, MANIFEST)
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                # dernière ligne tronquée par l'interruption
+                continue
+            prev = done.get(rec["frame"])
+            if prev is not None:
+                # frame reprise pour de nouveaux modes : on cumule
+                rec["modes"] = {**prev["modes"], **rec["modes"]}
+            done[rec["frame"]] = rec
+    return done
+
+def plan_workers(frame_bytes, requested, mem_cap_mb):
+    per_worker = frame_bytes * BUFFERS_PER_WORKER
+    budget = int(mem_cap_mb * 1024 * 1024)
+    fit = max(1, budget // max(1, per_worker))
+    return max(1, min(requested, fit)), per_worker
+
+def run(args):
+    if backend_name() is None:
+        raise SystemExit("aucun backend image : installer OpenImageIO ou imageio")
+    modes = args.modes or list(MODES)
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        raise SystemExit(f"modes inconnus : {', '.join(unknown)} (choix : {', '.join(MODES)})")
+
+    frames = list_frames(args.input, args.patterns)
+    if not frames:
+        raise SystemExit(f"aucune frame dans {args.input}")
+    os.makedirs(args.output, exist_ok=True)
+
+    done = {} if args.fresh else load_manifest(args.output)
+    # frame -> modes restant à produire
+    todo = []
+    for f in frames:
+        have = done.get(os.path.basename(f), {}).get("modes", {})
+        missing = [m for m in modes if m not in have]
+        if missing:
+            todo.append((f, missing))
+
+    h, w, c = probe(todo[0][0] if todo else frames[0])
+    workers, per_worker = plan_workers(h * w * c * 4, args.workers, args.mem_cap)
+    # la tuile partage le budget du worker sans jamais dépasser une frame
+    tile = max(4096, min(h * w, cvd.TILE_PIXELS))
+
+    print(f"{len(frames)} frames, {len(todo)} à traiter, modes {' '.join(modes)}, "
+          f"{workers} worker(s) (~{per_worker / 2**20:.0f} Mo chacun, backend {backend_name()})")
+
+    manifest = open(os.path.join(args.output, MANIFEST), "w" if args.fresh else "a", encoding="utf-8")
+    results = []
+    failures = []
+    t0 = time.perf_counter()
+
+    def record(rec):
+        manifest.write(json.dumps(rec) + "\n")
+        manifest.flush()
+        prev = done.get(rec["frame"])
+        if prev is not None:
+            rec = {**rec, "modes": {**prev["modes"], **rec["modes"]}}
+        results.append(rec)
+        n = len(results)
+        if n % args.report_every == 0 or n == len(todo):
+            elapsed = time.perf_counter() - t0
+            print(f"  {n}/{len(todo)}  {n / elapsed:.2f} fps")
+
+    job = (args.output, args.intensity, args.method, tile)
+    try:
+        if workers == 1:
+            for f, missing in todo:
+                try:
+                    record(process_frame(f, missing, *job))
+                except Exception as e:
+                    failures.append({"frame": os.path.basename(f), "error": str(e)})
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = {}
+                queue = iter(todo)
+                # au plus 2 frames en file par worker : la mémoire reste sous le plafond
+                for f, missing in queue:
+                    pending[pool.submit(process_frame, f, missing, *job)] = f
+                    if len(pending) >= workers * 2:
+                        break
+                while pending:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        f = pending.pop(fut)
+                        try:
+                            record(fut.result())
+                        except Exception as e:
+                            failures.append({"frame": os.path.basename(f), "error": str(e)})
+                        nxt = next(queue, None)
+                        if nxt is not None:
+                            pending[pool.submit(process_frame, nxt[0], nxt[1], *job)] = nxt[0]
+    finally:
+        manifest.close()
+
+    elapsed = time.perf_counter() - t0
+    summary = {
+        "frames": len(frames),
+        "processed": len(results),
+        "skipped": len(frames) - len(todo),
+        "failed": failures,
+        "modes": modes,
+        "method": args.method,
+        "intensity": args.intensity,
+        "workers": workers,
+        "seconds": elapsed,
+        "fps": len(results) / elapsed if elapsed > 0 else 0.0,
+        "per_frame": {**done, **{r["frame"]: r for r in results}},
+    }
+    with open(os.path.join(args.output, SUMMARY), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    print(f"{len(results)} frames en {elapsed:.2f} s : {summary['fps']:.2f} fps"
+          + (f", {len(failures)} échec(s)" if failures else ""))
+    return 1 if failures else 0
+
+def parse_args(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+        # sous `blender -b --python cvd_batch.py -- ...` seuls les arguments après -- sont à nous
+        if "--" in sys.argv:
+            argv = sys.argv[sys.argv.index("--") + 1:]
+    ap = argparse.ArgumentParser(description="Simulation CVD de séquences de frames")
+    ap.add_argument("input", help="dossier des frames rendues")
+    ap.add_argument("output", help="dossier de sortie (un sous-dossier par mode)")
+    ap.add_argument("--modes", nargs="*", help=f"parmi {' '.join(MODES)} (défaut : tous)")
+    ap.add_argument("--method", default="SIMULATE", choices=list(cvd.METHODS))
+    ap.add_argument("--intensity", type=float, default=1.0)
+    ap.add_argument("--patterns", nargs="*", default=list(DEFAULT_PATTERNS))
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--mem-cap", type=float, default=4096.0, help="plafond mémoire total des workers (Mo)")
+    ap.add_argument("--fresh", action="store_true", help="ignore le manifeste et retraite tout")
+    ap.add_argument("--report-every", type=int, default=10)
+    return ap.parse_args(argv)
+
+def main(argv=None):
+    return run(parse_args(argv))
+
+if __name__ == "__main__":
+    sys.exit(main())
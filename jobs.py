@@ -0,0 +1,195 @@
+# ------------------------------------------------------------
+# Jobs coopératifs sur bpy.app.timers
+#
+# Un job est un générateur exécuté par tranches sur le thread principal,
+# dans un budget de temps par passage de timer :
+#   yield 0.4                    -> rend la main, progression 40 %
+#   x = yield offload(fn, ...)   -> fn tourne sur un thread (NumPy pur,
+#                                   pas de bpy), le job reprend avec x
+#                                   sur le thread principal
+# return valeur -> on_done(valeur). Annuler ferme le générateur
+# (GeneratorExit : ses blocs finally nettoient).
+# ------------------------------------------------------------
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bpy
+
+FRAME_BUDGET_MS = 8.0
+# relance quand tous les jobs attendent un thread
+WAIT_INTERVAL = 0.02
+THREAD_WORKERS = 2
+
+class Offload:
+    __slots__ = ("fn", "args", "kwargs")
+
+    def __init__(self, fn, args, kwargs):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        return self.fn(*self.args, **self.kwargs)
+
+def offload(fn, *args, **kwargs):
+    return Offload(fn, args, kwargs)
+
+def run_now(gen):
+    """Exécute un job d'une traite (sans UI, ou appelant synchrone)"""
+    value, exc = None, None
+    while True:
+        try:
+            out = gen.throw(exc) if exc is not None else gen.send(value)
+        except StopIteration as stop:
+            return stop.value
+        value, exc = None, None
+        if isinstance(out, Offload):
+            try:
+                value = out.run()
+            except Exception as e:
+                exc = e
+
+class Job:
+    __slots__ = ("name", "label", "gen", "progress", "future", "on_done", "on_error",
+                 "_value", "_exc", "started")
+
+    def __init__(self, name, label, gen, on_done=None, on_error=None):
+        self.name = name
+        self.label = label
+        self.gen = gen
+        self.progress = 0.0
+        self.future = None
+        self.on_done = on_done
+        self.on_error = on_error
+        self._value = None
+        self._exc = None
+        self.started = time.perf_counter()
+
+    def close(self):
+        if self.future is not None:
+            # un thread lancé ne s'interrompt pas : son résultat sera ignoré
+            self.future.cancel()
+            self.future = None
+        self.gen.close()
+
+class JobScheduler:
+    def __init__(self, budget_ms: float = FRAME_BUDGET_MS):
+        self.budget_ms = budget_ms
+        self.jobs = []
+        # notify(texte | None) : statut à afficher quand il change
+        self.notify = None
+        # on_error(job, exc) : échec qu'aucun rappel du job n'a traité
+        self.on_error = None
+        self._executor = None
+        self._status = None
+
+    @property
+    def busy(self) -> bool:
+        return bool(self.jobs)
+
+    def submit(self, name, gen, label=None, on_done=None, on_error=None):
+        # un job du même nom remplace le précédent (ex. relancer un audit)
+        self.cancel(name)
+        job = Job(name, label or name, gen, on_done, on_error)
+        self.jobs.append(job)
+        if not bpy.app.timers.is_registered(self._tick):
+            bpy.app.timers.register(self._tick, first_interval=0.0)
+        return job
+
+    def cancel(self, name=None):
+        """Annule le job name (tous si None) ; retourne le nombre annulé"""
+        keep, dropped = [], []
+        for job in self.jobs:
+            (dropped if name is None or job.name == name else keep).append(job)
+        self.jobs = keep
+        for job in dropped:
+            job.close()
+        if not self.jobs:
+            self._set_status(None)
+        return len(dropped)
+
+    def shutdown(self):
+        self.cancel()
+        if bpy.app.timers.is_registered(self._tick):
+            bpy.app.timers.unregister(self._tick)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _submit_thread(self, work):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=THREAD_WORKERS, thread_name_prefix="accesshelper")
+        return self._executor.submit(work.run)
+
+    def _step(self, job, deadline):
+        """Avance job jusqu'à deadline ; True quand il est terminé"""
+        while True:
+            if job.future is not None:
+                if not job.future.done():
+                    return False
+                fut, job.future = job.future, None
+                try:
+                    job._value = fut.result()
+                except Exception as e:
+                    job._exc = e
+
+            value, exc = job._value, job._exc
+            job._value = job._exc = None
+            try:
+                out = job.gen.throw(exc) if exc is not None else job.gen.send(value)
+            except StopIteration as stop:
+                self._finish(job, job.on_done, stop.value)
+                return True
+            except Exception as e:
+                self._finish(job, job.on_error, e)
+                return True
+
+            if isinstance(out, Offload):
+                job.future = self._submit_thread(out)
+            elif out is not None:
+                job.progress = min(1.0, max(0.0, float(out)))
+            if time.perf_counter() >= deadline:
+                return False
+
+    def _finish(self, job, callback, arg):
+        # une erreur de rappel ne doit pas arrêter le timer des autres jobs
+        try:
+            if callback is None:
+                if isinstance(arg, Exception):
+                    raise arg
+                return
+            callback(arg)
+        except Exception as e:
+            if self.on_error is not None:
+                self.on_error(job, e)
+
+    def _tick(self):
+        deadline = time.perf_counter() + self.budget_ms / 1000.0
+        for job in list(self.jobs):
+            if job not in self.jobs:
+                continue
+            if self._step(job, deadline):
+                self.jobs.remove(job)
+            if time.perf_counter() >= deadline:
+                break
+        # tourniquet : le premier job ne monopolise pas le budget
+        if len(self.jobs) > 1:
+            self.jobs.append(self.jobs.pop(0))
+
+        if not self.jobs:
+            self._set_status(None)
+            return None
+        self._set_status(self.status_text())
+        runnable = any(job.future is None for job in self.jobs)
+        return 0.0 if runnable else WAIT_INTERVAL
+
+    def status_text(self):
+        job = self.jobs[0]
+        more = f" (+{len(self.jobs) - 1})" if len(self.jobs) > 1 else ""
+        return f"{job.label} {int(job.progress * 100)} %{more} | ESC : annuler"
+
+    def _set_status(self, text):
+        if text != self._status:
+            self._status = text
+            if self.notify is not None:
+                self.notify(text)
@@ -0,0 +1,119 @@
+# ------------------------------------------------------------
+# Export des modes daltonisme en LUT 3D + looks OCIO (sans bpy)
+#
+# Les LUT sont celles de cvd.bake_lut (entrée et sortie encodées sRGB),
+# calculées d'un bloc sur toute la grille et écrites en un seul formatage.
+# Chaque fichier porte sa clé (mode, sévérité, méthode, taille) en
+# commentaire : un export identique ne recalcule ni ne réécrit rien.
+# Le snippet OCIO déclare un Look par mode, appliqué dans l'espace sRGB :
+# la gestion des couleurs de Blender fait alors la simulation sans Python.
+# ------------------------------------------------------------
+import os
+
+import numpy as np
+
+from . import cvd
+
+FORMATS = {"CUBE": ".cube", "SPI3D": ".spi3d"}
+LUT_SIZES = (17, 33, 65)
+# espace OCIO dans lequel la LUT attend ses valeurs (celui de bake_lut)
+PROCESS_SPACE = "sRGB"
+LOOK_PREFIX = "AccessHelper"
+SNIPPET_NAME = "accesshelper_looks.ocio.yaml"
+KEY_TAG = "accesshelper:"
+
+def lut_key(mode: str, severity: float, method: str, size: int) -> str:
+    return f"{KEY_TAG}{mode}:{severity:g}:{method}:{size}"
+
+def lut_filename(mode: str, method: str, fmt: str = "CUBE") -> str:
+    suffix = "dalt" if method == "DALTONIZE" else "sim"
+    return f"accesshelper_{mode.lower()}_{suffix}{FORMATS[fmt]}"
+
+def _rows(values) -> str:
+    flat = values.reshape(-1)
+    line = "%.6f %.6f %.6f\n"
+    return (line * (len(flat) // 3)) % tuple(flat.tolist())
+
+def format_cube(lut, key: str) -> str:
+    size = lut.shape[0]
+    # .cube : rouge varie le plus vite ; bake_lut est indexée [r, g, b]
+    body = _rows(lut.transpose(2, 1, 0, 3))
+    return (f"# {key}\nTITLE \"{key}\"\nLUT_3D_SIZE {size}\n"
+            "DOMAIN_MIN 0.0 0.0 0.0\nDOMAIN_MAX 1.0 1.0 1.0\n" + body)
+
+def format_spi3d(lut, key: str) -> str:
+    size = lut.shape[0]
+    # lignes "r g b R G B" : indices explicites, bleu varie le plus vite
+    idx = np.indices((size, size, size)).reshape(3, -1).T
+    rows = np.column_stack([idx, lut.reshape(-1, 3)])
+    line = "%d %d %d %.6f %.6f %.6f\n"
+    # SPILUT n'a pas de commentaire : la clé va dans un fichier voisin
+    return f"SPILUT 1.0\n3 3\n{size} {size} {size}\n" + (line * len(rows)) % tuple(rows.ravel().tolist())
+
+def _stored_key(path: str, fmt: str):
+    try:
+        if fmt == "CUBE":
+            with open(path, "r", encoding="utf-8") as f:
+                first = f.readline()
+            return first[2:].strip() if first.startswith("# ") else None
+        with open(path + ".key", "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def export_lut(directory: str, mode: str, intensity: float, method: str = "SIMULATE",
+               size: int = cvd.LUT_SIZE, fmt: str = "CUBE"):
+    """Écrit la LUT du mode ; retourne (chemin, réécrit ?)"""
+    if fmt not in FORMATS:
+        raise ValueError(f"format inconnu : {fmt}")
+    if size < 2:
+        raise ValueError("taille de LUT trop petite")
+    severity = cvd.quantize_severity(intensity)
+    key = lut_key(mode, severity, method, size)
+    path = os.path.join(directory, lut_filename(mode, method, fmt))
+    if _stored_key(path, fmt) == key:
+        return path, False
+
+    lut = cvd.bake_lut(mode, severity, method, size)
+    text = format_cube(lut, key) if fmt == "CUBE" else format_spi3d(lut, key)
+    os.makedirs(directory, exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8", newline="\n") as f:
+        f.write(text)
+    os.replace(tmp, path)
+    if fmt == "SPI3D":
+        with open(path + ".key", "w", encoding="utf-8") as f:
+            f.write(key + "\n")
+    return path, True
+
+def look_name(mode: str, method: str) -> str:
+    return f"{LOOK_PREFIX} {mode} {'dalt' if method == 'DALTONIZE' else 'sim'}"
+
+def ocio_snippet(entries, search_path: str) -> str:
+    """Bloc `looks:` à ajouter au config.ocio ; entries : [(mode, method, chemin)]"""
+    lines = [
+        "# Looks AccessHelper : ajouter ce dossier à search_path du config.ocio",
+        f"# search_path: {search_path}",
+        "looks:",
+    ]
+    for mode, method, path in entries:
+        lines += [
+            "  - !<Look>",
+            f"    name: {look_name(mode, method)}",
+            f"    process_space: {PROCESS_SPACE}",
+            f"    transform: !<FileTransform> {{src: {os.path.basename(path)}, interpolation: tetrahedral}}",
+        ]
+    return "\n".join(lines) + "\n"
+
+def write_snippet(directory: str, modes, method: str = "SIMULATE", fmt: str = "CUBE") -> str:
+    entries = [(m, method, os.path.join(directory, lut_filename(m, method, fmt))) for m in modes]
+    snippet = os.path.join(directory, SNIPPET_NAME)
+    with open(snippet, "w", encoding="utf-8", newline="\n") as f:
+        f.write(ocio_snippet(entries, directory))
+    return snippet
+
+def export_looks(directory: str, modes, intensity: float, method: str = "SIMULATE",
+                 size: int = cvd.LUT_SIZE, fmt: str = "CUBE"):
+    """Exporte une LUT par mode et le snippet OCIO ; retourne (chemin du snippet, LUT réécrites)"""
+    written = sum(export_lut(directory, m, intensity, method, size, fmt)[1] for m in modes)
+    return write_snippet(directory, modes, method, fmt), written
@@ -0,0 +1,103 @@
+# ------------------------------------------------------------
+# Instrumentation des chemins chauds (sans bpy)
+#
+# Chaque sonde garde un compteur d'appels, le temps cumulé et les
+# RING_SIZE dernières durées (ring buffer préalloué). Désactivée, une
+# sonde ne coûte qu'un test de booléen avant l'appel réel.
+# ------------------------------------------------------------
+import time
+from functools import wraps
+
+import numpy as np
+
+RING_SIZE = 512
+
+class Probe:
+    __slots__ = ("name", "calls", "total_ms", "max_ms", "_ring", "_pos")
+
+    def __init__(self, name: str):
+        self.name = name
+        self._ring = np.zeros(RING_SIZE, dtype=np.float64)
+        self.reset()
+
+    def reset(self):
+        self.calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._pos = 0
+
+    def record(self, ms: float):
+        self._ring[self._pos % RING_SIZE] = ms
+        self._pos += 1
+        self.calls += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def recent(self):
+        return self._ring[:min(self._pos, RING_SIZE)]
+
+    def summary(self):
+        recent = self.recent()
+        if len(recent):
+            p50, p95, p99 = np.percentile(recent, [50, 95, 99]).tolist()
+        else:
+            p50 = p95 = p99 = 0.0
+        return {
+            "calls": self.calls,
+            "total_ms": self.total_ms,
+            "mean_ms": self.total_ms / self.calls if self.calls else 0.0,
+            "p50_ms": p50,
+            "p95_ms": p95,
+            "p99_ms": p99,
+            "max_ms": self.max_ms,
+            "window": len(recent),
+        }
+
+class Instrumentation:
+    def __init__(self):
+        self.enabled = False
+        self.probes = {}
+        self.counters = {}
+
+    def probe(self, name: str) -> Probe:
+        p = self.probes.get(name)
+        if p is None:
+            p = self.probes[name] = Probe(name)
+        return p
+
+    def count(self, name: str, n: int = 1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def reset(self):
+        for p in self.probes.values():
+            p.reset()
+        for k in self.counters:
+            self.counters[k] = 0
+
+    def snapshot(self):
+        return {
+            "enabled": self.enabled,
+            "probes": {name: p.summary() for name, p in sorted(self.probes.items()) if p.calls},
+            "counters": dict(self.counters),
+        }
+
+PERF = Instrumentation()
+
+def instrumented(name: str):
+    """Décorateur : chronomètre fn sous la sonde name quand PERF.enabled"""
+    def deco(fn):
+        probe = PERF.probe(name)
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not PERF.enabled:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                probe.record((time.perf_counter() - t0) * 1000.0)
+        return wrapper
+    return deco